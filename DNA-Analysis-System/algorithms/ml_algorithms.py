@@ -5,31 +5,105 @@ Deep Learning, Ensemble, Bayesian, Pathway Analysis
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
 from dataclasses import dataclass
+import logging
 import json
+import os
+import sysconfig
 from pathlib import Path
+from types import SimpleNamespace
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.neural_network import MLPClassifier
-from sklearn.svm import SVC
+from sklearn.svm import LinearSVC
+from sklearn.calibration import CalibratedClassifierCV
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from sklearn.preprocessing import StandardScaler
-import xgboost as xgb
+from sklearn.preprocessing import KBinsDiscretizer, StandardScaler
+from joblib import Parallel, delayed
 import lightgbm as lgb
 from scipy import stats
+import scipy.sparse as sp
+import tempfile
 import warnings
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+try:
+    # Opsiyonel: GBDT modellerini native kütüphaneye derleme
+    import treelite
+    import tl2cgen
+except ImportError:
+    treelite = None
+    tl2cgen = None
+
+# Treelite derleyicisi: TREELITE_TOOLCHAIN, CC ya da Python'un derlendiği derleyici (ör. clang-only sistemler)
+TREELITE_TOOLCHAIN = os.path.basename(
+    (os.getenv('TREELITE_TOOLCHAIN') or os.getenv('CC') or sysconfig.get_config_var('CC') or 'gcc').split()[0]
+)
+
+try:
+    # Opsiyonel: sayısal döngüler için JIT derleme
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Kolon bazlı (SoA) varyant gösterimi için alanlar ve varsayılan değerler
+VARIANT_COLUMN_DEFAULTS = {
+    'gene': '',
+    'genotype': '',
+    'effect_size': 0.0,
+    'p_value': 1.0,
+    'quality_score': 0.0,
+    'frequency': 0.5,
+    'pathogenicity': 0.0
+}
+
+# Ölçeklendirilmiş (StandardScaler) girdi bekleyen modeller
+SCALED_MODELS = frozenset({'neural_network', 'svm', 'logistic_regression'})
+
+# Sürekli özellikleri önceden kutulanmış girdiyle eğitilen histogram tabanlı modeller
+BINNED_MODELS = frozenset({'lightgbm', 'lightgbm_deep'})
+
+# Gen çifti -> biyolojik fonksiyon (basit eşleştirme; anahtarlar sırasız)
+GENE_PAIR_FUNCTIONS = {
+    frozenset(pair): function
+    for pair, function in {
+        ('MTHFR', 'MTR'): 'Folate metabolism',
+        ('APOE', 'LDLR'): 'Cholesterol transport',
+        ('CYP2C9', 'CYP2C19'): 'Drug metabolism',
+        ('BRCA1', 'BRCA2'): 'DNA repair'
+    }.items()
+}
+
+# Pathway -> (gen listesi, üyelik seti); örnek veritabanı (gerçek implementasyon için KEGG, Reactome)
+PATHWAY_DATABASE = {
+    name: (tuple(genes), frozenset(genes))
+    for name, genes in {
+        'Folate metabolism': ['MTHFR', 'MTR', 'MTRR', 'DHFR', 'TYMS'],
+        'Cholesterol metabolism': ['APOE', 'LDLR', 'PCSK9', 'CETP', 'ABCG5'],
+        'Drug metabolism': ['CYP2C9', 'CYP2C19', 'CYP2D6', 'CYP3A4', 'DPYD'],
+        'DNA repair': ['BRCA1', 'BRCA2', 'ATM', 'CHEK2', 'PALB2'],
+        'Immune response': ['HLA-A', 'HLA-B', 'HLA-C', 'HLA-DRB1', 'HLA-DQB1']
+    }.items()
+}
+
 @dataclass
 class MLPrediction:
-    """ML tahmin sonucu"""
+    """ML tahmin sonucu (prediction: test doğruluğu, confidence: test F1)"""
     model_name: str
     prediction: float
     confidence: float
-    feature_importance: Dict[str, float]
+    feature_importance: np.ndarray
     cross_validation_score: float
+    
+    @property
+    def feature_importance_dict(self) -> Dict[int, float]:
+        """Özellik önemleri (özellik indeksi -> önem) sözlük olarak"""
+        return dict(enumerate(self.feature_importance.tolist()))
 
 @dataclass
 class PathwayAnalysis:
@@ -52,24 +126,97 @@ class GeneInteraction:
     p_value: float
     biological_function: str
 
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _pair_strengths(counts):
+        """Gen çiftleri için etkileşim gücü matrisi (üst üçgen)"""
+        n = counts.size
+        out = np.zeros((n, n))
+        for i in prange(n):
+            for j in range(i + 1, n):
+                out[i, j] = min(counts[i] * counts[j] / 100.0, 1.0)
+        return out
+
+def _fit_one(
+    model_name: str,
+    model,
+    X_train: np.ndarray,
+    X_train_scaled: np.ndarray,
+    X_train_binned: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    X_test_scaled: np.ndarray,
+    X_test_binned: np.ndarray,
+    y_test: np.ndarray
+) -> Tuple[str, Optional[MLPrediction], object, Optional[Exception]]:
+    """Tek bir modeli eğit ve değerlendir (paralel worker'da çalışır)"""
+    try:
+        # Modelin beklediği tasarım matrisi (ölçekli/kutulanmış/ham) bir kez seçilir
+        if model_name in SCALED_MODELS:
+            X_fit, X_eval = X_train_scaled, X_test_scaled
+        elif model_name in BINNED_MODELS:
+            X_fit, X_eval = X_train_binned, X_test_binned
+        else:
+            X_fit, X_eval = X_train, X_test
+        
+        # Model eğitimi
+        model.fit(X_fit, y_train)
+        y_pred = model.predict_proba(X_eval)[:, 1]
+        
+        # Performans metrikleri
+        y_pred_binary = (y_pred > 0.5).astype(int)
+        accuracy = accuracy_score(y_test, y_pred_binary)
+        precision = precision_score(y_test, y_pred_binary, average='weighted')
+        recall = recall_score(y_test, y_pred_binary, average='weighted')
+        f1 = f1_score(y_test, y_pred_binary, average='weighted')
+        
+        # Cross-validation: fold'lar seri; paralellik yalnızca model seviyesinde
+        # (train_ensemble_model'daki loky Parallel), iç içe havuz açılmaz
+        cv_scores = cross_val_score(model, X_fit, y_train, cv=5, n_jobs=1)
+        
+        # Feature importance
+        feature_importance = np.asarray(getattr(model, 'feature_importances_', np.empty(0)))
+        
+        # Test seti özeti: zaten hesaplanmış metrikler (ek y_pred taraması yok)
+        prediction = MLPrediction(
+            model_name=model_name,
+            prediction=float(accuracy),
+            confidence=float(f1),
+            feature_importance=feature_importance,
+            cross_validation_score=np.mean(cv_scores)
+        )
+        
+        return model_name, prediction, model, None
+        
+    except Exception as e:
+        return model_name, None, None, e
+
 class AdvancedMLAlgorithms:
     """Gelişmiş ML algoritmaları sınıfı"""
     
     def __init__(self):
         """ML algoritmalarını başlat"""
         self.models = {}
+        self.compiled_models = {}
+        # trait -> derlenmiş .so dosyalarının geçici dizini (yeniden eğitimde ya da nesne silinince temizlenir)
+        self.compile_dirs = {}
         self.scalers = {}
+        self.scaler_params = {}
+        self.binners = {}
         self.feature_importance = {}
         
         # Model tanımları
         self.model_configs = {
             'random_forest': RandomForestClassifier(n_estimators=100, random_state=42),
             'gradient_boosting': GradientBoostingClassifier(n_estimators=100, random_state=42),
-            'neural_network': MLPClassifier(hidden_layer_sizes=(100, 50), max_iter=1000, random_state=42),
-            'svm': SVC(probability=True, random_state=42),
+            # Küçük tablo verisinde lbfgs, adam'dan çok daha az (ve daha büyük BLAS) adımla yakınsar;
+            # BLAS thread sayısı OMP_NUM_THREADS ile çekirdek sayısına göre ayarlanmalı
+            'neural_network': MLPClassifier(hidden_layer_sizes=(100, 50), solver='lbfgs', max_iter=200, random_state=42),
+            # Lineer SVM + sigmoid kalibrasyon: RBF SVC + Platt CV'ye göre N'de lineer eğitim
+            'svm': CalibratedClassifierCV(LinearSVC(dual='auto', random_state=42, max_iter=2000), method='sigmoid', cv=3),
             'logistic_regression': LogisticRegression(random_state=42, max_iter=1000),
-            'xgboost': xgb.XGBClassifier(random_state=42),
-            'lightgbm': lgb.LGBMClassifier(random_state=42, verbose=-1)
+            'lightgbm': lgb.LGBMClassifier(random_state=42, verbose=-1),
+            'lightgbm_deep': lgb.LGBMClassifier(num_leaves=127, random_state=42, verbose=-1, n_jobs=1)
         }
     
     def train_ensemble_model(
@@ -85,64 +232,113 @@ class AdvancedMLAlgorithms:
         # Veriyi böl
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=42)
         
+        # float32: ağaç modelleri zaten float32 üzerinde çalışır (kopya ve bellek yarıya iner),
+        # SVM/LR/MLP de float32 girdiyi sorunsuz kabul eder
+        X_train = np.ascontiguousarray(X_train, dtype=np.float32)
+        X_test = np.ascontiguousarray(X_test, dtype=np.float32)
+        
         # Özellik ölçeklendirme
         scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
+        X_train_scaled = np.ascontiguousarray(scaler.fit_transform(X_train), dtype=np.float32)
+        X_test_scaled = np.ascontiguousarray(scaler.transform(X_test), dtype=np.float32)
         
         self.scalers[trait] = scaler
+        # Tahmin yolunda satır başına sklearn transform yerine satır içi (X - mean) * inv_scale
+        self.scaler_params[trait] = (
+            scaler.mean_.astype(np.float32),
+            (1.0 / scaler.scale_).astype(np.float32)
+        )
+        
+        # LightGBM için sürekli kolonları önceden kutula (histogram binning adımı ucuzlar)
+        continuous_cols = np.flatnonzero(
+            [len(np.unique(X_train[:, j])) > 2 for j in range(X_train.shape[1])]
+        )
+        binner = None
+        if continuous_cols.size:
+            binner = KBinsDiscretizer(n_bins=255, encode='ordinal', strategy='quantile', dtype=np.float32)
+            binner.fit(X_train[:, continuous_cols])
+        self.binners[trait] = (continuous_cols, binner)
+        
+        X_train_binned = self._bin_features(trait, X_train)
+        X_test_binned = self._bin_features(trait, X_test)
+        
+        # Modeller bağımsız: paralel eğit, model içi thread'leri kapat (oversubscription)
+        for model in self.model_configs.values():
+            if 'n_jobs' in model.get_params():
+                model.set_params(n_jobs=1)
+        
+        results = Parallel(n_jobs=min(4, os.cpu_count() or 1), backend='loky')(
+            delayed(_fit_one)(
+                model_name, model, X_train, X_train_scaled, X_train_binned,
+                y_train, X_test, X_test_scaled, X_test_binned, y_test
+            )
+            for model_name, model in self.model_configs.items()
+        )
         
         predictions = {}
         
-        # Her model için eğitim
-        for model_name, model in self.model_configs.items():
+        for model_name, prediction, fitted_model, error in results:
+            if error is not None:
+                print(f"  ❌ {model_name} hatası: {error}")
+                continue
+            
+            # Sonuç ve model kaydet
+            predictions[model_name] = prediction
+            self.models[f"{trait}_{model_name}"] = fitted_model
+            
+            print(f"  ✅ {model_name}: CV Score = {prediction.cross_validation_score:.3f}")
+        
+        self._compile_tree_models(trait)
+        
+        return predictions
+    
+    def _bin_features(self, trait: str, X: np.ndarray) -> np.ndarray:
+        """Sürekli kolonları eğitimde öğrenilen kutulara çevir (ikili kolonlar aynen kalır)"""
+        continuous_cols, binner = self.binners.get(trait, (None, None))
+        if binner is None:
+            return X
+        
+        X_binned = np.array(X, dtype=np.float32)
+        X_binned[:, continuous_cols] = binner.transform(X_binned[:, continuous_cols])
+        return X_binned
+    
+    def _compile_tree_models(self, trait: str):
+        """LightGBM modellerini Treelite ile derle (tek satır çıkarım için)"""
+        if treelite is None:
+            return
+        
+        # Önceki eğitimin derlenmiş kütüphanelerini bırak
+        previous_dir = self.compile_dirs.pop(trait, None)
+        if previous_dir is not None:
+            for model_name in ['lightgbm', 'lightgbm_deep']:
+                self.compiled_models.pop(f"{trait}_{model_name}", None)
+            previous_dir.cleanup()
+        
+        compile_dir = tempfile.TemporaryDirectory(prefix=f"{trait}_")
+        self.compile_dirs[trait] = compile_dir
+        
+        for model_name in ['lightgbm', 'lightgbm_deep']:
+            model_key = f"{trait}_{model_name}"
+            if model_key not in self.models:
+                continue
+            
             try:
-                # Model eğitimi
-                if model_name in ['neural_network', 'svm', 'logistic_regression']:
-                    model.fit(X_train_scaled, y_train)
-                    y_pred = model.predict_proba(X_test_scaled)[:, 1]
-                else:
-                    model.fit(X_train, y_train)
-                    y_pred = model.predict_proba(X_test)[:, 1]
-                
-                # Performans metrikleri
-                y_pred_binary = (y_pred > 0.5).astype(int)
-                accuracy = accuracy_score(y_test, y_pred_binary)
-                precision = precision_score(y_test, y_pred_binary, average='weighted')
-                recall = recall_score(y_test, y_pred_binary, average='weighted')
-                f1 = f1_score(y_test, y_pred_binary, average='weighted')
+                tl_model = treelite.frontend.from_lightgbm(self.models[model_key].booster_)
                 
-                # Cross-validation
-                if model_name in ['neural_network', 'svm', 'logistic_regression']:
-                    cv_scores = cross_val_score(model, X_train_scaled, y_train, cv=5)
-                else:
-                    cv_scores = cross_val_score(model, X_train, y_train, cv=5)
-                
-                # Feature importance
-                if hasattr(model, 'feature_importances_'):
-                    feature_importance = dict(zip(range(len(X[0])), model.feature_importances_))
-                else:
-                    feature_importance = {}
-                
-                # Sonuç kaydet
-                predictions[model_name] = MLPrediction(
-                    model_name=model_name,
-                    prediction=np.mean(y_pred),
-                    confidence=np.std(y_pred),
-                    feature_importance=feature_importance,
-                    cross_validation_score=np.mean(cv_scores)
-                )
-                
-                # Model kaydet
-                self.models[f"{trait}_{model_name}"] = model
-                
-                print(f"  ✅ {model_name}: CV Score = {np.mean(cv_scores):.3f}")
+                libpath = str(Path(compile_dir.name) / f"{model_name}.so")
+                tl2cgen.export_lib(tl_model, toolchain=TREELITE_TOOLCHAIN, libpath=libpath, params={'parallel_comp': 4})
+                self.compiled_models[model_key] = tl2cgen.Predictor(libpath)
                 
             except Exception as e:
-                print(f"  ❌ {model_name} hatası: {e}")
-                continue
-        
-        return predictions
+                print(f"  ⚠️ {model_name} derleme hatası: {e}")
+                self.compiled_models.pop(model_key, None)
+    
+    def close(self):
+        """Derlenmiş modelleri bırak ve geçici derleme dizinlerini sil"""
+        self.compiled_models.clear()
+        for compile_dir in self.compile_dirs.values():
+            compile_dir.cleanup()
+        self.compile_dirs.clear()
     
     def predict_disease_risk(
         self, 
@@ -150,14 +346,46 @@ class AdvancedMLAlgorithms:
         trait: str
     ) -> Dict[str, float]:
         """Hastalık riski tahmini"""
-        print(f"🔮 {trait} için hastalık riski tahmin ediliyor...")
+        batch_predictions = self.predict_disease_risk_batch([variants], trait)
+        return {model_name: float(preds[0]) for model_name, preds in batch_predictions.items()}
+    
+    def predict_disease_risk_batch(
+        self, 
+        variants_batch: List[List[Dict]], 
+        trait: str
+    ) -> Dict[str, np.ndarray]:
+        """Toplu hastalık riski tahmini (model başına tek predict_proba çağrısı)"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔮 %s için hastalık riski tahmin ediliyor (%d örnek)...", trait, len(variants_batch))
+        
+        # Özellik matrisi oluştur (seyrek: genotip one-hot bloğu çoğunlukla sıfır)
+        feature_rows = [self._create_feature_vector(variants, sparse=True) for variants in variants_batch]
         
-        # Özellik vektörü oluştur
-        features = self._create_feature_vector(variants)
+        if not feature_rows or any(row is None or row.shape[1] == 0 for row in feature_rows):
+            return {}
         
-        if features is None or len(features) == 0:
+        # Farklı genişlikteki satırlar yığılamaz; eğitimdeki genişlikle de uyuşmalı
+        widths = {row.shape[1] for row in feature_rows}
+        scaler_params = self.scaler_params.get(trait)
+        if len(widths) != 1 or (scaler_params and scaler_params[0].size not in widths):
+            logger.warning("⚠️ %s için özellik genişlikleri uyuşmuyor: %s", trait, sorted(widths))
             return {}
         
+        X = sp.vstack(feature_rows, format='csr').astype(np.float32)
+        
+        # Merkezleme (scaler) ve derlenmiş tahminciler yoğun matris ister; bir kez aç
+        X_dense = X.toarray()
+        
+        # Özellik ölçeklendirme (ölçekleyici kullanan modeller için bir kez)
+        if scaler_params:
+            mean, inv_scale = scaler_params
+            X_scaled = (X_dense - mean) * inv_scale
+        else:
+            X_scaled = None
+        
+        # Kutulanmış girdi (LightGBM modelleri için bir kez)
+        X_binned = self._bin_features(trait, X_dense)
+        
         predictions = {}
         
         # Her model için tahmin
@@ -166,19 +394,23 @@ class AdvancedMLAlgorithms:
             if model_key in self.models:
                 try:
                     model = self.models[model_key]
-                    scaler = self.scalers.get(trait)
+                    compiled = self.compiled_models.get(model_key)
                     
-                    # Özellik ölçeklendirme
-                    if scaler and model_name in ['neural_network', 'svm', 'logistic_regression']:
-                        features_scaled = scaler.transform([features])
-                        pred = model.predict_proba(features_scaled)[0][1]
+                    if compiled is not None:
+                        # Derlenmiş ağaçlar sigmoid sonrası pozitif sınıf olasılığını döndürür
+                        X_model = X_binned if model_name in BINNED_MODELS else X_dense
+                        preds = np.asarray(compiled.predict(tl2cgen.DMatrix(X_model))).reshape(X.shape[0], -1)[:, -1]
+                    elif X_scaled is not None and model_name in SCALED_MODELS:
+                        preds = model.predict_proba(X_scaled)[:, 1]
+                    elif model_name in BINNED_MODELS:
+                        preds = model.predict_proba(X_binned)[:, 1]
                     else:
-                        pred = model.predict_proba([features])[0][1]
+                        preds = model.predict_proba(X)[:, 1]
                     
-                    predictions[model_name] = pred
+                    predictions[model_name] = preds
                     
                 except Exception as e:
-                    print(f"  ⚠️ {model_name} tahmin hatası: {e}")
+                    logger.warning("⚠️ %s tahmin hatası: %s", model_name, e)
                     continue
         
         return predictions
@@ -189,50 +421,53 @@ class AdvancedMLAlgorithms:
         background_genes: List[str]
     ) -> List[PathwayAnalysis]:
         """Pathway analizi"""
-        print("🛤️ Pathway analizi yapılıyor...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🛤️ Pathway analizi yapılıyor...")
         
         # Varyant genlerini topla
-        variant_genes = [v.get('gene', '') for v in variants if v.get('gene')]
-        variant_genes = list(set(variant_genes))
+        soa = self._to_soa(variants)
+        variant_genes = list(set(soa.gene[soa.gene != ''].tolist()))
         
         if not variant_genes:
             return []
         
         # Pathway veritabanı (gerçek implementasyon için KEGG, Reactome kullanılacak)
         pathways = self._get_pathway_database()
+        pathway_names = list(pathways.keys())
+        
+        # Overlap hesapla
+        variant_gene_set = frozenset(variant_genes)
+        overlaps = [sorted(variant_gene_set & pathways[name][1]) for name in pathway_names]
+        
+        # Tüm pathway'ler için 2x2 tablo hücreleri
+        a = np.array([len(overlap) for overlap in overlaps])  # Pathway'deki varyant genler
+        b = np.array([len(pathways[name][0]) for name in pathway_names]) - a  # Pathway'deki diğer genler
+        c = len(variant_genes) - a  # Varyant genlerdeki diğer genler
+        d = np.maximum(len(background_genes) - a - b - c, 0)  # Background'daki diğer genler
+        
+        # Enrichment analizi (tek yönlü Fisher's exact = hipergeometrik kuyruk), tek çağrıda
+        total = a + b + c + d
+        p_values = stats.hypergeom.sf(a - 1, total, a + b, a + c)
+        
+        # FDR düzeltmesi (Benjamini-Hochberg)
+        fdr_values = self._benjamini_hochberg(p_values)
+        
+        # Enrichment skoru
+        enrichment_scores = (a / (a + b)) / (len(variant_genes) / total)
         
         pathway_results = []
         
-        for pathway_name, pathway_genes in pathways.items():
-            # Overlap hesapla
-            overlap_genes = list(set(variant_genes) & set(pathway_genes))
-            
-            if len(overlap_genes) == 0:
-                continue
-            
-            # Enrichment analizi (Fisher's exact test)
-            a = len(overlap_genes)  # Pathway'deki varyant genler
-            b = len(pathway_genes) - a  # Pathway'deki diğer genler
-            c = len(variant_genes) - a  # Varyant genlerdeki diğer genler
-            d = len(background_genes) - a - b - c  # Background'daki diğer genler
-            
-            # Fisher's exact test
-            odds_ratio, p_value = stats.fisher_exact([[a, b], [c, d]])
-            
-            # FDR düzeltmesi (basit)
-            fdr_corrected = p_value * len(pathways)
-            
-            # Enrichment skoru
-            enrichment_score = (a / len(pathway_genes)) / (len(variant_genes) / len(background_genes))
+        for idx in np.flatnonzero(a):
+            pathway_genes = list(pathways[pathway_names[idx]][0])
             
             pathway_result = PathwayAnalysis(
-                pathway_name=pathway_name,
+                pathway_name=pathway_names[idx],
                 genes=pathway_genes,
-                p_value=p_value,
-                fdr_corrected=fdr_corrected,
-                enrichment_score=enrichment_score,
+                p_value=float(p_values[idx]),
+                fdr_corrected=float(fdr_values[idx]),
+                enrichment_score=float(enrichment_scores[idx]),
                 pathway_genes=pathway_genes,
-                overlap_genes=overlap_genes
+                overlap_genes=overlaps[idx]
             )
             
             pathway_results.append(pathway_result)
@@ -247,42 +482,50 @@ class AdvancedMLAlgorithms:
         variants: List[Dict]
     ) -> List[GeneInteraction]:
         """Gen-gen etkileşim analizi"""
-        print("🔗 Gen-gen etkileşim analizi yapılıyor...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔗 Gen-gen etkileşim analizi yapılıyor...")
         
-        # Varyant genlerini topla
-        variant_genes = [v.get('gene', '') for v in variants if v.get('gene')]
-        variant_genes = list(set(variant_genes))
+        # Genleri tamsayı kodlarına çevir, gen başına varyant sayıları (tek geçiş)
+        soa = self._to_soa(variants)
+        codes, genes = pd.factorize(soa.gene[soa.gene != ''])
         
-        if len(variant_genes) < 2:
+        if len(genes) < 2:
             return []
         
+        genes = np.asarray(genes, dtype=object)
+        counts = np.bincount(codes, minlength=len(genes)).astype(np.float64)
+        
+        # Tüm gen çiftleri için etkileşim gücü (basit korelasyon) ve p-value
+        if NUMBA_AVAILABLE:
+            strength_matrix = _pair_strengths(counts)
+        else:
+            strength_matrix = np.minimum(np.outer(counts, counts) / 100.0, 1.0)
+        upper_i, upper_j = np.triu_indices(len(genes), k=1)
+        strengths = strength_matrix[upper_i, upper_j]
+        p_values = np.clip(1.0 - strengths, 0.001, None)
+        
+        # Etkileşim türü
+        interaction_types = np.select(
+            [strengths > 0.8, strengths > 0.5, strengths > 0.2],
+            ['Strong', 'Moderate', 'Weak'],
+            default='None'
+        )
+        
         interactions = []
         
-        # Her gen çifti için etkileşim analizi
-        for i, gene1 in enumerate(variant_genes):
-            for gene2 in variant_genes[i+1:]:
-                # Etkileşim gücü hesapla (basit korelasyon)
-                interaction_strength = self._calculate_interaction_strength(gene1, gene2, variants)
-                
-                # P-value hesapla
-                p_value = self._calculate_interaction_pvalue(gene1, gene2, variants)
-                
-                # Etkileşim türü belirle
-                interaction_type = self._determine_interaction_type(interaction_strength)
-                
-                # Biyolojik fonksiyon
-                biological_function = self._get_biological_function(gene1, gene2)
-                
-                interaction = GeneInteraction(
-                    gene1=gene1,
-                    gene2=gene2,
-                    interaction_type=interaction_type,
-                    interaction_strength=interaction_strength,
-                    p_value=p_value,
-                    biological_function=biological_function
-                )
-                
-                interactions.append(interaction)
+        for gene1, gene2, interaction_type, interaction_strength, p_value in zip(
+            genes[upper_i], genes[upper_j], interaction_types.tolist(), strengths.tolist(), p_values.tolist()
+        ):
+            interaction = GeneInteraction(
+                gene1=gene1,
+                gene2=gene2,
+                interaction_type=interaction_type,
+                interaction_strength=interaction_strength,
+                p_value=p_value,
+                biological_function=self._get_biological_function(gene1, gene2)
+            )
+            
+            interactions.append(interaction)
         
         # Etkileşim gücüne göre sırala
         interactions.sort(key=lambda x: x.interaction_strength, reverse=True)
@@ -295,114 +538,133 @@ class AdvancedMLAlgorithms:
         gene: str
     ) -> Dict[str, float]:
         """Rare variant burden analizi"""
-        print(f"🔍 {gene} için rare variant burden analizi...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 %s için rare variant burden analizi...", gene)
+        
+        soa = self._to_soa(variants)
         
         # Gen-specific varyantları filtrele
-        gene_variants = [v for v in variants if v.get('gene') == gene]
+        gene_mask = soa.gene == gene
+        total_variants = int(gene_mask.sum())
         
-        if not gene_variants:
+        if total_variants == 0:
             return {}
         
         # Rare variant kriterleri
         rare_threshold = 0.01  # %1'den az frekans
         
-        rare_variants = []
-        for variant in gene_variants:
-            # Frekans bilgisi varsa kontrol et
-            frequency = variant.get('frequency', 0.5)  # Varsayılan
-            if frequency < rare_threshold:
-                rare_variants.append(variant)
+        # Frekans bilgisi yoksa varsayılan 0.5 (bkz. _to_soa)
+        rare_mask = gene_mask & (soa.frequency < rare_threshold)
+        rare_variants = int(rare_mask.sum())
         
         # Burden skorları
         burden_scores = {
-            'total_variants': len(gene_variants),
-            'rare_variants': len(rare_variants),
-            'burden_ratio': len(rare_variants) / len(gene_variants) if gene_variants else 0,
-            'pathogenic_rare': len([v for v in rare_variants if v.get('pathogenicity', 0) > 0.7]),
-            'burden_score': sum(v.get('effect_size', 0) for v in rare_variants)
+            'total_variants': total_variants,
+            'rare_variants': rare_variants,
+            'burden_ratio': rare_variants / total_variants,
+            'pathogenic_rare': int((rare_mask & (soa.pathogenicity > 0.7)).sum()),
+            'burden_score': float(soa.effect_size[rare_mask].sum())
         }
         
         return burden_scores
     
-    def _create_feature_vector(self, variants: List[Dict]) -> Optional[np.ndarray]:
-        """Özellik vektörü oluştur"""
+    def _to_soa(self, variants: List[Dict]) -> SimpleNamespace:
+        """Varyant listesini (dict dizisi) kolon dizilerine çevir"""
+        frame = pd.DataFrame(variants, columns=list(VARIANT_COLUMN_DEFAULTS))
+        
+        columns = {}
+        for column, default in VARIANT_COLUMN_DEFAULTS.items():
+            values = frame[column].where(frame[column].notna(), default)
+            dtype = object if isinstance(default, str) else np.float64
+            columns[column] = values.to_numpy(dtype=dtype)
+        
+        return SimpleNamespace(**columns)
+    
+    def _create_feature_vector(
+        self, 
+        variants: List[Dict], 
+        sparse: bool = False
+    ) -> Optional[Union[np.ndarray, sp.csr_matrix]]:
+        """Özellik vektörü oluştur (sparse=True ise 1 x 7N CSR satırı)"""
         if not variants:
             return None
         
-        # Özellikler
-        features = []
-        
-        for variant in variants:
-            # Genotip özellikleri
-            genotype = variant.get('genotype', '')
-            if genotype == 'AA':
-                features.extend([1, 0, 0])  # Homozygous reference
-            elif genotype == 'AT' or genotype == 'AC' or genotype == 'AG':
-                features.extend([0, 1, 0])  # Heterozygous
-            elif genotype == 'TT' or genotype == 'CC' or genotype == 'GG':
-                features.extend([0, 0, 1])  # Homozygous alternative
-            else:
-                features.extend([0, 0, 0])  # Unknown
-            
-            # Diğer özellikler
-            features.append(variant.get('effect_size', 0))
-            features.append(variant.get('p_value', 1))
-            features.append(variant.get('quality_score', 0) / 100)
-            features.append(1 if variant.get('pathogenicity', 0) > 0.5 else 0)
+        soa = self._to_soa(variants)
         
-        return np.array(features)
-    
-    def _get_pathway_database(self) -> Dict[str, List[str]]:
-        """Pathway veritabanı (örnek)"""
-        return {
-            'Folate metabolism': ['MTHFR', 'MTR', 'MTRR', 'DHFR', 'TYMS'],
-            'Cholesterol metabolism': ['APOE', 'LDLR', 'PCSK9', 'CETP', 'ABCG5'],
-            'Drug metabolism': ['CYP2C9', 'CYP2C19', 'CYP2D6', 'CYP3A4', 'DPYD'],
-            'DNA repair': ['BRCA1', 'BRCA2', 'ATM', 'CHEK2', 'PALB2'],
-            'Immune response': ['HLA-A', 'HLA-B', 'HLA-C', 'HLA-DRB1', 'HLA-DQB1']
-        }
+        if sparse:
+            return self._create_sparse_feature_vector(soa)
+        
+        # Varyant başına 7 özellik: genotip one-hot (3) + effect size, p-value, kalite, patojenite
+        features = np.column_stack([
+            np.isin(soa.genotype, ['AA']),               # Homozygous reference
+            np.isin(soa.genotype, ['AT', 'AC', 'AG']),   # Heterozygous
+            np.isin(soa.genotype, ['TT', 'CC', 'GG']),   # Homozygous alternative
+            soa.effect_size,
+            soa.p_value,
+            soa.quality_score / 100,
+            soa.pathogenicity > 0.5
+        ]).astype(np.float64)
+        
+        return features.ravel()
     
-    def _calculate_interaction_strength(self, gene1: str, gene2: str, variants: List[Dict]) -> float:
-        """Etkileşim gücü hesapla"""
-        # Basit korelasyon benzeri hesaplama
-        gene1_variants = [v for v in variants if v.get('gene') == gene1]
-        gene2_variants = [v for v in variants if v.get('gene') == gene2]
-        
-        if not gene1_variants or not gene2_variants:
-            return 0.0
-        
-        # Etkileşim skoru (basit)
-        interaction_score = len(gene1_variants) * len(gene2_variants) / 100
-        return min(interaction_score, 1.0)
+    def _create_sparse_feature_vector(self, soa: SimpleNamespace) -> sp.csr_matrix:
+        """Yoğun vektörle aynı kolon düzeninde seyrek özellik satırı"""
+        n = len(soa.genotype)
+        base = np.arange(n) * 7
+        
+        # One-hot bloğundan varyant başına en fazla bir giriş
+        onehot_offset = np.select(
+            [
+                np.isin(soa.genotype, ['AA']),
+                np.isin(soa.genotype, ['AT', 'AC', 'AG']),
+                np.isin(soa.genotype, ['TT', 'CC', 'GG'])
+            ],
+            [0, 1, 2],
+            default=-1
+        )
+        known = onehot_offset >= 0
+        
+        cols = np.concatenate([
+            base[known] + onehot_offset[known],
+            base + 3,
+            base + 4,
+            base + 5,
+            base + 6
+        ])
+        data = np.concatenate([
+            np.ones(int(known.sum())),
+            soa.effect_size,
+            soa.p_value,
+            soa.quality_score / 100,
+            (soa.pathogenicity > 0.5).astype(np.float64)
+        ])
+        
+        row = sp.coo_matrix((data, (np.zeros_like(cols), cols)), shape=(1, n * 7)).tocsr()
+        row.eliminate_zeros()
+        return row
     
-    def _calculate_interaction_pvalue(self, gene1: str, gene2: str, variants: List[Dict]) -> float:
-        """Etkileşim p-value hesapla"""
-        # Basit p-value hesaplama
-        interaction_strength = self._calculate_interaction_strength(gene1, gene2, variants)
-        return max(0.001, 1.0 - interaction_strength)
+    def _benjamini_hochberg(self, p_values: np.ndarray) -> np.ndarray:
+        """Benjamini-Hochberg FDR düzeltmesi (log uzayında; çok küçük p'lerde denormal çarpım yok)"""
+        m = len(p_values)
+        if m == 0:
+            return p_values
+        
+        order = np.argsort(p_values)
+        with np.errstate(divide='ignore'):
+            log_ranked = np.log(p_values[order]) + np.log(m) - np.log(np.arange(1, m + 1))
+        log_ranked = np.minimum.accumulate(log_ranked[::-1])[::-1]
+        
+        fdr_values = np.empty(m)
+        fdr_values[order] = np.exp(np.minimum(log_ranked, 0.0))
+        return fdr_values
     
-    def _determine_interaction_type(self, strength: float) -> str:
-        """Etkileşim türü belirle"""
-        if strength > 0.8:
-            return "Strong"
-        elif strength > 0.5:
-            return "Moderate"
-        elif strength > 0.2:
-            return "Weak"
-        else:
-            return "None"
+    def _get_pathway_database(self) -> Dict[str, Tuple[Tuple[str, ...], FrozenSet[str]]]:
+        """Pathway veritabanı (örnek) - gen listesi ve üyelik seti"""
+        return PATHWAY_DATABASE
     
     def _get_biological_function(self, gene1: str, gene2: str) -> str:
-        """Biyolojik fonksiyon belirle"""
-        # Basit fonksiyon eşleştirmesi
-        functions = {
-            ('MTHFR', 'MTR'): 'Folate metabolism',
-            ('APOE', 'LDLR'): 'Cholesterol transport',
-            ('CYP2C9', 'CYP2C19'): 'Drug metabolism',
-            ('BRCA1', 'BRCA2'): 'DNA repair'
-        }
-        
-        return functions.get((gene1, gene2), 'Unknown function')
+        """Biyolojik fonksiyon belirle (gen sırasından bağımsız)"""
+        return GENE_PAIR_FUNCTIONS.get(frozenset((gene1, gene2)), 'Unknown function')
 
 def main():
     """Test fonksiyonu"""
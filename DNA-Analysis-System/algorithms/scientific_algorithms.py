@@ -6,9 +6,140 @@ Poligenik risk skorları, popülasyon frekansları, fonksiyonel etki tahmini
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 import math
-from scipy import stats
+import functools
+import logging
+from bisect import bisect_right
+from scipy import special
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Opsiyonel: büyük varyant setlerinde PRS çekirdeğini JIT derleme
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Bu sayının altında NumPy yolu yeterince hızlı (JIT çağrı maliyetine değmez)
+NUMBA_MIN_VARIANTS = 10000
+
+# Genotip ağırlıkları
+GENOTYPE_WEIGHTS = {
+    'AA': 0.0,    # Referans
+    'AT': 0.5,    # Heterozigot
+    'TT': 1.0,    # Homozigot
+    'AC': 0.5,
+    'CC': 1.0,
+    'AG': 0.5,
+    'GG': 1.0,
+    'TC': 0.5,
+    'TG': 0.5,
+    'CG': 0.5,
+    '--': 0.0,    # Eksik veri
+}
+
+# Özellik-specific varyant ağırlıkları
+TRAIT_WEIGHTS = {
+    'cardiovascular_disease': {
+        'rs1801133': 1.5,  # MTHFR
+        'rs429358': 2.0,   # APOE
+        'rs7412': 1.8,     # APOE
+    },
+    'alzheimer_disease': {
+        'rs429358': 3.0,   # APOE
+        'rs7412': 2.5,     # APOE
+    },
+    'diabetes': {
+        'rs1801133': 1.2,  # MTHFR
+    }
+}
+
+# P-value eşikleri (artan) ve aralık ağırlıkları: p < eşik[i] ise ağırlık[i], hiçbiri değilse 0.0
+PVALUE_THRESHOLDS = (1e-8, 1e-5, 1e-3, 1e-2, 0.05)
+PVALUE_WEIGHTS = (1.0, 0.8, 0.6, 0.4, 0.2, 0.0)
+_PVALUE_THRESHOLDS_ARRAY = np.array(PVALUE_THRESHOLDS)
+_PVALUE_WEIGHTS_ARRAY = np.array(PVALUE_WEIGHTS)
+
+# Fonksiyonel etki kategorileri: skor >= eşik[i] ise etiket[i + 1]
+IMPACT_THRESHOLDS = (0.2, 0.5, 0.8)
+IMPACT_LABELS = ("Minimal Etki", "Düşük Etki", "Orta Etki", "Yüksek Etki")
+_IMPACT_THRESHOLDS_ARRAY = np.array(IMPACT_THRESHOLDS)
+_IMPACT_LABELS_ARRAY = np.array(IMPACT_LABELS)
+
+# Risk kategorileri (percentil): percentil >= eşik[i] ise etiket[i + 1]
+RISK_THRESHOLDS = (20, 40, 60, 80, 95)
+RISK_LABELS = ("Düşük Risk", "Orta-Düşük Risk", "Orta Risk", "Orta-Yüksek Risk", "Yüksek Risk", "Çok Yüksek Risk")
+_RISK_THRESHOLDS_ARRAY = np.array(RISK_THRESHOLDS, dtype=np.float64)
+_RISK_LABELS_ARRAY = np.array(RISK_LABELS)
+
+# Örnek popülasyon frekansları (gerçek implementasyon için 1000 Genomes Project API)
+SAMPLE_FREQUENCIES = {
+    'rs1801133': {
+        'European': {'frequency': 0.32, 'sample_size': 503, 'confidence_level': 0.95},
+        'African': {'frequency': 0.15, 'sample_size': 661, 'confidence_level': 0.95},
+        'Asian': {'frequency': 0.28, 'sample_size': 504, 'confidence_level': 0.95},
+        'American': {'frequency': 0.25, 'sample_size': 347, 'confidence_level': 0.95}
+    },
+    'rs429358': {
+        'European': {'frequency': 0.14, 'sample_size': 503, 'confidence_level': 0.95},
+        'African': {'frequency': 0.08, 'sample_size': 661, 'confidence_level': 0.95},
+        'Asian': {'frequency': 0.06, 'sample_size': 504, 'confidence_level': 0.95},
+        'American': {'frequency': 0.12, 'sample_size': 347, 'confidence_level': 0.95}
+    }
+}
+
+DEFAULT_SAMPLE_FREQUENCY = {
+    'frequency': 0.1,
+    'sample_size': 100,
+    'confidence_level': 0.95
+}
+
+if NUMBA_AVAILABLE:
+    @njit(fastmath=True, cache=True)
+    def _prs_kernel(effect_sizes, p_values, genotype_weights, variant_weights, pop_weight):
+        """PRS toplamları: (ağırlıklı skor toplamı, toplam ağırlık)"""
+        total_score = 0.0
+        total_weight = 0.0
+        for i in range(effect_sizes.size):
+            p_value = p_values[i]
+            if p_value > 0.05:
+                continue
+            
+            if p_value < 1e-8:
+                p_weight = 1.0
+            elif p_value < 1e-5:
+                p_weight = 0.8
+            elif p_value < 0.001:
+                p_weight = 0.6
+            elif p_value < 0.01:
+                p_weight = 0.4
+            elif p_value < 0.05:
+                p_weight = 0.2
+            else:
+                p_weight = 0.0
+            
+            total_score += effect_sizes[i] * genotype_weights[i] * variant_weights[i] * pop_weight * p_weight
+            total_weight += variant_weights[i] * p_weight
+        return total_score, total_weight
+    
+    # Import sırasında ısıt: çekirdek derlenir (ya da diskteki cache'den yüklenir),
+    # ilk büyük istek JIT derleme gecikmesini ödemez
+    _warmup = np.zeros(1, dtype=np.float64)
+    _prs_kernel(_warmup, _warmup, _warmup, _warmup, 1.0)
+    del _warmup
+
+def _binned_labels(values: np.ndarray, thresholds: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Artan eşiklere göre etiket dizisi (değer >= eşik sağdaki aralığa düşer; NaN ilk etikete)"""
+    values = np.asarray(values, dtype=np.float64)
+    index = np.searchsorted(thresholds, values, side='right')
+    return labels[np.where(np.isnan(values), 0, index)]
+
+@functools.lru_cache(maxsize=32)
+def _trait_weight_series(trait: str) -> pd.Series:
+    """Özellik-specific ağırlıklar, rsid indeksli seri (toplu eşleme için)"""
+    return pd.Series(TRAIT_WEIGHTS.get(trait, {}), dtype=np.float64)
 
 @dataclass
 class PolygenicRiskScore:
@@ -38,6 +169,40 @@ class FunctionalImpact:
     conservation_score: float
     pathogenicity_score: float
 
+@dataclass
+class VariantTable:
+    """Kolon bazlı (SoA) varyant tablosu; algoritmalar aynı dizileri paylaşır"""
+    rsid: np.ndarray         # object
+    gene: np.ndarray         # object
+    genotype: np.ndarray     # object
+    effect_size: np.ndarray  # float64
+    p_value: np.ndarray      # float64
+    position: np.ndarray     # int64
+    
+    def __len__(self) -> int:
+        return len(self.rsid)
+    
+    @classmethod
+    def from_records(cls, variants: List[Dict]) -> 'VariantTable':
+        """Varyant sözlük listesinden tabloyu bir kez oluştur"""
+        n = len(variants)
+        
+        def column(key, default, dtype):
+            return np.fromiter((variant.get(key, default) for variant in variants), dtype=dtype, count=n)
+        
+        return cls(
+            rsid=column('rsid', '', object),
+            gene=column('gene', '', object),
+            genotype=column('genotype', '', object),
+            effect_size=column('effect_size', 0.0, np.float64),
+            p_value=column('p_value', 1.0, np.float64),
+            position=column('position', 0, np.int64)
+        )
+    
+    def subset(self, mask: np.ndarray) -> 'VariantTable':
+        """Maske/indeks ile seçilen satırlardan yeni tablo"""
+        return VariantTable(**{field.name: getattr(self, field.name)[mask] for field in fields(self)})
+
 class ScientificAlgorithms:
     """Bilimsel analiz algoritmaları"""
     
@@ -50,10 +215,28 @@ class ScientificAlgorithms:
             'American': 0.85,
             'Mixed': 0.75
         }
+        
+        # Örnek popülasyon frekansları, (rsid, popülasyon) indeksli tablo
+        self._freq_df = pd.DataFrame(
+            [
+                {'rsid': rsid, 'population': population, **freq_data}
+                for rsid, populations in SAMPLE_FREQUENCIES.items()
+                for population, freq_data in populations.items()
+            ],
+            columns=['rsid', 'population', 'frequency', 'sample_size', 'confidence_level']
+        ).set_index(['rsid', 'population'])
+        
+        # Rastgele sayı üreteci (örnek korunma skorları için)
+        self._rng = np.random.default_rng()
+        
+        # Genotip ağırlık tablosu: ord(g[0]) * 256 + ord(g[1]) -> ağırlık
+        self._genotype_weight_table = np.zeros(256 * 256, dtype=np.float32)
+        for genotype, weight in GENOTYPE_WEIGHTS.items():
+            self._genotype_weight_table[ord(genotype[0]) * 256 + ord(genotype[1])] = weight
     
     def calculate_polygenic_risk_score(
         self, 
-        variants: List[Dict], 
+        variants: Union[List[Dict], VariantTable], 
         trait: str,
         population: str = 'European'
     ) -> PolygenicRiskScore:
@@ -61,50 +244,45 @@ class ScientificAlgorithms:
         Poligenik risk skoru hesapla
         
         Args:
-            variants: Varyant listesi (rsid, effect_size, p_value, genotype)
+            variants: Varyant listesi (rsid, effect_size, p_value, genotype) veya VariantTable
             trait: Analiz edilecek özellik
             population: Popülasyon
         
         Returns:
             Poligenik risk skoru
         """
-        print(f"🧮 {trait} için poligenik risk skoru hesaplanıyor...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🧮 %s için poligenik risk skoru hesaplanıyor...", trait)
         
-        # Özellik-specific ağırlıklar
-        trait_weights = self._get_trait_weights(trait)
+        # Özellik-specific ağırlıklar (rsid indeksli seri)
+        trait_weights = _trait_weight_series(trait)
         
         # Popülasyon ağırlığı
         pop_weight = self.population_weights.get(population, 1.0)
         
-        # Risk skoru hesapla
-        total_score = 0.0
-        total_weight = 0.0
+        # Önce p-value filtresi (sadece anlamlı varyantlar); diğer kolonlar yalnızca bunlar için okunur
+        table = self._significant_variant_table(variants, PVALUE_THRESHOLDS[-1])
+        n = len(table)
+        effect_sizes = table.effect_size
+        p_values = table.p_value
         
-        for variant in variants:
-            rsid = variant.get('rsid', '')
-            effect_size = variant.get('effect_size', 0.0)
-            p_value = variant.get('p_value', 1.0)
-            genotype = variant.get('genotype', '')
-            
-            # P-value filtresi (sadece anlamlı varyantlar)
-            if p_value > 0.05:
-                continue
-            
-            # Genotip ağırlığı
-            genotype_weight = self._get_genotype_weight(genotype)
-            
-            # Varyant ağırlığı
-            variant_weight = trait_weights.get(rsid, 1.0)
-            
-            # Skor hesapla
-            variant_score = effect_size * genotype_weight * variant_weight * pop_weight
-            
-            # P-value'ya göre ağırlıklandır
-            p_weight = self._get_pvalue_weight(p_value)
-            variant_score *= p_weight
+        # Genotip ve varyant ağırlıkları
+        genotype_weights = self._get_genotype_weights(table.genotype)
+        variant_weights = pd.Series(table.rsid).map(trait_weights).fillna(1.0).to_numpy(np.float64, copy=True)
+        
+        if NUMBA_AVAILABLE and n >= NUMBA_MIN_VARIANTS:
+            # Büyük varyant setleri: p-ağırlığı, çarpım ve toplam tek geçişte (ara dizi yok)
+            total_score, total_weight = _prs_kernel(
+                effect_sizes, p_values, genotype_weights, variant_weights, pop_weight
+            )
+        else:
+            # P-value ağırlıkları
+            p_weights = self._get_pvalue_weights(p_values)
             
-            total_score += variant_score
-            total_weight += variant_weight * p_weight
+            # Risk skoru hesapla
+            variant_scores = effect_sizes * genotype_weights * variant_weights * pop_weight * p_weights
+            total_score = float(variant_scores.sum())
+            total_weight = float((variant_weights * p_weights).sum())
         
         # Normalize et
         if total_weight > 0:
@@ -149,63 +327,69 @@ class ScientificAlgorithms:
         if populations is None:
             populations = ['European', 'African', 'Asian', 'American']
         
-        print(f"🌍 {len(rsids)} RSID için popülasyon frekansları hesaplanıyor...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🌍 %d RSID için popülasyon frekansları hesaplanıyor...", len(rsids))
         
-        frequencies = []
+        # Gerçek implementasyon için 1000 Genomes Project API kullanılacak
+        # Şimdilik örnek veri: tüm (rsid, popülasyon) çiftleri tek reindex ile
+        index = pd.MultiIndex.from_product([rsids, populations], names=['rsid', 'population'])
+        freq_df = self._freq_df.reindex(index).fillna(DEFAULT_SAMPLE_FREQUENCY)
+        freq_df['sample_size'] = freq_df['sample_size'].astype(int)
         
-        for rsid in rsids:
-            for population in populations:
-                # Gerçek implementasyon için 1000 Genomes Project API kullanılacak
-                # Şimdilik örnek veri
-                freq_data = self._get_sample_frequency(rsid, population)
-                
-                frequency = PopulationFrequency(
-                    rsid=rsid,
-                    population=population,
-                    frequency=freq_data['frequency'],
-                    sample_size=freq_data['sample_size'],
-                    confidence_level=freq_data['confidence_level']
-                )
-                
-                frequencies.append(frequency)
-        
-        return frequencies
+        return [
+            PopulationFrequency(
+                rsid=rsid,
+                population=population,
+                frequency=frequency,
+                sample_size=sample_size,
+                confidence_level=confidence_level
+            )
+            for (rsid, population), frequency, sample_size, confidence_level in zip(
+                freq_df.index,
+                freq_df['frequency'].tolist(),
+                freq_df['sample_size'].tolist(),
+                freq_df['confidence_level'].tolist()
+            )
+        ]
     
     def predict_functional_impact(
         self, 
-        variants: List[Dict]
+        variants: Union[List[Dict], VariantTable]
     ) -> List[FunctionalImpact]:
         """
         Fonksiyonel etki tahmini
         
         Args:
-            variants: Varyant listesi
+            variants: Varyant listesi veya VariantTable
         
         Returns:
             Fonksiyonel etki tahminleri
         """
-        print(f"🔬 {len(variants)} varyant için fonksiyonel etki tahmini...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔬 %d varyant için fonksiyonel etki tahmini...", len(variants))
         
-        impacts = []
+        # Kolon dizileri
+        table = self._as_variant_table(variants)
+        effect_sizes = table.effect_size
+        p_values = table.p_value
         
-        for variant in variants:
-            rsid = variant.get('rsid', '')
-            gene = variant.get('gene', '')
-            position = variant.get('position', 0)
-            
-            # Fonksiyonel etki skoru hesapla
-            impact_score = self._calculate_impact_score(variant)
-            
-            # Etki kategorisi belirle
-            impact_category = self._categorize_impact(impact_score)
-            
-            # Korunma skoru hesapla
-            conservation_score = self._calculate_conservation_score(position, gene)
-            
-            # Patogenisite skoru hesapla
-            pathogenicity_score = self._calculate_pathogenicity_score(variant)
-            
-            impact = FunctionalImpact(
+        # P-value'ya göre ağırlıklı etki (etki ve patogenisite skorları aynı diziyi paylaşır)
+        weighted_effects = np.abs(effect_sizes) * -np.log10(np.maximum(p_values, 1e-10))
+        
+        # Fonksiyonel etki skoru (normalize)
+        impact_scores = np.minimum(weighted_effects / 10, 1.0)
+        
+        # Etki kategorisi belirle
+        impact_categories = self._categorize_impacts(impact_scores)
+        
+        # Korunma skoru (tüm varyantlar için tek çağrı)
+        conservation_scores = self._calculate_conservation_scores(table.position, table.gene)
+        
+        # Patogenisite skoru (normalize)
+        pathogenicity_scores = np.minimum(weighted_effects / 15, 1.0)
+        
+        return [
+            FunctionalImpact(
                 rsid=rsid,
                 gene=gene,
                 impact_score=impact_score,
@@ -213,26 +397,50 @@ class ScientificAlgorithms:
                 conservation_score=conservation_score,
                 pathogenicity_score=pathogenicity_score
             )
-            
-            impacts.append(impact)
-        
-        return impacts
+            for rsid, gene, impact_score, impact_category, conservation_score, pathogenicity_score in zip(
+                table.rsid.tolist(),
+                table.gene.tolist(),
+                impact_scores.tolist(),
+                impact_categories.tolist(),
+                conservation_scores.tolist(),
+                pathogenicity_scores.tolist()
+            )
+        ]
+    
+    def _significant_variant_table(
+        self,
+        variants: Union[List[Dict], VariantTable],
+        max_p_value: float
+    ) -> VariantTable:
+        """p_value <= eşik olan varyantların tablosu (elenen varyantların diğer alanları okunmaz)"""
+        if isinstance(variants, VariantTable):
+            return variants.subset(variants.p_value <= max_p_value)
+        return VariantTable.from_records(
+            [variant for variant in variants if variant.get('p_value', 1.0) <= max_p_value]
+        )
     
-    def calculate_heritability(self, variants: List[Dict], trait: str) -> float:
+    def _calculate_conservation_scores(self, positions: np.ndarray, genes: np.ndarray) -> np.ndarray:
+        """Korunma skorları (toplu)"""
+        # Gerçek implementasyon için PhyloP kullanılacak; şimdilik tek RNG çekimi
+        return self._rng.uniform(0.3, 0.9, size=len(positions))
+    
+    def calculate_heritability(self, variants: Union[List[Dict], VariantTable], trait: str) -> float:
         """
         Kalıtılabilirlik hesapla
         
         Args:
-            variants: Varyant listesi
+            variants: Varyant listesi veya VariantTable
             trait: Özellik
         
         Returns:
             Kalıtılabilirlik (h²)
         """
-        print(f"🧬 {trait} için kalıtılabilirlik hesaplanıyor...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🧬 %s için kalıtılabilirlik hesaplanıyor...", trait)
         
         # Varyant etki büyüklüklerini topla
-        total_variance = sum(variant.get('effect_size', 0) ** 2 for variant in variants)
+        effect_sizes = self._as_variant_table(variants).effect_size
+        total_variance = float(np.dot(effect_sizes, effect_sizes))
         
         # Özellik-specific kalıtılabilirlik
         trait_heritability = {
@@ -254,58 +462,44 @@ class ScientificAlgorithms:
         
         return heritability
     
+    def _as_variant_table(self, variants: Union[List[Dict], VariantTable]) -> VariantTable:
+        """Liste girdisini bir kez SoA tabloya çevir; tablo ise olduğu gibi kullan"""
+        if isinstance(variants, VariantTable):
+            return variants
+        return VariantTable.from_records(variants)
+    
     def _get_trait_weights(self, trait: str) -> Dict[str, float]:
         """Özellik-specific ağırlıklar"""
-        weights = {
-            'cardiovascular_disease': {
-                'rs1801133': 1.5,  # MTHFR
-                'rs429358': 2.0,   # APOE
-                'rs7412': 1.8,     # APOE
-            },
-            'alzheimer_disease': {
-                'rs429358': 3.0,   # APOE
-                'rs7412': 2.5,     # APOE
-            },
-            'diabetes': {
-                'rs1801133': 1.2,  # MTHFR
-            }
-        }
-        return weights.get(trait, {})
+        return TRAIT_WEIGHTS.get(trait, {})
     
     def _get_genotype_weight(self, genotype: str) -> float:
         """Genotip ağırlığı"""
-        weights = {
-            'AA': 0.0,    # Referans
-            'AT': 0.5,    # Heterozigot
-            'TT': 1.0,    # Homozigot
-            'AC': 0.5,
-            'CC': 1.0,
-            'AG': 0.5,
-            'GG': 1.0,
-            'TC': 0.5,
-            'TG': 0.5,
-            'CG': 0.5,
-            '--': 0.0,    # Eksik veri
-        }
-        return weights.get(genotype, 0.0)
+        return GENOTYPE_WEIGHTS.get(genotype, 0.0)
+    
+    def _get_genotype_weights(self, genotypes: List[str]) -> np.ndarray:
+        """Genotip ağırlıkları (tablo araması, tüm varyantlar için tek seferde)"""
+        # Her genotip 3 UCS-4 karaktere sığdırılır; geçerli olanlar tam 2 karakterli, latin-1 aralığında
+        codepoints = np.asarray(genotypes, dtype='<U3').view(np.uint32).reshape(-1, 3).astype(np.int32)
+        valid = (
+            (codepoints[:, 0] > 0) & (codepoints[:, 0] < 256) &
+            (codepoints[:, 1] > 0) & (codepoints[:, 1] < 256) &
+            (codepoints[:, 2] == 0)
+        )
+        index = np.where(valid, codepoints[:, 0] * 256 + codepoints[:, 1], 0)
+        return self._genotype_weight_table[index].astype(np.float64)
     
     def _get_pvalue_weight(self, p_value: float) -> float:
         """P-value ağırlığı"""
-        if p_value < 1e-8:
-            return 1.0
-        elif p_value < 1e-5:
-            return 0.8
-        elif p_value < 0.001:
-            return 0.6
-        elif p_value < 0.01:
-            return 0.4
-        elif p_value < 0.05:
-            return 0.2
-        else:
+        if p_value != p_value:  # NaN: hiçbir eşiğin altında değil
             return 0.0
+        return PVALUE_WEIGHTS[bisect_right(PVALUE_THRESHOLDS, p_value)]
     
-    def _calculate_percentile(self, score: float, trait: str, population: str) -> float:
-        """Percentil hesapla"""
+    def _get_pvalue_weights(self, p_values: np.ndarray) -> np.ndarray:
+        """P-value ağırlıkları (vektörel, dalsız aralık araması)"""
+        return _PVALUE_WEIGHTS_ARRAY[np.searchsorted(_PVALUE_THRESHOLDS_ARRAY, p_values, side='right')]
+    
+    def _get_score_distribution(self, trait: str) -> Tuple[float, float]:
+        """Özellik için örnek skor dağılımı (ortalama, standart sapma)"""
         # Gerçek implementasyon için popülasyon verileri kullanılacak
         # Şimdilik örnek dağılım
         mean_scores = {
@@ -320,31 +514,41 @@ class ScientificAlgorithms:
             'diabetes': 0.04
         }
         
-        mean = mean_scores.get(trait, 0.1)
-        std = std_scores.get(trait, 0.05)
+        return mean_scores.get(trait, 0.1), std_scores.get(trait, 0.05)
+    
+    def _calculate_percentile(self, score: float, trait: str, population: str) -> float:
+        """Percentil hesapla"""
+        mean, std = self._get_score_distribution(trait)
         
         # Z-score hesapla
         z_score = (score - mean) / std
         
-        # Percentil hesapla
-        percentile = stats.norm.cdf(z_score) * 100
+        # Percentil hesapla (standart normal CDF, skaler için doğrudan math.erf)
+        percentile = 0.5 * (1.0 + math.erf(z_score / math.sqrt(2.0))) * 100
         
         return max(0, min(100, percentile))
     
+    def _calculate_percentiles(self, scores: np.ndarray, trait: str, population: str) -> np.ndarray:
+        """Percentil hesapla (toplu)"""
+        mean, std = self._get_score_distribution(trait)
+        
+        z_scores = (np.asarray(scores, dtype=np.float64) - mean) / std
+        
+        return np.clip(special.ndtr(z_scores) * 100, 0, 100)
+    
+    def _categorize_impacts(self, impact_scores: np.ndarray) -> np.ndarray:
+        """Etki kategorileri (toplu, eşik araması)"""
+        return _binned_labels(impact_scores, _IMPACT_THRESHOLDS_ARRAY, _IMPACT_LABELS_ARRAY)
+    
     def _determine_risk_category(self, percentile: float) -> str:
         """Risk kategorisi belirle"""
-        if percentile >= 95:
-            return "Çok Yüksek Risk"
-        elif percentile >= 80:
-            return "Yüksek Risk"
-        elif percentile >= 60:
-            return "Orta-Yüksek Risk"
-        elif percentile >= 40:
-            return "Orta Risk"
-        elif percentile >= 20:
-            return "Orta-Düşük Risk"
-        else:
-            return "Düşük Risk"
+        if percentile != percentile:  # NaN: hiçbir eşiği geçmez
+            return RISK_LABELS[0]
+        return RISK_LABELS[bisect_right(RISK_THRESHOLDS, percentile)]
+    
+    def _determine_risk_categories(self, percentiles: np.ndarray) -> np.ndarray:
+        """Risk kategorileri (toplu, eşik araması)"""
+        return _binned_labels(percentiles, _RISK_THRESHOLDS_ARRAY, _RISK_LABELS_ARRAY)
     
     def _calculate_confidence_interval(
         self, 
@@ -361,73 +565,6 @@ class ScientificAlgorithms:
         upper = min(1, score + ci_95)
         
         return (lower, upper)
-    
-    def _get_sample_frequency(self, rsid: str, population: str) -> Dict:
-        """Örnek popülasyon frekansı"""
-        # Gerçek implementasyon için 1000 Genomes Project API
-        sample_frequencies = {
-            'rs1801133': {
-                'European': {'frequency': 0.32, 'sample_size': 503, 'confidence_level': 0.95},
-                'African': {'frequency': 0.15, 'sample_size': 661, 'confidence_level': 0.95},
-                'Asian': {'frequency': 0.28, 'sample_size': 504, 'confidence_level': 0.95},
-                'American': {'frequency': 0.25, 'sample_size': 347, 'confidence_level': 0.95}
-            },
-            'rs429358': {
-                'European': {'frequency': 0.14, 'sample_size': 503, 'confidence_level': 0.95},
-                'African': {'frequency': 0.08, 'sample_size': 661, 'confidence_level': 0.95},
-                'Asian': {'frequency': 0.06, 'sample_size': 504, 'confidence_level': 0.95},
-                'American': {'frequency': 0.12, 'sample_size': 347, 'confidence_level': 0.95}
-            }
-        }
-        
-        return sample_frequencies.get(rsid, {}).get(population, {
-            'frequency': 0.1,
-            'sample_size': 100,
-            'confidence_level': 0.95
-        })
-    
-    def _calculate_impact_score(self, variant: Dict) -> float:
-        """Fonksiyonel etki skoru hesapla"""
-        # Basit etki skoru hesaplama
-        effect_size = abs(variant.get('effect_size', 0))
-        p_value = variant.get('p_value', 1)
-        
-        # P-value'ya göre ağırlıklandır
-        p_weight = -math.log10(max(p_value, 1e-10))
-        
-        # Etki skoru
-        impact_score = effect_size * p_weight / 10  # Normalize et
-        
-        return min(impact_score, 1.0)
-    
-    def _categorize_impact(self, impact_score: float) -> str:
-        """Etki kategorisi belirle"""
-        if impact_score >= 0.8:
-            return "Yüksek Etki"
-        elif impact_score >= 0.5:
-            return "Orta Etki"
-        elif impact_score >= 0.2:
-            return "Düşük Etki"
-        else:
-            return "Minimal Etki"
-    
-    def _calculate_conservation_score(self, position: int, gene: str) -> float:
-        """Korunma skoru hesapla"""
-        # Basit korunma skoru (gerçek implementasyon için PhyloP kullanılacak)
-        return np.random.uniform(0.3, 0.9)
-    
-    def _calculate_pathogenicity_score(self, variant: Dict) -> float:
-        """Patogenisite skoru hesapla"""
-        # Basit patogenisite skoru
-        effect_size = abs(variant.get('effect_size', 0))
-        p_value = variant.get('p_value', 1)
-        
-        # P-value'ya göre ağırlıklandır
-        p_weight = -math.log10(max(p_value, 1e-10))
-        
-        pathogenicity = effect_size * p_weight / 15  # Normalize et
-        
-        return min(pathogenicity, 1.0)
 
 def main():
     """Test fonksiyonu"""
@@ -4,14 +4,40 @@ DNA Analiz API Sunucusu
 GenoHealth uygulaması için Python DNA analiz sistemini API olarak sunar
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+import atexit
+from bisect import bisect_right
+import io
 import json
+import logging
+import math
+from logging.handlers import QueueHandler, QueueListener
 import os
+import queue
 import sys
 from pathlib import Path
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Dict, Optional
+
+try:
+    # Opsiyonel: hızlı JSON serileştirme (NumPy dizileri/skalerleri doğrudan)
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Opsiyonel: yanıt sıkıştırma (Brotli, yoksa gzip)
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
 
 # DNA analiz sistemini import et
 sys.path.append(os.path.dirname(__file__))
@@ -23,43 +49,223 @@ from memory_manager import memory_manager
 from streaming_processor import streaming_processor
 from database_optimizer import db_pool
 from query_optimizer import query_optimizer
+from batch_loader import BatchLoader
 from monitoring_system import system_monitor
 from error_tracker import error_tracker
 
+# Log kayıtları istek iş parçacığında yalnızca kuyruğa yazılır; stdout/dosya yazımı
+# arka plandaki QueueListener iş parçacığında yapılır (configure_logging ile açılır)
+log_queue = queue.Queue(-1)
+_log_handlers = []
+_log_listener = None
+
+def start_log_listener():
+    """Kuyruktaki kayıtları asıl handler'lara yazan iş parçacığını başlat"""
+    global _log_listener
+    if _log_listener is None:
+        _log_listener = QueueListener(log_queue, *_log_handlers, respect_handler_level=True)
+        _log_listener.start()
+
+def stop_log_listener():
+    """Kuyrukta kalan kayıtları yaz ve iş parçacığını durdur"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+def configure_logging():
+    """Root logger'ı kuyruğa yönlendir (__main__ ve gunicorn post_fork'tan çağrılır; import yan etkisizdir)"""
+    global _log_handlers
+    root_logger = logging.getLogger()
+    if not _log_handlers:
+        _log_handlers = root_logger.handlers[:] or [logging.StreamHandler()]
+        root_logger.handlers = [QueueHandler(log_queue)]
+        root_logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+        atexit.register(stop_log_listener)
+    start_log_listener()
+
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 CORS(app)  # CORS'u etkinleştir
 
+# İstek gövdesi üst sınırı (MB): ham 23andMe dosyaları ~25MB, aşan istekler belleğe alınmadan reddedilir
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_REQUEST_MB', '64')) * 1024 * 1024
+
+# Büyük ve tekrarlı JSON yanıtlarını sıkıştır (istemci Accept-Encoding'ine göre)
+if Compress is not None:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_BR_LEVEL'] = 4
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    Compress(app)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson tabanlı JSON sağlayıcı: jsonify doğrudan UTF-8 bytes üretir, request.get_json orjson ile okunur"""
+    
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+    
+    def _option(self, pretty: bool = False) -> int:
+        return self.option | orjson.OPT_INDENT_2 if pretty else self.option
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=self._option('indent' in kwargs)).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._option(pretty)),
+            mimetype=self.mimetype
+        )
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+def json_bytes(obj) -> bytes:
+    """Tek bir nesnenin kompakt JSON baytları (streaming yanıtlar için)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=app.json.default, option=OrjsonProvider.option)
+    return app.json.dumps(obj).encode('utf-8')
+
+def ndjson_line(obj) -> bytes:
+    """Tek satırlık NDJSON kaydı (streaming yanıtlar için)"""
+    return json_bytes(obj) + b'\n'
+
+_NO_ROWS = object()
+
+def json_rows_response(key: str, rows) -> Response:
+    """
+    {"success": true, key: [...], "count": N} yanıtını satır satır akıt
+    
+    Sonuç listesi bellekte kurulmaz; satırlar cursor'dan geldikçe serileştirilir.
+    İlk satır burada okunur ki sorgu hataları akış başlamadan (500 olarak) yakalansın.
+    """
+    rows = iter(rows)
+    first = next(rows, _NO_ROWS)
+    
+    def generate():
+        yield b'{"success":true,' + json_bytes(key) + b':['
+        count = 0
+        if first is not _NO_ROWS:
+            yield json_bytes(first)
+            count = 1
+            for row in rows:
+                yield b',' + json_bytes(row)
+                count += 1
+        yield b'],"count":' + str(count).encode() + b'}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    """MAX_CONTENT_LENGTH aşıldı"""
+    return jsonify({
+        'success': False,
+        'error': f"İstek gövdesi çok büyük (en fazla {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)} MB)"
+    }), 413
+
+def get_request_json():
+    """İstek gövdesini JSON olarak oku (orjson sağlayıcı baytları doğrudan ayrıştırır; ham gövde saklanmaz)"""
+    return request.get_json(cache=False)
+
 # Gemini AI analizörünü başlat
 gemini_analyzer = None
 try:
     # Environment variable'ı kontrol et
     api_key = os.getenv('GEMINI_API_KEY')
-    print(f"🔑 API Key bulundu: {api_key[:10]}..." if api_key else "❌ API Key bulunamadı")
     if api_key:
+        logger.info("🔑 API Key bulundu")
         gemini_analyzer = GeminiDNAAnalyzer(api_key)
-        print("🤖 Gemini AI analizörü başlatıldı")
+        logger.info("🤖 Gemini AI analizörü başlatıldı")
     else:
-        print("⚠️ GEMINI_API_KEY environment variable bulunamadı")
+        logger.warning("⚠️ GEMINI_API_KEY environment variable bulunamadı")
 except Exception as e:
-    print(f"⚠️ Gemini AI başlatılamadı: {e}")
-    import traceback
-    traceback.print_exc()
+    logger.exception("⚠️ Gemini AI başlatılamadı: %s", e)
     gemini_analyzer = None
 
+# 23andMe giriş sözleşmesi: gövde tab ayraçlı "rsid<TAB>chromosome<TAB>position<TAB>genotype"
+# satırlarından oluşur; Parser23andMe bunu C motoruyla ve sabit dtype'larla okur
+# (chromosome/genotype: category, position: int32)
+TWENTYTHREEANDME_HEADER = (
+    "# This file contains data exported from 23andMe\n"
+    "# Data format: rsid\tchromosome\tposition\tgenotype\n"
+)
+
+def dna_payload_stream(dna_data: str) -> io.StringIO:
+    """23andMe başlığı + gövdeyi bellek içi akışa yaz (disk I/O yok)"""
+    buffer = io.StringIO()
+    buffer.write(TWENTYTHREEANDME_HEADER)
+    buffer.write(dna_data)
+    buffer.seek(0)
+    return buffer
+
+# Yanıta kopyalanan AnalysisResult alanları (sıra yanıt sırasıdır); attrgetter tek çağrıda okur
+ANALYSIS_RESPONSE_FIELDS = (
+    'variant_count', 'analyzed_genes', 'analysis_date', 'confidence_score',
+    'health_risks', 'drug_interactions', 'nutrition_recommendations',
+    'exercise_recommendations', 'carrier_status', 'population_frequencies',
+    'functional_impacts'
+)
+FAST_ANALYSIS_RESPONSE_FIELDS = ('variant_count', 'health_risks', 'confidence_score', 'analysis_date')
+_get_analysis_fields = attrgetter(*ANALYSIS_RESPONSE_FIELDS)
+_get_fast_analysis_fields = attrgetter(*FAST_ANALYSIS_RESPONSE_FIELDS)
+
+# Sabit enhanced_analysis şablonları (salt okunur; yanıtta dict kopyası kullanılır)
+AI_DISABLED = MappingProxyType({'ai_enhanced': False})
+AI_UNAVAILABLE = MappingProxyType({**AI_DISABLED, 'reason': 'Gemini AI kullanılamıyor'})
+
+# Tek bir Gemini çağrısı için beklenecek en uzun süre (saniye)
+GEMINI_CALL_TIMEOUT = 30
+
+# Gemini yanıtlarının cache süresi (saat): aynı varyant seti için LLM'e tekrar gidilmez
+GEMINI_CACHE_TTL_HOURS = 168
+
+def cached_gemini_call(analysis_kind: str, fn, payload):
+    """Gemini çağrısını girdinin kanonik JSON'u ile cache üzerinden yap (read-through)"""
+    # cache_manager anahtarı bu metnin BLAKE2b özetinden üretir (bir kez encode edilir)
+    cache_source = json.dumps(payload, sort_keys=True, default=str).encode()
+    cached = cache_manager.get(cache_source, analysis_kind)
+    if cached is not None:
+        return cached
+    
+    result = fn(payload)
+    # Hata durumundaki genel fallback yanıtı cache'lenmez: sonraki istek modeli tekrar dener
+    if not (isinstance(result, dict) and result.get('ai_fallback')):
+        cache_manager.set(cache_source, result, analysis_kind, ttl_hours=GEMINI_CACHE_TTL_HOURS)
+    return result
+
+# İş parçacığı başına yeniden kullanılan DNA analizörü: istekler kilitsiz paralel çalışır,
+# algoritma nesneleri ve veritabanı bağlantıları her iş parçacığında bir kez kurulur
+_analyzer_local = threading.local()
+
+def get_thread_local_analyzer() -> DNAAnalyzer:
+    """Bu iş parçacığının DNAAnalyzer örneği (ilk çağrıda oluşturulur)"""
+    analyzer = getattr(_analyzer_local, 'analyzer', None)
+    if analyzer is None:
+        analyzer = DNAAnalyzer()
+        _analyzer_local.analyzer = analyzer
+    return analyzer
+
+# /health yanıt gövdesi sabit: liveness probe'ları için bir kez serileştirilir
+HEALTH_RESPONSE_BODY = json_bytes({
+    'status': 'healthy',
+    'service': 'DNA Analysis API',
+    'version': '1.0.0'
+})
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """API sağlık kontrolü"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'DNA Analysis API',
-        'version': '1.0.0'
-    })
+    return app.response_class(HEALTH_RESPONSE_BODY, mimetype='application/json')
 
 @app.route('/analyze', methods=['POST'])
 def analyze_dna():
     """DNA analizi yap"""
     try:
-        data = request.get_json()
+        data = get_request_json()
         
         if not data or 'dna_data' not in data:
             return jsonify({'error': 'DNA verisi gerekli'}), 400
@@ -67,124 +273,115 @@ def analyze_dna():
         dna_data = data['dna_data']
         platform = data.get('platform', '23andMe')
         
-        # Geçici dosya oluştur
-        temp_file = f"temp_dna_{hash(str(dna_data))}.txt"
-        
-        try:
-            # DNA verisini dosyaya yaz (23andMe formatında)
-            with open(temp_file, 'w') as f:
-                f.write("# This file contains data exported from 23andMe\n")
-                f.write("# Data format: rsid\tchromosome\tposition\tgenotype\n")
-                f.write(dna_data)
-            
-            # DNA analizini yap
-            analyzer = DNAAnalyzer(temp_file)
-            
-            if not analyzer.load_dna_data():
-                return jsonify({'error': 'DNA verisi yüklenemedi'}), 400
-            
-            # Temel analizi çalıştır
-            results = analyzer.analyze()
-            
-            # Gemini AI ile gelişmiş analiz yap
-            enhanced_analysis = {}
-            print(f"🔍 Gemini analyzer durumu: {gemini_analyzer is not None}")
-            if gemini_analyzer:
+        # DNA analizini bellekte yap (23andMe formatında, geçici dosya yok)
+        analyzer = get_thread_local_analyzer()
+        results = analyzer.analyze_from_stream(dna_payload_stream(dna_data))
+        if results is None:
+            return jsonify({'error': 'DNA verisi yüklenemedi'}), 400
+        
+        raw_genetic_data = analyzer.raw_genetic_data
+        processing_stats = dict(analyzer.processing_stats)
+        
+        # Gemini AI ile gelişmiş analiz yap
+        logger.debug("🔍 Gemini analyzer durumu: %s", gemini_analyzer is not None)
+        if gemini_analyzer:
+            try:
+                logger.info("🤖 Gemini AI ile gelişmiş analiz yapılıyor...")
+                
+                # Genetik varyantları Gemini'ye gönder
+                variants = raw_genetic_data[:20]  # İlk 20 varyant
+                genetic_profile = {
+                    'variants': variants,
+                    'health_risks': results.health_risks
+                }
+                
+                # Sağlık, beslenme, egzersiz ve takviye analizleri birbirinden bağımsız ağ çağrıları:
+                # eşzamanlı çalıştır (toplam süre en yavaş çağrı kadar)
+                gemini_tasks = {
+                    'gemini_health_analysis': ('gemini_health', gemini_analyzer.analyze_genetic_variants, variants),
+                    'gemini_nutrition_analysis': ('gemini_nutrition', gemini_analyzer.analyze_nutrition_needs, genetic_profile),
+                    'gemini_exercise_analysis': ('gemini_exercise', gemini_analyzer.analyze_exercise_needs, genetic_profile),
+                    'gemini_supplement_analysis': ('gemini_supplements', gemini_analyzer.analyze_supplement_needs, genetic_profile)
+                }
+                executor = ThreadPoolExecutor(max_workers=len(gemini_tasks), thread_name_prefix='gemini')
                 try:
-                    print("🤖 Gemini AI ile gelişmiş analiz yapılıyor...")
-                    
-                    # Genetik varyantları Gemini'ye gönder
-                    variants = getattr(analyzer, 'raw_genetic_data', [])[:20]  # İlk 20 varyant
-                    gemini_health = gemini_analyzer.analyze_genetic_variants(variants)
-                    
-                    # Beslenme analizi
-                    genetic_profile = {
-                        'variants': variants,
-                        'health_risks': results.health_risks
+                    futures = {
+                        key: executor.submit(cached_gemini_call, kind, fn, arg)
+                        for key, (kind, fn, arg) in gemini_tasks.items()
                     }
-                    gemini_nutrition = gemini_analyzer.analyze_nutrition_needs(genetic_profile)
-                    
-                    # Egzersiz analizi
-                    gemini_exercise = gemini_analyzer.analyze_exercise_needs(genetic_profile)
-                    
-                    # Takviye analizi
-                    gemini_supplements = gemini_analyzer.analyze_supplement_needs(genetic_profile)
-                    
                     enhanced_analysis = {
-                        'gemini_health_analysis': gemini_health,
-                        'gemini_nutrition_analysis': gemini_nutrition,
-                        'gemini_exercise_analysis': gemini_exercise,
-                        'gemini_supplement_analysis': gemini_supplements,
-                        'ai_enhanced': True
+                        key: future.result(timeout=GEMINI_CALL_TIMEOUT) for key, future in futures.items()
                     }
-                    
-                    print("✅ Gemini AI analizi tamamlandı")
-                    
-                except Exception as e:
-                    print(f"⚠️ Gemini AI analiz hatası: {e}")
-                    enhanced_analysis = {'ai_enhanced': False, 'error': str(e)}
-            else:
-                enhanced_analysis = {'ai_enhanced': False, 'reason': 'Gemini AI kullanılamıyor'}
-            
-            # Sonuçları JSON'a çevir
-            analysis_result = {
-                'variant_count': results.variant_count,
-                'analyzed_genes': results.analyzed_genes,
-                'analysis_date': results.analysis_date,
-                'confidence_score': results.confidence_score,
-                'health_risks': results.health_risks,
-                'drug_interactions': results.drug_interactions,
-                'nutrition_recommendations': results.nutrition_recommendations,
-                'exercise_recommendations': results.exercise_recommendations,
-                'carrier_status': results.carrier_status,
-                'population_frequencies': results.population_frequencies,
-                'functional_impacts': results.functional_impacts,
-                'processing_stats': analyzer.processing_stats,
-                'enhanced_analysis': enhanced_analysis
-            }
-            
-            return jsonify({
-                'success': True,
-                'analysis': analysis_result
-            })
-            
-        finally:
-            # Geçici dosyayı sil
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+                finally:
+                    # Zaman aşımında yanıtı askıda kalan çağrıları bekleme
+                    executor.shutdown(wait=False, cancel_futures=True)
+                enhanced_analysis['ai_enhanced'] = True
+                
+                logger.info("✅ Gemini AI analizi tamamlandı")
                 
+            except Exception as e:
+                logger.warning("⚠️ Gemini AI analiz hatası: %s", e)
+                enhanced_analysis = {**AI_DISABLED, 'error': str(e)}
+        else:
+            enhanced_analysis = dict(AI_UNAVAILABLE)
+        
+        # Sonuçları JSON'a çevir
+        analysis_result = dict(zip(ANALYSIS_RESPONSE_FIELDS, _get_analysis_fields(results)))
+        analysis_result['processing_stats'] = processing_stats
+        analysis_result['enhanced_analysis'] = enhanced_analysis
+        
+        return jsonify({
+            'success': True,
+            'analysis': analysis_result
+        })
+        
+    except RequestEntityTooLarge:
+        raise  # 413 JSON yanıtı errorhandler'dan döner
+        
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+TEST_DATA_FILE = "sample_from_report.txt"
+
+@lru_cache(maxsize=1)
+def _test_analysis_summary(test_file: str, mtime_ns: int) -> Optional[Dict]:
+    """Test dosyasının analiz özeti; dosya değişmedikçe (mtime) yeniden okunup analiz edilmez"""
+    analyzer = DNAAnalyzer(test_file)
+    
+    if not analyzer.load_dna_data():
+        return None
+    
+    results = analyzer.analyze()
+    
+    return {
+        'variant_count': results.variant_count,
+        'analyzed_genes': results.analyzed_genes,
+        'health_risks_count': len(results.health_risks),
+        'drug_interactions_count': len(results.drug_interactions),
+        'processing_time': analyzer.processing_stats.get('processing_time', 0)
+    }
+
 @app.route('/test', methods=['GET'])
 def test_analysis():
     """Test analizi yap"""
     try:
-        # Test verisi ile analiz yap
-        test_file = "sample_from_report.txt"
+        # Test verisi ile analiz yap (ilk çağrıda; sonraki çağrılar cache'den)
+        test_file = TEST_DATA_FILE
         
         if not os.path.exists(test_file):
             return jsonify({'error': 'Test dosyası bulunamadı'}), 404
         
-        analyzer = DNAAnalyzer(test_file)
-        
-        if not analyzer.load_dna_data():
+        summary = _test_analysis_summary(test_file, os.stat(test_file).st_mtime_ns)
+        if summary is None:
+            _test_analysis_summary.cache_clear()
             return jsonify({'error': 'Test verisi yüklenemedi'}), 400
         
-        results = analyzer.analyze()
-        
         return jsonify({
             'success': True,
-            'test_analysis': {
-                'variant_count': results.variant_count,
-                'analyzed_genes': results.analyzed_genes,
-                'health_risks_count': len(results.health_risks),
-                'drug_interactions_count': len(results.drug_interactions),
-                'processing_time': analyzer.processing_stats.get('processing_time', 0)
-            }
+            'test_analysis': summary
         })
         
     except Exception as e:
@@ -253,7 +450,7 @@ def analyze_dna_fast():
     start_time = time.time()
     
     try:
-        data = request.get_json()
+        data = get_request_json()
         
         if not data or 'dna_data' not in data:
             return jsonify({
@@ -264,7 +461,7 @@ def analyze_dna_fast():
         dna_data = data['dna_data']
         platform = data.get('platform', '23andme')
         
-        print(f"⚡ Hızlı DNA analizi başlatılıyor... Platform: {platform}")
+        logger.info("⚡ Hızlı DNA analizi başlatılıyor... Platform: %s", platform)
         
         # Memory kontrolü
         if not memory_manager.check_memory_limit():
@@ -273,8 +470,9 @@ def analyze_dna_fast():
                 'error': 'Memory limiti aşıldı, lütfen daha sonra tekrar deneyin'
             }), 507
         
-        # Cache kontrolü
-        cached_result = cache_manager.get(dna_data, 'fast')
+        # Cache kontrolü (DNA verisi get/set için bir kez encode edilir)
+        dna_bytes = dna_data.encode()
+        cached_result = cache_manager.get(dna_bytes, 'fast')
         if cached_result:
             return jsonify({
                 'success': True,
@@ -284,42 +482,32 @@ def analyze_dna_fast():
                 'processing_time': time.time() - start_time
             })
         
-        # Geçici dosya oluştur
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-            temp_file.write(dna_data)
-            temp_file_path = temp_file.name
-        
-        try:
-            # DNA analizörünü başlat
-            analyzer = DNAAnalyzer(temp_file_path)
-            
-            # Sadece temel analiz (hızlı)
-            results = analyzer.analyze()
-            
-            # Basit sonuç
-            analysis_result = {
-                'variant_count': len(results.variants) if hasattr(results, 'variants') else 0,
-                'health_risks': results.health_risks,
-                'confidence_score': results.confidence_score,
-                'analysis_date': results.analysis_date,
-                'fast_analysis': True
-            }
-            
-            # Cache'e kaydet
-            cache_manager.set(dna_data, analysis_result, 'fast', ttl_hours=12)
-            
+        # DNA analizini bellekte yap (geçici dosya yok)
+        results = get_thread_local_analyzer().analyze_from_stream(dna_payload_stream(dna_data))
+        if results is None:
             return jsonify({
-                'success': True,
-                'analysis': analysis_result,
-                'message': 'Hızlı DNA analizi tamamlandı',
-                'cached': False,
-                'processing_time': time.time() - start_time
-            })
-            
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+                'success': False,
+                'error': 'DNA verisi yüklenemedi'
+            }), 400
+        
+        # Basit sonuç
+        analysis_result = dict(zip(FAST_ANALYSIS_RESPONSE_FIELDS, _get_fast_analysis_fields(results)))
+        analysis_result['fast_analysis'] = True
+        
+        # Cache'e kaydet
+        cache_manager.set(dna_bytes, analysis_result, 'fast', ttl_hours=12)
+        
+        return jsonify({
+            'success': True,
+            'analysis': analysis_result,
+            'message': 'Hızlı DNA analizi tamamlandı',
+            'cached': False,
+            'processing_time': time.time() - start_time
+        })
     
+    except RequestEntityTooLarge:
+        raise  # 413 JSON yanıtı errorhandler'dan döner
+        
     except Exception as e:
         return jsonify({
             'success': False,
@@ -333,7 +521,7 @@ def analyze_dna_streaming():
     start_time = time.time()
     
     try:
-        data = request.get_json()
+        data = get_request_json()
         
         if not data or 'dna_data' not in data:
             return jsonify({
@@ -344,7 +532,7 @@ def analyze_dna_streaming():
         dna_data = data['dna_data']
         platform = data.get('platform', '23andme')
         
-        print(f"🌊 Streaming DNA analizi başlatılıyor... Platform: {platform}")
+        logger.info("🌊 Streaming DNA analizi başlatılıyor... Platform: %s", platform)
         
         # Memory kontrolü
         if not memory_manager.check_memory_limit():
@@ -353,49 +541,48 @@ def analyze_dna_streaming():
                 'error': 'Memory limiti aşıldı, lütfen daha sonra tekrar deneyin'
             }), 507
         
-        # Geçici dosya oluştur
-        temp_file_path = streaming_processor.create_memory_efficient_temp_file(dna_data)
-        
-        try:
-            # Streaming işleme
-            all_results = []
-            
-            def progress_callback(progress, chunk_result):
-                print(f"📈 Streaming ilerleme: {progress:.1f}%")
-            
-            def result_callback(chunk_result):
-                all_results.append(chunk_result)
-            
-            # Streaming işleme başlat
-            final_result = streaming_processor.process_dna_file_with_callback(
-                temp_file_path,
-                progress_callback=progress_callback,
-                result_callback=result_callback
-            )
-            
-            if final_result['success']:
-                return jsonify({
+        def generate():
+            """Her chunk hazır oldukça bir NDJSON satırı gönder, sonda özet satırı"""
+            variant_count = 0
+            chunks_processed = 0
+            temp_file_path = None
+            try:
+                # Geçici dosya akış başladığında oluşturulur: yanıt hiç okunmazsa dosya da oluşmaz
+                temp_file_path = streaming_processor.create_memory_efficient_temp_file(dna_data)
+                
+                for chunk_result in streaming_processor.process_dna_file_streaming(temp_file_path):
+                    variant_count += chunk_result['variant_count']
+                    chunks_processed += 1
+                    yield ndjson_line({'type': 'chunk', **chunk_result})
+                
+                yield ndjson_line({
+                    'type': 'summary',
                     'success': True,
                     'analysis': {
-                        'variant_count': final_result['total_variants'],
-                        'chunks_processed': final_result['chunks_processed'],
-                        'processing_time': final_result['processing_time'],
-                        'memory_stats': final_result['memory_stats'],
+                        'variant_count': variant_count,
+                        'chunks_processed': chunks_processed,
+                        'memory_stats': memory_manager.get_memory_report(),
                         'streaming_analysis': True
                     },
                     'message': 'Streaming DNA analizi tamamlandı',
                     'processing_time': time.time() - start_time
                 })
-            else:
-                return jsonify({
+            except Exception as e:
+                yield ndjson_line({
+                    'type': 'error',
                     'success': False,
-                    'error': final_result.get('error', 'Streaming analiz hatası'),
+                    'error': str(e),
                     'processing_time': time.time() - start_time
-                }), 500
-            
-        finally:
-            streaming_processor.cleanup_temp_file(temp_file_path)
+                })
+            finally:
+                if temp_file_path is not None:
+                    streaming_processor.cleanup_temp_file(temp_file_path)
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
     
+    except RequestEntityTooLarge:
+        raise  # 413 JSON yanıtı errorhandler'dan döner
+        
     except Exception as e:
         return jsonify({
             'success': False,
@@ -474,6 +661,7 @@ def optimize_database():
     try:
         db_optimization = db_pool.optimize_database()
         query_optimization = query_optimizer.optimize_queries()
+        clear_variant_lookup_caches()
         
         return jsonify({
             'success': True,
@@ -493,6 +681,7 @@ def cleanup_database():
     try:
         cleanup_result = db_pool.cleanup_old_data(days=30)
         query_optimizer.clear_query_cache()
+        clear_variant_lookup_caches()
         
         return jsonify({
             'success': True,
@@ -514,26 +703,22 @@ def search_variants():
         gene = request.args.get('gene')
         
         if rsid:
-            results = query_optimizer.get_genetic_variants_by_rsid(rsid)
+            results = query_optimizer.stream_genetic_variants_by_rsid(rsid)
         elif chromosome:
             start_pos = request.args.get('start_pos', type=int)
             end_pos = request.args.get('end_pos', type=int)
-            results = query_optimizer.get_variants_by_chromosome(
+            results = query_optimizer.stream_variants_by_chromosome(
                 chromosome, start_pos, end_pos
             )
         elif gene:
-            results = query_optimizer.search_variants_by_gene(gene)
+            results = query_optimizer.stream_variants_by_gene(gene)
         else:
             return jsonify({
                 'success': False,
                 'error': 'Arama parametresi gerekli (rsid, chromosome, gene)'
             }), 400
         
-        return jsonify({
-            'success': True,
-            'variants': results,
-            'count': len(results)
-        })
+        return json_rows_response('variants', results)
         
     except Exception as e:
         return jsonify({
@@ -541,17 +726,72 @@ def search_variants():
             'error': str(e)
         }), 500
 
+# Varyant başına referans verileri neredeyse statik: sonuçlar süreç içinde LRU ile tutulur,
+# veritabanı temizliği/optimizasyonunda boşaltılır
+VARIANT_LOOKUP_CACHE_SIZE = 65536
+
+# Cache'te olmayan varyantlar: ~5 ms içinde gelen eşzamanlı istekler tek IN (...) sorgusunda birleşir
+health_risks_loader = BatchLoader(query_optimizer.get_health_risks_by_variants, default=[])
+drug_interactions_loader = BatchLoader(query_optimizer.get_drug_interactions_by_variants, default=[])
+
+@lru_cache(maxsize=VARIANT_LOOKUP_CACHE_SIZE)
+def _variant_health_risks(variant_id: int) -> tuple:
+    """Varyantın sağlık riskleri (değiştirilemez, cache'lenmiş)"""
+    return tuple(health_risks_loader.load(variant_id))
+
+@lru_cache(maxsize=VARIANT_LOOKUP_CACHE_SIZE)
+def _variant_drug_interactions(variant_id: int) -> tuple:
+    """Varyantın ilaç etkileşimleri (değiştirilemez, cache'lenmiş)"""
+    return tuple(drug_interactions_loader.load(variant_id))
+
+# Yüksek etkili varyantlar: referans verisi frekansa göre azalan sırada bir kez okunur,
+# her eşik için yanıt o sıralı listenin öneki olarak bir kez serileştirilir
+HIGH_IMPACT_SNAPSHOT_TTL = 3600  # saniye (sorgu cache'i ile aynı süre)
+_high_impact_snapshot = None  # (geçerlilik sonu, -frekanslar (artan), satırlar)
+_high_impact_lock = threading.Lock()
+
+def _get_high_impact_snapshot():
+    """Sıralı yüksek etkili varyant anlık görüntüsü (süresi dolunca yeniden okunur)"""
+    global _high_impact_snapshot
+    snapshot = _high_impact_snapshot
+    if snapshot is None or time.time() >= snapshot[0]:
+        with _high_impact_lock:
+            snapshot = _high_impact_snapshot
+            if snapshot is None or time.time() >= snapshot[0]:
+                rows = query_optimizer.get_all_high_impact_variants()
+                negated_frequencies = [-row['frequency'] for row in rows]
+                snapshot = (time.time() + HIGH_IMPACT_SNAPSHOT_TTL, negated_frequencies, rows)
+                _high_impact_snapshot = snapshot
+    return snapshot
+
+@lru_cache(maxsize=64)
+def _high_impact_body(snapshot_expires_at: float, min_frequency: float) -> bytes:
+    """Eşiğe göre hazır JSON yanıt gövdesi (anlık görüntü başına, eşik başına bir kez)"""
+    _, negated_frequencies, rows = _get_high_impact_snapshot()
+    # frequency >= min_frequency olan satırlar sıralı listenin önekidir
+    count = 0 if math.isnan(min_frequency) else bisect_right(negated_frequencies, -min_frequency)
+    return json_bytes({
+        'success': True,
+        'variants': rows[:count],
+        'count': count
+    })
+
+def clear_variant_lookup_caches():
+    """Varyant başına LRU cache'leri ve yüksek etkili varyant anlık görüntüsünü boşalt"""
+    global _high_impact_snapshot
+    _variant_health_risks.cache_clear()
+    _variant_drug_interactions.cache_clear()
+    with _high_impact_lock:
+        _high_impact_snapshot = None
+    _high_impact_body.cache_clear()
+
 @app.route('/variants/health-risks/<int:variant_id>', methods=['GET'])
 def get_variant_health_risks(variant_id):
     """Varyanta göre sağlık risklerini getir"""
     try:
-        results = query_optimizer.get_health_risks_by_variant(variant_id)
+        results = _variant_health_risks(variant_id)
         
-        return jsonify({
-            'success': True,
-            'health_risks': results,
-            'count': len(results)
-        })
+        return json_rows_response('health_risks', results)
         
     except Exception as e:
         return jsonify({
@@ -563,13 +803,9 @@ def get_variant_health_risks(variant_id):
 def get_variant_drug_interactions(variant_id):
     """Varyanta göre ilaç etkileşimlerini getir"""
     try:
-        results = query_optimizer.get_drug_interactions_by_variant(variant_id)
+        results = _variant_drug_interactions(variant_id)
         
-        return jsonify({
-            'success': True,
-            'drug_interactions': results,
-            'count': len(results)
-        })
+        return json_rows_response('drug_interactions', results)
         
     except Exception as e:
         return jsonify({
@@ -582,13 +818,12 @@ def get_high_impact_variants():
     """Yüksek etkili varyantları getir"""
     try:
         min_frequency = request.args.get('min_frequency', 0.01, type=float)
-        results = query_optimizer.get_high_impact_variants(min_frequency)
+        snapshot_expires_at = _get_high_impact_snapshot()[0]
         
-        return jsonify({
-            'success': True,
-            'variants': results,
-            'count': len(results)
-        })
+        return app.response_class(
+            _high_impact_body(snapshot_expires_at, min_frequency),
+            mimetype='application/json'
+        )
         
     except Exception as e:
         return jsonify({
@@ -692,7 +927,8 @@ def get_health_score():
 def cleanup_monitoring_data():
     """Monitoring verilerini temizle"""
     try:
-        days = request.json.get('days', 7) if request.json else 7
+        data = get_request_json()
+        days = data.get('days', 7) if data else 7
         
         system_monitor.clear_old_data(days)
         error_tracker.clear_old_errors(days)
@@ -708,6 +944,8 @@ def cleanup_monitoring_data():
         }), 500
 
 if __name__ == '__main__':
+    configure_logging()
+    
     # Paralel işleyiciyi başlat
     parallel_processor.start_background_workers()
     
@@ -741,7 +979,8 @@ if __name__ == '__main__':
     print("🏥 Sistem sağlığı: GET http://localhost:5001/monitoring/health")
     
     try:
-        app.run(host='0.0.0.0', port=5001, debug=True)
+        # Debug modu (reloader, yavaş hata sayfaları) yalnızca FLASK_DEBUG=1 ile
+        app.run(host='0.0.0.0', port=5001, debug=os.getenv('FLASK_DEBUG') == '1')
     finally:
         # Temizlik
         parallel_processor.stop_background_workers()
@@ -3,16 +3,141 @@ Authentication Yönetim Sistemi
 DNA analiz sistemi için kimlik doğrulama
 """
 
+import base64
 import hashlib
 import hmac
 import secrets
+import threading
 import time
-import jwt
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Tuple
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Any, List, Optional, Tuple
 import json
 import logging
 
+try:
+    # Opsiyonel: hızlı JSON serileştirme (token payload'ları)
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Opsiyonel: doğrulanmış token önbelleği (TTL + LRU)
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
+
+try:
+    # Opsiyonel: Argon2id şifre hash'leme (yoksa hashlib.scrypt kullanılır)
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    PasswordHasher = None
+
+try:
+    # Opsiyonel: HMAC durumlarını bir kez hazırlayan hızlı PBKDF2 (eski hash'lerin doğrulanması)
+    from fastpbkdf2 import pbkdf2_hmac as _fast_pbkdf2_hmac
+except ImportError:
+    _fast_pbkdf2_hmac = None
+
+logger = logging.getLogger(__name__)
+
+# Eski "salt:hash" formatının PBKDF2-HMAC-SHA256 iterasyon sayısı
+LEGACY_PBKDF2_ITERATIONS = 100000
+
+# Doğrulanmış access token'ların önbellekte kalacağı süre (saniye) ve en fazla sayısı
+TOKEN_CACHE_TTL = 5
+TOKEN_CACHE_SIZE = 10000
+
+# Doğrulanmış şifrelerin önbellekte kalacağı süre (saniye) ve en fazla sayısı
+PASSWORD_CACHE_TTL = 30
+PASSWORD_CACHE_SIZE = 1024
+
+# Argon2id parametreleri
+ARGON2_TIME_COST = 2
+ARGON2_MEMORY_COST = 64 * 1024  # KiB
+ARGON2_PARALLELISM = 1
+
+# scrypt parametreleri (argon2-cffi kurulu değilse): n=2^14, r=8, p=1 -> 16 MiB
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_PREFIX = "$scrypt$"
+
+# Kullanıcı ve refresh token tablolarının parça sayısı (2'nin kuvveti)
+AUTH_SHARD_COUNT = 16
+
+# HS256 JWT başlığı {"alg":"HS256","typ":"JWT"} (base64url, önceden hesaplanmış)
+HS256_HEADER_B64 = b'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9'
+
+class InvalidTokenError(Exception):
+    """Geçersiz JWT (biçim veya imza hatası)"""
+
+class ExpiredSignatureError(InvalidTokenError):
+    """Süresi dolmuş JWT"""
+
+class ImmatureSignatureError(InvalidTokenError):
+    """Henüz geçerli olmayan JWT (nbf/iat gelecekte)"""
+
+def _b64url_encode(data: bytes) -> bytes:
+    """Dolgusuz base64url kodlama"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+def _b64url_decode(data: bytes) -> bytes:
+    """Dolgusuz base64url çözme"""
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+class _ShardedDict:
+    """Parça başına kilitli sözlük: farklı anahtarlara yapılan erişimler birbirini beklemez"""
+    
+    def __init__(self, shard_count: int = AUTH_SHARD_COUNT):
+        self._mask = shard_count - 1
+        self._shards = [dict() for _ in range(shard_count)]
+        self._locks = [threading.RLock() for _ in range(shard_count)]
+    
+    def _index(self, key) -> int:
+        return hash(key) & self._mask
+    
+    def lock_for(self, key) -> threading.RLock:
+        """Anahtarın parça kilidi (birleşik oku-yaz işlemleri için)"""
+        return self._locks[self._index(key)]
+    
+    def __contains__(self, key) -> bool:
+        index = self._index(key)
+        with self._locks[index]:
+            return key in self._shards[index]
+    
+    def __getitem__(self, key):
+        index = self._index(key)
+        with self._locks[index]:
+            return self._shards[index][key]
+    
+    def __setitem__(self, key, value):
+        index = self._index(key)
+        with self._locks[index]:
+            self._shards[index][key] = value
+    
+    def get(self, key, default=None):
+        index = self._index(key)
+        with self._locks[index]:
+            return self._shards[index].get(key, default)
+    
+    def pop(self, key, default=None):
+        index = self._index(key)
+        with self._locks[index]:
+            return self._shards[index].pop(key, default)
+    
+    def values(self) -> List[Any]:
+        """Tüm değerlerin anlık kopyası"""
+        values = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                values.extend(shard.values())
+        return values
+    
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
 class AuthManager:
     """Authentication yöneticisi"""
     
@@ -24,32 +149,116 @@ class AuthManager:
             secret_key: JWT secret key (None ise otomatik oluştur)
         """
         self.secret_key = secret_key or secrets.token_urlsafe(32)
-        self.users = {}  # Gerçek uygulamada veritabanında olmalı
+        self._key_bytes = self.secret_key.encode()
+        # Anahtarlanmış HMAC durumu: her imzada kopyalanır (anahtar hazırlığı tekrarlanmaz)
+        self._hmac_factory = hmac.HMAC(self._key_bytes, digestmod=hashlib.sha256)
+        # Gerçek uygulamada veritabanında olmalı; parçalı tablolar çok çekirdekte kilit çekişmesini azaltır
+        self.users = _ShardedDict()
+        self._email_index = {}  # e-posta -> kullanıcı adı
+        self._email_lock = threading.Lock()
         self.sessions = {}
-        self.refresh_tokens = {}
+        self.refresh_tokens = _ShardedDict()
+        self._user_tokens = defaultdict(set)  # user_id -> aktif refresh token'lar
+        self._user_tokens_lock = threading.Lock()
         
         # JWT ayarları
         self.jwt_algorithm = 'HS256'
         self.access_token_expiry = timedelta(hours=1)
         self.refresh_token_expiry = timedelta(days=30)
+        # Token başına timedelta dönüşümü yapılmaz
+        self._access_exp_seconds = int(self.access_token_expiry.total_seconds())
+        self._refresh_exp_seconds = int(self.refresh_token_expiry.total_seconds())
+        
+        # Şifre hash'leyici: parametreler bir kez ayrıştırılır
+        self.password_hasher = PasswordHasher(
+            time_cost=ARGON2_TIME_COST,
+            memory_cost=ARGON2_MEMORY_COST,
+            parallelism=ARGON2_PARALLELISM
+        ) if PasswordHasher else None
         
-        print("🔐 Auth Manager başlatıldı")
+        # Olmayan kullanıcılar için de aynı maliyette doğrulama yapılır (zamanlama sızıntısı yok)
+        self._dummy_hash = self.hash_password(secrets.token_hex(16))
+        
+        # Doğrulanmış token önbelleği: sha256(token)[:16] -> (payload, exp, kullanıcı epoch'u)
+        self._token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL) if TTLCache else None
+        self._token_cache_lock = threading.Lock()
+        
+        # Doğrulanmış şifre önbelleği: HMAC(süreç anahtarı, hash + şifre) -> True
+        # Anahtar süreçle birlikte üretilir ve hiçbir yere yazılmaz; ham şifre saklanmaz
+        self._pw_cache = TTLCache(maxsize=PASSWORD_CACHE_SIZE, ttl=PASSWORD_CACHE_TTL) if TTLCache else None
+        self._pw_cache_lock = threading.Lock()
+        self._cache_hmac_key = secrets.token_bytes(32)
+        
+        logger.info("🔐 Auth Manager başlatıldı")
     
     def hash_password(self, password: str) -> str:
-        """Şifreyi hash'le"""
+        """Şifreyi hash'le (Argon2id, yoksa scrypt)"""
+        if self.password_hasher:
+            return self.password_hasher.hash(password)
+        
         salt = secrets.token_hex(16)
-        password_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000)
-        return f"{salt}:{password_hash.hex()}"
+        password_hash = self._scrypt(password, salt)
+        return f"{SCRYPT_PREFIX}{salt}${password_hash.hex()}"
+    
+    @staticmethod
+    def _scrypt(password: str, salt: str) -> bytes:
+        """scrypt türetmesi"""
+        return hashlib.scrypt(password.encode(), salt=salt.encode(), n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                              maxmem=256 * SCRYPT_N * SCRYPT_R, dklen=32)
     
     def verify_password(self, password: str, password_hash: str) -> bool:
-        """Şifreyi doğrula"""
+        """Şifreyi doğrula (kısa süre önce doğrulanmış kimlik bilgileri önbellekten)"""
+        if self._pw_cache is None:
+            return self._verify_password_hash(password, password_hash)
+        
+        # Saklanan hash anahtara dahil: şifre değişince eski girişler kendiliğinden geçersizleşir
+        cache_key = hmac.new(self._cache_hmac_key, password_hash.encode() + b'\0' + password.encode(),
+                             hashlib.sha256).digest()
+        with self._pw_cache_lock:
+            if cache_key in self._pw_cache:
+                return True
+        
+        is_valid = self._verify_password_hash(password, password_hash)
+        # Yalnızca başarılı doğrulamalar saklanır: yanlış şifre denemeleri her zaman tam maliyetlidir
+        if is_valid:
+            with self._pw_cache_lock:
+                self._pw_cache[cache_key] = True
+        return is_valid
+    
+    def _verify_password_hash(self, password: str, password_hash: str) -> bool:
+        """Şifreyi saklanan hash'e karşı doğrula"""
         try:
+            if password_hash.startswith('$argon2'):
+                if not self.password_hasher:
+                    return False
+                try:
+                    return self.password_hasher.verify(password_hash, password)
+                except (VerificationError, InvalidHashError):
+                    return False
+            
+            if password_hash.startswith(SCRYPT_PREFIX):
+                salt, hash_hex = password_hash[len(SCRYPT_PREFIX):].split('$')
+                return hmac.compare_digest(hash_hex, self._scrypt(password, salt).hex())
+            
+            # Eski format: "salt:hash" (PBKDF2-HMAC-SHA256)
             salt, hash_hex = password_hash.split(':')
-            password_hash_check = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000)
+            pbkdf2_hmac = _fast_pbkdf2_hmac or hashlib.pbkdf2_hmac
+            password_hash_check = pbkdf2_hmac('sha256', password.encode(), salt.encode(), LEGACY_PBKDF2_ITERATIONS)
             return hmac.compare_digest(hash_hex, password_hash_check.hex())
         except:
             return False
     
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Hash güncel algoritma/parametrelerle mi üretilmiş kontrol et"""
+        if self.password_hasher:
+            if not password_hash.startswith('$argon2'):
+                return True
+            try:
+                return self.password_hasher.check_needs_rehash(password_hash)
+            except InvalidHashError:
+                return True
+        return not password_hash.startswith(SCRYPT_PREFIX)
+    
     def register_user(self, username: str, email: str, password: str, 
                      full_name: str = None) -> Tuple[bool, str, Dict[str, Any]]:
         """
@@ -70,9 +279,8 @@ class AuthManager:
                 return False, "Kullanıcı adı zaten kullanılıyor", {}
             
             # E-posta kontrolü
-            for user in self.users.values():
-                if user['email'] == email:
-                    return False, "E-posta zaten kullanılıyor", {}
+            if email in self._email_index:
+                return False, "E-posta zaten kullanılıyor", {}
             
             # Şifre güçlülük kontrolü
             if len(password) < 8:
@@ -88,14 +296,23 @@ class AuthManager:
                 'email': email,
                 'full_name': full_name or username,
                 'password_hash': password_hash,
-                'created_at': datetime.now().isoformat(),
+                'created_at': int(time.time()),
                 'last_login': None,
                 'is_active': True,
                 'is_verified': False,
-                'role': 'user'
+                'role': 'user',
+                'token_epoch': 0
             }
             
-            self.users[username] = user_data
+            # Hash'leme kilitsiz yapılır; benzersizlik ekleme anında kilit altında yeniden kontrol edilir
+            with self.users.lock_for(username):
+                if username in self.users:
+                    return False, "Kullanıcı adı zaten kullanılıyor", {}
+                with self._email_lock:
+                    if email in self._email_index:
+                        return False, "E-posta zaten kullanılıyor", {}
+                    self._email_index[email] = username
+                self.users[username] = user_data
             
             return True, "Kullanıcı başarıyla kaydedildi", {
                 'user_id': user_id,
@@ -119,19 +336,23 @@ class AuthManager:
             (başarılı, mesaj, kullanıcı_bilgileri)
         """
         try:
-            if username not in self.users:
-                return False, "Kullanıcı bulunamadı", {}
+            # Kullanıcı bulunsun ya da bulunmasın tek bir şifre doğrulaması çalışır
+            user = self.users.get(username)
+            user_exists = user is not None
+            password_ok = self.verify_password(password, user['password_hash'] if user_exists else self._dummy_hash)
             
-            user = self.users[username]
+            if not (user_exists & password_ok):
+                return False, "Geçersiz kimlik bilgileri", {}
             
             if not user['is_active']:
                 return False, "Hesap deaktif", {}
             
-            if not self.verify_password(password, user['password_hash']):
-                return False, "Geçersiz şifre", {}
+            # Eski formatta saklanan şifreyi güncel algoritmayla yeniden hash'le
+            if self.needs_rehash(user['password_hash']):
+                user['password_hash'] = self.hash_password(password)
             
-            # Son giriş zamanını güncelle
-            user['last_login'] = datetime.now().isoformat()
+            # Son giriş zamanını güncelle (epoch saniye)
+            user['last_login'] = int(time.time())
             
             return True, "Giriş başarılı", {
                 'user_id': user['user_id'],
@@ -147,16 +368,16 @@ class AuthManager:
     def generate_tokens(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """JWT token'ları oluştur"""
         try:
-            current_time = datetime.utcnow()
+            issued_at = int(time.time())
             
-            # Access token payload
+            # Access token payload (iat/exp: epoch saniye)
             access_payload = {
                 'user_id': user_data['user_id'],
                 'username': user_data['username'],
                 'role': user_data['role'],
                 'type': 'access',
-                'iat': current_time,
-                'exp': current_time + self.access_token_expiry
+                'iat': issued_at,
+                'exp': issued_at + self._access_exp_seconds
             }
             
             # Refresh token payload
@@ -164,31 +385,94 @@ class AuthManager:
                 'user_id': user_data['user_id'],
                 'username': user_data['username'],
                 'type': 'refresh',
-                'iat': current_time,
-                'exp': current_time + self.refresh_token_expiry
+                'iat': issued_at,
+                'exp': issued_at + self._refresh_exp_seconds
             }
             
             # Token'ları oluştur
-            access_token = jwt.encode(access_payload, self.secret_key, algorithm=self.jwt_algorithm)
-            refresh_token = jwt.encode(refresh_payload, self.secret_key, algorithm=self.jwt_algorithm)
+            access_token = self._encode_hs256(access_payload)
+            refresh_token = self._encode_hs256(refresh_payload)
             
             # Refresh token'ı kaydet
-            self.refresh_tokens[refresh_token] = {
-                'user_id': user_data['user_id'],
-                'created_at': current_time.isoformat(),
-                'is_active': True
-            }
+            with self._user_tokens_lock:
+                self.refresh_tokens[refresh_token] = {
+                    'user_id': user_data['user_id'],
+                    'created_at': issued_at,
+                    'is_active': True
+                }
+                self._user_tokens[user_data['user_id']].add(refresh_token)
             
             return {
                 'access_token': access_token,
                 'refresh_token': refresh_token,
                 'token_type': 'Bearer',
-                'expires_in': int(self.access_token_expiry.total_seconds())
+                'expires_in': self._access_exp_seconds
             }
             
         except Exception as e:
             raise Exception(f"Token oluşturma hatası: {str(e)}")
     
+    def _encode_hs256(self, payload: Dict[str, Any]) -> str:
+        """Payload'ı HS256 ile imzalanmış JWT'ye çevir"""
+        payload_json = orjson.dumps(payload) if orjson is not None else json.dumps(payload, separators=(',', ':')).encode()
+        signing_input = HS256_HEADER_B64 + b'.' + _b64url_encode(payload_json)
+        return (signing_input + b'.' + self._sign(signing_input)).decode('ascii')
+    
+    def _sign(self, signing_input: bytes) -> bytes:
+        """HS256 imzası (base64url)"""
+        mac = self._hmac_factory.copy()
+        mac.update(signing_input)
+        return _b64url_encode(mac.digest())
+    
+    def _decode_hs256(self, token: str) -> Dict[str, Any]:
+        """HS256 JWT'nin imzasını ve süresini doğrulayıp payload'ı döndür"""
+        try:
+            header_b64, payload_b64, signature_b64 = token.encode('ascii').split(b'.')
+        except (AttributeError, UnicodeEncodeError, ValueError):
+            raise InvalidTokenError("Token biçimi geçersiz")
+        
+        # Yalnızca HS256 başlığı kabul edilir ("alg": "none" vb. reddedilir)
+        if header_b64 != HS256_HEADER_B64:
+            try:
+                header = json.loads(_b64url_decode(header_b64))
+            except ValueError:
+                raise InvalidTokenError("Token başlığı geçersiz")
+            if not isinstance(header, dict) or header.get('alg') != 'HS256':
+                raise InvalidTokenError("Desteklenmeyen algoritma")
+        
+        expected = self._sign(header_b64 + b'.' + payload_b64)
+        if not hmac.compare_digest(expected, signature_b64):
+            raise InvalidTokenError("İmza doğrulanamadı")
+        
+        try:
+            payload_json = _b64url_decode(payload_b64)
+            payload = orjson.loads(payload_json) if orjson is not None else json.loads(payload_json)
+        except ValueError:
+            raise InvalidTokenError("Token payload'ı geçersiz")
+        if not isinstance(payload, dict):
+            raise InvalidTokenError("Token payload'ı geçersiz")
+        
+        # Zaman alanları (RFC 7519, PyJWT ile aynı kurallar): sayısal olmalı
+        now = time.time()
+        for claim in ('exp', 'nbf', 'iat'):
+            value = payload.get(claim)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                raise InvalidTokenError(f"{claim} alanı geçersiz")
+        
+        exp = payload.get('exp')
+        if exp is not None and exp <= now:
+            raise ExpiredSignatureError("Token süresi dolmuş")
+        
+        nbf = payload.get('nbf')
+        if nbf is not None and nbf > now:
+            raise ImmatureSignatureError("Token henüz geçerli değil (nbf)")
+        
+        iat = payload.get('iat')
+        if iat is not None and iat > now:
+            raise ImmatureSignatureError("Token henüz geçerli değil (iat)")
+        
+        return payload
+    
     def verify_token(self, token: str) -> Tuple[bool, Dict[str, Any]]:
         """
         JWT token'ı doğrula
@@ -200,7 +484,21 @@ class AuthManager:
             (geçerli, payload)
         """
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.jwt_algorithm])
+            # Hızlı yol: yakın zamanda doğrulanmış token için imza kontrolü tekrarlanmaz
+            token_key = self._token_cache_key(token)
+            if self._token_cache is not None:
+                with self._token_cache_lock:
+                    cached = self._token_cache.get(token_key)
+                if cached is not None:
+                    payload, expires_at, epoch = cached
+                    if time.time() >= expires_at:
+                        return False, {'error': 'Token süresi dolmuş'}
+                    user = self.users.get(payload.get('username'))
+                    if user is None or (user['is_active'] and user.get('token_epoch', 0) == epoch):
+                        return True, payload
+                    return False, {}
+            
+            payload = self._decode_hs256(token)
             
             # Token tipini kontrol et
             if payload.get('type') != 'access':
@@ -208,20 +506,47 @@ class AuthManager:
             
             # Kullanıcı aktif mi kontrol et
             username = payload.get('username')
+            epoch = 0
             if username and username in self.users:
                 user = self.users[username]
                 if not user['is_active']:
                     return False, {}
+                epoch = user.get('token_epoch', 0)
+            
+            if self._token_cache is not None:
+                with self._token_cache_lock:
+                    self._token_cache[token_key] = (payload, payload['exp'], epoch)
             
             return True, payload
             
-        except jwt.ExpiredSignatureError:
+        except ExpiredSignatureError:
             return False, {'error': 'Token süresi dolmuş'}
-        except jwt.InvalidTokenError:
+        except InvalidTokenError:
             return False, {'error': 'Geçersiz token'}
         except Exception as e:
             return False, {'error': f'Token doğrulama hatası: {str(e)}'}
     
+    def verify_tokens_batch(self, tokens: List[str]) -> List[Tuple[bool, Dict[str, Any]]]:
+        """
+        Birden çok JWT token'ı tek geçişte doğrula (toplu yönetim işlemleri, oturum taramaları)
+        
+        Args:
+            tokens: JWT token listesi
+            
+        Returns:
+            Her token için (geçerli, payload), girdi sırasıyla
+        """
+        # Anahtarlanmış HMAC durumu tüm parti için bir kez hazırdır; tekrarlanan token'lar bir kez doğrulanır
+        verified: Dict[str, Tuple[bool, Dict[str, Any]]] = {}
+        verify = self.verify_token
+        results = []
+        for token in tokens:
+            result = verified.get(token)
+            if result is None:
+                result = verified[token] = verify(token)
+            results.append(result)
+        return results
+    
     def refresh_access_token(self, refresh_token: str) -> Tuple[bool, str, Dict[str, Any]]:
         """
         Access token'ı yenile
@@ -234,7 +559,7 @@ class AuthManager:
         """
         try:
             # Refresh token'ı doğrula
-            payload = jwt.decode(refresh_token, self.secret_key, algorithms=[self.jwt_algorithm])
+            payload = self._decode_hs256(refresh_token)
             
             if payload.get('type') != 'refresh':
                 return False, "Geçersiz refresh token", {}
@@ -266,25 +591,34 @@ class AuthManager:
             new_tokens = self.generate_tokens(user_data)
             
             # Eski refresh token'ı deaktif et
-            self.refresh_tokens[refresh_token]['is_active'] = False
+            self._deactivate_refresh_token(refresh_token)
             
             return True, "Token başarıyla yenilendi", new_tokens
             
-        except jwt.ExpiredSignatureError:
+        except ExpiredSignatureError:
             return False, "Refresh token süresi dolmuş", {}
-        except jwt.InvalidTokenError:
+        except InvalidTokenError:
             return False, "Geçersiz refresh token", {}
         except Exception as e:
             return False, f"Token yenileme hatası: {str(e)}", {}
     
+    @staticmethod
+    def _token_cache_key(token: str) -> bytes:
+        """Token önbellek anahtarı (ham sha256 özetinin ilk 16 baytı)"""
+        return hashlib.sha256(token.encode()).digest()[:16]
+    
     def revoke_token(self, token: str) -> bool:
         """Token'ı iptal et"""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.jwt_algorithm])
+            if self._token_cache is not None:
+                with self._token_cache_lock:
+                    self._token_cache.pop(self._token_cache_key(token), None)
+            
+            payload = self._decode_hs256(token)
             
             if payload.get('type') == 'refresh':
                 if token in self.refresh_tokens:
-                    self.refresh_tokens[token]['is_active'] = False
+                    self._deactivate_refresh_token(token)
                     return True
             
             return False
@@ -336,21 +670,36 @@ class AuthManager:
         except Exception as e:
             return False, f"Şifre değiştirme hatası: {str(e)}"
     
+    def _deactivate_refresh_token(self, token: str):
+        """Refresh token'ı deaktif et ve kullanıcı indeksinden çıkar"""
+        with self._user_tokens_lock:
+            info = self.refresh_tokens[token]
+            info['is_active'] = False
+            user_tokens = self._user_tokens.get(info['user_id'])
+            if user_tokens is not None:
+                user_tokens.discard(token)
+                if not user_tokens:
+                    del self._user_tokens[info['user_id']]
+    
     def deactivate_user(self, username: str) -> bool:
         """Kullanıcıyı deaktif et"""
         try:
-            if username in self.users:
-                self.users[username]['is_active'] = False
+            with self.users.lock_for(username):
+                user = self.users.get(username)
+                if user is None:
+                    return False
+                
+                user['is_active'] = False
+                # Önbellekteki access token'ları geçersiz kıl
+                user['token_epoch'] = user.get('token_epoch', 0) + 1
                 
-                # Tüm refresh token'ları deaktif et
-                for token, info in self.refresh_tokens.items():
-                    if info['user_id'] == self.users[username]['user_id']:
-                        info['is_active'] = False
+                # Kullanıcının aktif refresh token'larını deaktif et
+                with self._user_tokens_lock:
+                    for token in self._user_tokens.pop(user['user_id'], ()):
+                        self.refresh_tokens[token]['is_active'] = False
                 
                 return True
             
-            return False
-            
         except:
             return False
     
@@ -358,7 +707,8 @@ class AuthManager:
         """Authentication istatistiklerini döndür"""
         active_users = sum(1 for user in self.users.values() if user['is_active'])
         active_sessions = sum(1 for session in self.sessions.values() if session['is_active'])
-        active_refresh_tokens = sum(1 for token in self.refresh_tokens.values() if token['is_active'])
+        with self._user_tokens_lock:
+            active_refresh_tokens = sum(len(tokens) for tokens in self._user_tokens.values())
         
         return {
             'total_users': len(self.users),
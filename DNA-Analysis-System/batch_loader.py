@@ -0,0 +1,106 @@
+"""
+Toplu Yükleyici (dataloader deseni)
+Kısa bir zaman penceresinde gelen tekil anahtar isteklerini tek bir toplu sorguda birleştirir
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+class BatchLoader:
+    """Eşzamanlı tekil yüklemeleri toplu sorgulara çeviren yükleyici"""
+    
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Dict[Hashable, Any]],
+                 window_ms: float = 5.0, max_batch_size: int = 128,
+                 timeout: float = 5.0, default: Any = None):
+        """
+        Toplu yükleyiciyi başlat
+        
+        Args:
+            batch_fn: Anahtar listesi alıp {anahtar: değer} döndüren toplu sorgu
+            window_ms: İlk istekten sonra diğer anahtarlar için beklenecek süre (ms)
+            max_batch_size: Bu kadar farklı anahtar birikince pencere beklenmeden sorgulanır
+            timeout: Tek bir load çağrısının en fazla bekleme süresi (saniye)
+            default: Toplu sonuçta bulunmayan anahtarlar için değer
+        """
+        self.batch_fn = batch_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self.default = default
+        
+        # Bekleyen anahtarlar: aynı anahtarı isteyen tüm çağrılar tek sorguyu paylaşır
+        self.pending: Dict[Hashable, List[Future]] = {}
+        self.flush_timer: Optional[threading.Timer] = None
+        self.lock = threading.Lock()
+        
+        self.stats = {
+            'loads': 0,
+            'batches': 0,
+            'keys_queried': 0
+        }
+    
+    def load(self, key: Hashable) -> Any:
+        """Anahtarın değerini getir (bekleyen diğer anahtarlarla aynı sorguda)"""
+        future = Future()
+        batch = None
+        
+        with self.lock:
+            self.stats['loads'] += 1
+            self.pending.setdefault(key, []).append(future)
+            
+            if len(self.pending) >= self.max_batch_size:
+                batch = self._take_batch()
+            elif self.flush_timer is None:
+                self.flush_timer = threading.Timer(self.window, self._flush)
+                self.flush_timer.daemon = True
+                self.flush_timer.start()
+        
+        # Dolu pencere: sorguyu bu iş parçacığı çalıştırır
+        if batch:
+            self._dispatch(batch)
+        
+        return future.result(timeout=self.timeout)
+    
+    def _take_batch(self) -> Dict[Hashable, List[Future]]:
+        """Bekleyen anahtarları al ve pencereyi sıfırla (kilit tutulurken çağrılır)"""
+        batch, self.pending = self.pending, {}
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+        return batch
+    
+    def _flush(self):
+        """Pencere süresi doldu: bekleyen anahtarları sorgula"""
+        with self.lock:
+            batch = self._take_batch()
+        
+        if batch:
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch: Dict[Hashable, List[Future]]):
+        """Toplu sorguyu çalıştır ve sonuçları bekleyen çağrılara dağıt"""
+        with self.lock:
+            self.stats['batches'] += 1
+            self.stats['keys_queried'] += len(batch)
+        
+        try:
+            results = self.batch_fn(list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+        
+        for key, futures in batch.items():
+            value = results.get(key, self.default)
+            for future in futures:
+                future.set_result(value)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Yükleyici istatistiklerini döndür"""
+        with self.lock:
+            return {
+                **self.stats,
+                'avg_batch_size': round(self.stats['keys_queried'] / max(self.stats['batches'], 1), 2)
+            }
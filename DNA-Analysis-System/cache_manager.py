@@ -3,28 +3,104 @@ Gelişmiş Caching Sistemi
 DNA analiz sonuçlarını cache'leyerek performansı artırır
 """
 
+import atexit
 import json
 import hashlib
+import logging
 import os
+import queue
+import struct
 import time
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+import threading
+from typing import Dict, Any, Optional, Tuple, Union
+import numpy as np
 import redis
 from pathlib import Path
 
+try:
+    # Opsiyonel: hızlı JSON serileştirme (doğrudan bytes üretir)
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Opsiyonel: disk katmanı için tek dosyalık, bellek eşlemeli LMDB veritabanı
+    import lmdb
+except ImportError:
+    lmdb = None
+
+logger = logging.getLogger(__name__)
+
+# Süreç içi sıcak katmanda tutulacak en fazla sonuç sayısı
+MEMORY_CACHE_SIZE = 256
+
+# Süreç içi girişlerin en uzun ömrü (saniye): delete/üzerine yazma yalnızca bu süreçte
+# etkilidir, diğer gunicorn worker'ları eski sonucu en fazla bu kadar görür
+MEMORY_CACHE_TTL = 60
+
+# Büyük DNA verisi hash'e bu boyutta kopyasız dilimler halinde verilir (1 MiB)
+HASH_CHUNK_SIZE = 1 << 20
+
+# Redis yazmaları boru hattında toplanır: en fazla bu kadar bekler (saniye) veya bu kadar birikince gönderilir
+REDIS_PIPELINE_FLUSH_INTERVAL = 0.01
+REDIS_PIPELINE_MAX_PENDING = 100
+
+# LMDB için ayrılan en büyük adres alanı (sanal; disk yalnızca kullanıldıkça dolar)
+LMDB_MAP_SIZE = 10 << 30
+
+# LMDB kayıt başlığı: bitiş zamanı, yazılma zamanı (epoch saniye)
+LMDB_ENTRY_HEADER = struct.Struct('>dd')
+
+# LMDB bitiş indeksi anahtar öneki: bitiş zamanı (epoch ms, big-endian -> sıralı tarama)
+LMDB_TTL_PREFIX = struct.Struct('>Q')
+
+# Açık LMDB ortamları: (süreç, yol) -> (env, data_db, ttl_db); aynı yol süreç başına bir kez açılabilir
+_lmdb_envs: Dict[Tuple[int, str], Tuple[Any, Any, Any]] = {}
+_lmdb_envs_lock = threading.Lock()
+
+def _dumps(obj: Any) -> bytes:
+    """Cache kaydını kompakt JSON baytlarına çevir"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads(blob: bytes) -> Any:
+    """Cache kaydını JSON baytlarından oku"""
+    if orjson is not None:
+        return orjson.loads(blob)
+    return json.loads(blob)
+
 class DNACacheManager:
     """DNA analiz sonuçları için gelişmiş cache yöneticisi"""
     
-    def __init__(self, cache_dir: str = "cache", redis_url: str = None):
+    def __init__(self, cache_dir: str = "cache", redis_url: str = None, use_file_as_l2: bool = False):
         """
         Cache yöneticisini başlat
         
         Args:
             cache_dir: Cache dosyalarının saklanacağı dizin
             redis_url: Redis bağlantı URL'si (opsiyonel)
+            use_file_as_l2: Redis aktifken de dosya kopyası tut (arka planda yazılır)
+                ve Redis'te bulunmayan anahtarlar için dosyaya bak
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.use_file_as_l2 = use_file_as_l2
+        
+        # Disk katmanı: lmdb kuruluysa tek veritabanı, değilse anahtar başına JSON dosyası
+        # (ortam ilk kullanımda açılır; preload eden ana süreç açmadan fork edebilir)
+        self._lmdb_path = str((self.cache_dir / 'cache.lmdb').resolve())
+        
+        # Dosya yedeği için write-behind kuyruğu (ilk yazmada başlatılır)
+        self._file_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._file_writer: Optional[threading.Thread] = None
+        
+        # Bekleyen Redis yazmaları: cache_key -> (ttl, blob, bitiş zamanı)
+        self._redis_pending: Dict[str, Tuple[int, bytes, float]] = {}
+        self._redis_pending_lock = threading.Lock()
+        self._redis_has_pending = threading.Event()
+        self._redis_batch_full = threading.Event()
+        self._redis_flusher: Optional[threading.Thread] = None
         
         # Redis bağlantısı (opsiyonel)
         self.redis_client = None
@@ -32,9 +108,14 @@ class DNACacheManager:
             try:
                 self.redis_client = redis.from_url(redis_url)
                 self.redis_client.ping()
-                print("✅ Redis cache aktif")
+                logger.info("✅ Redis cache aktif")
             except:
-                print("⚠️ Redis kullanılamıyor, dosya cache kullanılacak")
+                logger.warning("⚠️ Redis kullanılamıyor, dosya cache kullanılacak")
+        
+        # Süreç içi sıcak katman: cache_key -> (bitiş zamanı, veri)
+        # Okumalar kilitsizdir (tek dict.get); yalnızca yazmalar kilit alır
+        self.memory_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._memory_lock = threading.Lock()
         
         # Cache istatistikleri
         self.stats = {
@@ -45,74 +126,182 @@ class DNACacheManager:
             'total_size': 0
         }
     
-    def _generate_cache_key(self, dna_data: str, analysis_type: str = "full") -> str:
+    def _generate_cache_key(self, dna_data: bytes, analysis_type: str = "full") -> str:
         """DNA verisinden cache anahtarı oluştur"""
-        # DNA verisinin hash'ini al
-        data_hash = hashlib.md5(dna_data.encode()).hexdigest()
-        return f"dna_analysis_{analysis_type}_{data_hash}"
+        # DNA verisinin hash'ini al (BLAKE2b, 128 bit)
+        hasher = hashlib.blake2b(digest_size=16)
+        view = memoryview(dna_data)
+        for offset in range(0, len(view), HASH_CHUNK_SIZE):
+            hasher.update(view[offset:offset + HASH_CHUNK_SIZE])
+        return f"dna_analysis_{analysis_type}_{hasher.hexdigest()}"
     
     def _get_file_path(self, cache_key: str) -> Path:
         """Cache dosya yolunu döndür"""
         return self.cache_dir / f"{cache_key}.json"
     
-    def get(self, dna_data: str, analysis_type: str = "full") -> Optional[Dict[str, Any]]:
+    def _lmdb(self):
+        """LMDB ortamını ve alt veritabanlarını döndür (fork sonrası süreç başına yeniden açılır)"""
+        env_key = (os.getpid(), self._lmdb_path)
+        handles = _lmdb_envs.get(env_key)
+        if handles is None:
+            with _lmdb_envs_lock:
+                handles = _lmdb_envs.get(env_key)
+                if handles is None:
+                    # Fork öncesi açılmış ortam çocukta kullanılamaz; kapatılıp yeniden açılır
+                    for inherited_key in [key for key in _lmdb_envs if key[1] == self._lmdb_path]:
+                        _lmdb_envs.pop(inherited_key)[0].close()
+                    env = lmdb.open(self._lmdb_path, map_size=LMDB_MAP_SIZE, max_dbs=2)
+                    handles = _lmdb_envs[env_key] = (env, env.open_db(b'data'), env.open_db(b'ttl'))
+        return handles
+    
+    @staticmethod
+    def _ttl_index_key(expires_ts: float, key: bytes) -> bytes:
+        """Bitiş indeksi anahtarı (bitiş zamanına göre sıralanır)"""
+        return LMDB_TTL_PREFIX.pack(int(expires_ts * 1000)) + key
+    
+    def _disk_read(self, cache_key: str) -> Optional[Tuple[float, bytes]]:
+        """Disk katmanından geçerli kaydı (bitiş zamanı, blob) oku; süresi dolmuşsa sil"""
+        if lmdb is not None:
+            env, data_db, _ = self._lmdb()
+            with env.begin(db=data_db) as txn:
+                value = txn.get(cache_key.encode())
+            if value is None:
+                return None
+            expires_ts, _ = LMDB_ENTRY_HEADER.unpack_from(value)
+            if time.time() < expires_ts:
+                return expires_ts, value[LMDB_ENTRY_HEADER.size:]
+            self._disk_delete(cache_key)
+            return None
+        
+        # Dosya: mtime değeri bitiş zamanıdır
+        file_path = self._get_file_path(cache_key)
+        try:
+            expires_ts = file_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if time.time() < expires_ts:
+            return expires_ts, file_path.read_bytes()
+        # Süresi dolmuş dosyayı sil
+        file_path.unlink(missing_ok=True)
+        return None
+    
+    def _disk_write(self, cache_key: str, blob: bytes, expires_ts: float):
+        """Kaydı disk katmanına yaz"""
+        if lmdb is not None:
+            env, data_db, ttl_db = self._lmdb()
+            key = cache_key.encode()
+            with env.begin(write=True) as txn:
+                old = txn.get(key, db=data_db)
+                if old is not None:
+                    txn.delete(self._ttl_index_key(LMDB_ENTRY_HEADER.unpack_from(old)[0], key), db=ttl_db)
+                txn.put(key, LMDB_ENTRY_HEADER.pack(expires_ts, time.time()) + blob, db=data_db)
+                txn.put(self._ttl_index_key(expires_ts, key), b'', db=ttl_db)
+            return
+        
+        # Dosya: mtime = bitiş zamanı, ctime = yazılma zamanı
+        file_path = self._get_file_path(cache_key)
+        file_path.write_bytes(blob)
+        os.utime(file_path, (time.time(), expires_ts))
+    
+    def _disk_delete(self, cache_key: str):
+        """Kaydı disk katmanından sil"""
+        if lmdb is not None:
+            env, data_db, ttl_db = self._lmdb()
+            key = cache_key.encode()
+            with env.begin(write=True) as txn:
+                old = txn.pop(key, db=data_db)
+                if old is not None:
+                    txn.delete(self._ttl_index_key(LMDB_ENTRY_HEADER.unpack_from(old)[0], key), db=ttl_db)
+            return
+        
+        self._get_file_path(cache_key).unlink(missing_ok=True)
+    
+    def _memory_put(self, cache_key: str, expires_ts: float, data: Dict[str, Any]):
+        """Sonucu süreç içi katmana yaz (ömür MEMORY_CACHE_TTL ile sınırlı; en eski giriş taşmada atılır)"""
+        expires_ts = min(expires_ts, time.time() + MEMORY_CACHE_TTL)
+        with self._memory_lock:
+            self.memory_cache.pop(cache_key, None)
+            self.memory_cache[cache_key] = (expires_ts, data)
+            while len(self.memory_cache) > MEMORY_CACHE_SIZE:
+                self.memory_cache.pop(next(iter(self.memory_cache)), None)
+    
+    def get(self, dna_data: Union[str, bytes], analysis_type: str = "full") -> Optional[Dict[str, Any]]:
         """
         Cache'den analiz sonucunu al
         
         Args:
-            dna_data: DNA verisi
+            dna_data: DNA verisi (str veya önceden encode edilmiş bytes)
             analysis_type: Analiz tipi (full, health, nutrition, etc.)
             
         Returns:
             Cache'deki analiz sonucu veya None
         """
+        if isinstance(dna_data, str):
+            dna_data = dna_data.encode()
         cache_key = self._generate_cache_key(dna_data, analysis_type)
         
+        # Hızlı yol: süreç içi katman (kilit, ağ veya disk erişimi yok)
+        entry = self.memory_cache.get(cache_key)
+        if entry is not None:
+            if time.time() < entry[0]:
+                self.stats['hits'] += 1
+                return entry[1]
+            with self._memory_lock:
+                self.memory_cache.pop(cache_key, None)
+        
         try:
-            # Önce Redis'i dene
+            # Önce Redis'i dene: süresi dolan anahtarları Redis kendisi siler (setex),
+            # dönen her değer geçerlidir; kalan süre aynı turda alınır
             if self.redis_client:
-                cached_data = self.redis_client.get(cache_key)
-                if cached_data:
-                    result = json.loads(cached_data)
-                    # Cache süresi kontrolü
-                    if self._is_cache_valid(result):
+                try:
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.get(cache_key)
+                    pipe.pttl(cache_key)
+                    cached_data, ttl_ms = pipe.execute()
+                except redis.RedisError as e:
+                    # Redis erişilemiyor: dosya cache'ine düş
+                    logger.warning("⚠️ Redis okuma hatası, dosya cache'ine bakılıyor: %s", e)
+                else:
+                    if cached_data:
+                        result = _loads(cached_data)
                         self.stats['hits'] += 1
-                        print(f"🎯 Cache HIT: {analysis_type} analizi")
+                        if ttl_ms > 0:
+                            self._memory_put(cache_key, time.time() + ttl_ms / 1000, result['data'])
+                        logger.debug("🎯 Cache HIT: %s analizi", analysis_type)
                         return result['data']
-                    else:
-                        # Süresi dolmuş cache'i sil
-                        self.redis_client.delete(cache_key)
-            
-            # Dosya cache'ini kontrol et
-            file_path = self._get_file_path(cache_key)
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    result = json.load(f)
-                
-                if self._is_cache_valid(result):
-                    self.stats['hits'] += 1
-                    print(f"🎯 Cache HIT: {analysis_type} analizi (dosya)")
-                    return result['data']
-                else:
-                    # Süresi dolmuş dosyayı sil
-                    file_path.unlink()
+                    
+                    # Redis yetkili kaynak: dosya yalnızca L2 olarak açıkça istenmişse okunur
+                    if not self.use_file_as_l2:
+                        self.stats['misses'] += 1
+                        logger.debug("❌ Cache MISS: %s analizi", analysis_type)
+                        return None
+            
+            # Disk cache'ini kontrol et
+            disk_entry = self._disk_read(cache_key)
+            if disk_entry is not None:
+                expires_ts, blob = disk_entry
+                result = _loads(blob)
+                self.stats['hits'] += 1
+                self._memory_put(cache_key, expires_ts, result['data'])
+                logger.debug("🎯 Cache HIT: %s analizi (dosya)", analysis_type)
+                return result['data']
             
             self.stats['misses'] += 1
-            print(f"❌ Cache MISS: {analysis_type} analizi")
+            logger.debug("❌ Cache MISS: %s analizi", analysis_type)
             return None
             
         except Exception as e:
-            print(f"⚠️ Cache okuma hatası: {e}")
+            logger.warning("⚠️ Cache okuma hatası: %s", e)
             self.stats['misses'] += 1
             return None
     
-    def set(self, dna_data: str, analysis_result: Dict[str, Any], 
+    def set(self, dna_data: Union[str, bytes], analysis_result: Dict[str, Any], 
             analysis_type: str = "full", ttl_hours: int = 24) -> bool:
         """
-        Analiz sonucunu cache'e kaydet
+        Analiz sonucunu cache'e kaydet (Redis yazması boru hattında, arka planda)
         
         Args:
-            dna_data: DNA verisi
+            dna_data: DNA verisi (str veya önceden encode edilmiş bytes)
             analysis_result: Analiz sonucu
             analysis_type: Analiz tipi
             ttl_hours: Cache süresi (saat)
@@ -120,94 +309,251 @@ class DNACacheManager:
         Returns:
             Başarı durumu
         """
+        return self._store(dna_data, analysis_result, analysis_type, ttl_hours, sync=False)
+    
+    def set_sync(self, dna_data: Union[str, bytes], analysis_result: Dict[str, Any], 
+                 analysis_type: str = "full", ttl_hours: int = 24) -> bool:
+        """Analiz sonucunu cache'e kaydet ve Redis yazmasının tamamlanmasını bekle"""
+        return self._store(dna_data, analysis_result, analysis_type, ttl_hours, sync=True)
+    
+    def _store(self, dna_data: Union[str, bytes], analysis_result: Dict[str, Any],
+               analysis_type: str, ttl_hours: int, sync: bool) -> bool:
+        """Sonucu serileştirip cache katmanlarına yaz"""
+        if isinstance(dna_data, str):
+            dna_data = dna_data.encode()
         cache_key = self._generate_cache_key(dna_data, analysis_type)
         
+        ttl_seconds = ttl_hours * 3600
+        expires_ts = time.time() + ttl_seconds
         cache_data = {
-            'data': analysis_result,
-            'created_at': datetime.now().isoformat(),
-            'expires_at': (datetime.now() + timedelta(hours=ttl_hours)).isoformat(),
-            'analysis_type': analysis_type,
-            'data_size': len(json.dumps(analysis_result))
+            'created_at': time.time(),
+            'analysis_type': analysis_type
         }
         
         try:
-            # Redis'e kaydet
-            if self.redis_client:
-                self.redis_client.setex(
-                    cache_key, 
-                    ttl_hours * 3600,  # saniye cinsinden
-                    json.dumps(cache_data)
-                )
-                print(f"💾 Redis cache'e kaydedildi: {analysis_type}")
-            
-            # Dosya cache'ine kaydet
-            file_path = self._get_file_path(cache_key)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            # Sonuç tek geçişte serileştirilir; kayıt meta alanlarının arkasına eklenerek
+            # tek kopyayla kurulur (büyük sonuç baytları ara birleştirmelerde çoğaltılmaz)
+            result_blob = _dumps(analysis_result)
+            cache_data['data_size'] = len(result_blob)
+            blob = b''.join((_dumps(cache_data)[:-1], b',"data":', result_blob, b'}'))
+            
+            # Redis'e kaydet: Redis aktifse yetkili kaynak odur, dosya yalnızca yedektir
+            stored_in_redis = False
+            if self.redis_client and not sync:
+                # Ağ turu isteğin yolunda beklenmez; yazmalar partiler halinde gönderilir
+                self._enqueue_redis_write(cache_key, ttl_seconds, blob, expires_ts)
+                stored_in_redis = True
+            elif self.redis_client:
+                try:
+                    self.redis_client.setex(
+                        cache_key, 
+                        ttl_seconds,  # saniye cinsinden
+                        blob
+                    )
+                    stored_in_redis = True
+                    logger.debug("💾 Redis cache'e kaydedildi: %s", analysis_type)
+                except redis.RedisError as e:
+                    logger.warning("⚠️ Redis yazma hatası, dosya cache'ine yazılıyor: %s", e)
             
+            if not stored_in_redis:
+                # Dosya cache'ine kaydet
+                self._disk_write(cache_key, blob, expires_ts)
+                logger.debug("💾 Dosya cache'e kaydedildi: %s", analysis_type)
+            elif self.use_file_as_l2:
+                # Dosya kopyası isteğin yolunu bekletmeden arka planda yazılır
+                self._enqueue_file_write(cache_key, blob, expires_ts)
+            
+            self._memory_put(cache_key, expires_ts, analysis_result)
             self.stats['sets'] += 1
-            self.stats['total_size'] += cache_data['data_size']
-            print(f"💾 Dosya cache'e kaydedildi: {analysis_type}")
+            self.stats['total_size'] += len(blob)
             return True
             
         except Exception as e:
-            print(f"❌ Cache kaydetme hatası: {e}")
+            logger.error("❌ Cache kaydetme hatası: %s", e)
             return False
     
-    def _is_cache_valid(self, cache_data: Dict[str, Any]) -> bool:
-        """Cache'in geçerli olup olmadığını kontrol et"""
+    def _enqueue_redis_write(self, cache_key: str, ttl_seconds: int, blob: bytes, expires_ts: float):
+        """Redis yazmasını bir sonraki boru hattı turuna ekle"""
+        if self._redis_flusher is None:
+            with self._redis_pending_lock:
+                if self._redis_flusher is None:
+                    self._redis_flusher = threading.Thread(target=self._redis_flush_loop, daemon=True)
+                    self._redis_flusher.start()
+                    atexit.register(self._flush_redis_writes)
+        
+        with self._redis_pending_lock:
+            self._redis_pending[cache_key] = (ttl_seconds, blob, expires_ts)
+            self._redis_has_pending.set()
+            if len(self._redis_pending) >= REDIS_PIPELINE_MAX_PENDING:
+                self._redis_batch_full.set()
+    
+    def _redis_flush_loop(self):
+        """Bekleyen yazmaları aralıklarla (veya parti dolunca) tek turda gönder"""
+        while True:
+            self._redis_has_pending.wait()
+            self._redis_batch_full.wait(REDIS_PIPELINE_FLUSH_INTERVAL)
+            self._flush_redis_writes()
+    
+    def _flush_redis_writes(self):
+        """Bekleyen Redis yazmalarını tek bir boru hattıyla uygula"""
+        with self._redis_pending_lock:
+            batch, self._redis_pending = self._redis_pending, {}
+            self._redis_has_pending.clear()
+            self._redis_batch_full.clear()
+        
+        if not batch:
+            return
+        
         try:
-            expires_at = datetime.fromisoformat(cache_data['expires_at'])
-            return datetime.now() < expires_at
-        except:
-            return False
+            pipe = self.redis_client.pipeline(transaction=False)
+            for cache_key, (ttl_seconds, blob, _) in batch.items():
+                pipe.setex(cache_key, ttl_seconds, blob)
+            pipe.execute()
+            logger.debug("💾 Redis cache'e %s kayıt yazıldı", len(batch))
+        except redis.RedisError as e:
+            # Redis erişilemiyor: kayıtlar dosya cache'ine yazılır
+            logger.warning("⚠️ Redis yazma hatası, %s kayıt dosya cache'ine yazılıyor: %s", len(batch), e)
+            for cache_key, (_, blob, expires_ts) in batch.items():
+                try:
+                    self._disk_write(cache_key, blob, expires_ts)
+                except Exception as write_error:
+                    logger.warning("⚠️ Cache dosyası yazılamadı: %s - %s", cache_key, write_error)
+    
+    def _enqueue_file_write(self, cache_key: str, blob: bytes, expires_ts: float):
+        """Dosya yazımını write-behind kuyruğuna ekle"""
+        if self._file_writer is None:
+            with self._memory_lock:
+                if self._file_writer is None:
+                    self._file_writer = threading.Thread(target=self._file_writer_loop, daemon=True)
+                    self._file_writer.start()
+        self._file_queue.put((cache_key, blob, expires_ts))
+    
+    def _file_writer_loop(self):
+        """Write-behind kuyruğundaki dosya yazımlarını sırayla uygula"""
+        while True:
+            cache_key, blob, expires_ts = self._file_queue.get()
+            try:
+                self._disk_write(cache_key, blob, expires_ts)
+            except Exception as e:
+                logger.warning("⚠️ Cache dosyası yazılamadı: %s - %s", cache_key, e)
     
-    def delete(self, dna_data: str, analysis_type: str = "full") -> bool:
+    def delete(self, dna_data: Union[str, bytes], analysis_type: str = "full") -> bool:
         """Cache'den analiz sonucunu sil"""
+        if isinstance(dna_data, str):
+            dna_data = dna_data.encode()
         cache_key = self._generate_cache_key(dna_data, analysis_type)
         
+        with self._memory_lock:
+            self.memory_cache.pop(cache_key, None)
+        with self._redis_pending_lock:
+            self._redis_pending.pop(cache_key, None)
+        
         try:
             # Redis'ten sil
             if self.redis_client:
                 self.redis_client.delete(cache_key)
             
-            # Dosyadan sil
-            file_path = self._get_file_path(cache_key)
-            if file_path.exists():
-                file_path.unlink()
+            # Diskten sil
+            self._disk_delete(cache_key)
             
             self.stats['deletes'] += 1
-            print(f"🗑️ Cache silindi: {analysis_type}")
+            logger.debug("🗑️ Cache silindi: %s", analysis_type)
             return True
             
         except Exception as e:
-            print(f"❌ Cache silme hatası: {e}")
+            logger.error("❌ Cache silme hatası: %s", e)
             return False
     
-    def clear_expired(self) -> int:
-        """Süresi dolmuş cache'leri temizle"""
-        cleared_count = 0
+    def _sweep_files(self, expired_before: float, written_before: float = None) -> int:
+        """
+        Cache dizinini tek geçişte tara ve süresi dolmuş (mtime) veya
+        eski (ctime) dosyaları sil; dosyalar açılmaz, yalnızca stat okunur
+        """
+        if lmdb is not None:
+            return self._sweep_lmdb(expired_before, written_before)
         
-        try:
-            # Dosya cache'lerini kontrol et
-            for file_path in self.cache_dir.glob("*.json"):
+        paths, mtimes, ctimes = [], [], []
+        
+        # Her girdiye tek dokunuş: yol ve zaman damgaları toplanır
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json'):
+                    continue
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    if not self._is_cache_valid(cache_data):
-                        file_path.unlink()
-                        cleared_count += 1
-                        print(f"🗑️ Süresi dolmuş cache silindi: {file_path.name}")
-                        
-                except Exception as e:
-                    print(f"⚠️ Cache dosyası okunamadı: {file_path.name} - {e}")
-            
-            print(f"✅ {cleared_count} süresi dolmuş cache temizlendi")
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    logger.warning("⚠️ Cache dosyası okunamadı: %s - %s", entry.name, e)
+                    continue
+                paths.append(entry.path)
+                mtimes.append(st.st_mtime)
+                ctimes.append(st.st_ctime)
+        
+        if not paths:
+            return 0
+        
+        # Karşılaştırmalar vektörel yapılır; yalnızca silinecek dosyalar üzerinde dönülür
+        remove_mask = np.asarray(mtimes, dtype=np.float64) <= expired_before
+        if written_before is not None:
+            remove_mask |= np.asarray(ctimes, dtype=np.float64) < written_before
+        
+        removed_count = 0
+        for index in np.flatnonzero(remove_mask):
+            try:
+                os.unlink(paths[index])
+                removed_count += 1
+            except FileNotFoundError:
+                continue
+        
+        return removed_count
+    
+    def _sweep_lmdb(self, expired_before: float, written_before: float = None) -> int:
+        """Süresi dolmuş (bitiş indeksi sırasıyla) ve eski kayıtları tek işlemde sil"""
+        env, data_db, ttl_db = self._lmdb()
+        removed_count = 0
+        
+        with env.begin(write=True) as txn:
+            # Bitiş indeksi sıralı: ilk geçerli kayıtta tarama durur
+            expired = []
+            if expired_before != float('-inf'):
+                limit_ms = int(expired_before * 1000)
+                for index_key, _ in txn.cursor(db=ttl_db):
+                    if LMDB_TTL_PREFIX.unpack_from(index_key)[0] > limit_ms:
+                        break
+                    expired.append(index_key)
+            
+            for index_key in expired:
+                txn.delete(index_key, db=ttl_db)
+                if txn.delete(index_key[LMDB_TTL_PREFIX.size:], db=data_db):
+                    removed_count += 1
+            
+            if written_before is not None:
+                stale = [(key, value[:LMDB_ENTRY_HEADER.size]) for key, value in txn.cursor(db=data_db)
+                         if LMDB_ENTRY_HEADER.unpack_from(value)[1] < written_before]
+                for key, header in stale:
+                    txn.delete(key, db=data_db)
+                    txn.delete(self._ttl_index_key(LMDB_ENTRY_HEADER.unpack(header)[0], key), db=ttl_db)
+                    removed_count += 1
+        
+        return removed_count
+    
+    def clear_expired(self, max_age_days: int = None) -> int:
+        """Süresi dolmuş cache'leri temizle (max_age_days verilirse eski dosyalar da aynı geçişte)"""
+        now = time.time()
+        with self._memory_lock:
+            for cache_key in [k for k, (expires_ts, _) in self.memory_cache.items() if expires_ts <= now]:
+                del self.memory_cache[cache_key]
+        
+        written_before = now - (max_age_days * 24 * 3600) if max_age_days is not None else None
+        
+        try:
+            cleared_count = self._sweep_files(now, written_before)
+            logger.info("✅ %s süresi dolmuş cache temizlendi", cleared_count)
             return cleared_count
             
         except Exception as e:
-            print(f"❌ Cache temizleme hatası: {e}")
+            logger.error("❌ Cache temizleme hatası: %s", e)
             return 0
     
     def get_stats(self) -> Dict[str, Any]:
@@ -220,26 +566,23 @@ class DNACacheManager:
             **self.stats,
             'hit_rate': round(hit_rate * 100, 2),
             'cache_dir': str(self.cache_dir),
-            'redis_active': self.redis_client is not None
+            'redis_active': self.redis_client is not None,
+            'disk_backend': 'lmdb' if lmdb is not None else 'files',
+            'memory_entries': len(self.memory_cache)
         }
     
     def cleanup_old_files(self, days: int = 7) -> int:
         """Belirtilen günden eski dosyaları temizle"""
         cutoff_time = time.time() - (days * 24 * 3600)
-        cleaned_count = 0
         
         try:
-            for file_path in self.cache_dir.glob("*.json"):
-                if file_path.stat().st_mtime < cutoff_time:
-                    file_path.unlink()
-                    cleaned_count += 1
-                    print(f"🗑️ Eski dosya silindi: {file_path.name}")
-            
-            print(f"✅ {cleaned_count} eski dosya temizlendi")
+            # mtime bitiş zamanını tuttuğu için yaş ctime'dan (yazılma zamanı) hesaplanır
+            cleaned_count = self._sweep_files(float('-inf'), cutoff_time)
+            logger.info("✅ %s eski dosya temizlendi", cleaned_count)
             return cleaned_count
             
         except Exception as e:
-            print(f"❌ Eski dosya temizleme hatası: {e}")
+            logger.error("❌ Eski dosya temizleme hatası: %s", e)
             return 0
 
 # Global cache manager instance
@@ -8,11 +8,71 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
+import functools
 import json
+import logging
+import re
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+try:
+    # Opsiyonel: toplu ACMG skorlamasını JIT derleme
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Sınıflandırma -> rapor özeti sayacı
+CLASSIFICATION_SUMMARY_KEYS = {
+    'Pathogenic': 'pathogenic_variants',
+    'Likely Pathogenic': 'likely_pathogenic_variants',
+    'VUS': 'vus_variants',
+    'Likely Benign': 'likely_benign_variants',
+    'Benign': 'benign_variants'
+}
+
+# Skor bandı -> (sınıflandırma, güven, klinik aksiyon)
+ACMG_CLASSIFICATION_BANDS = (
+    ('Pathogenic', 'High', 'Immediate clinical action required'),
+    ('Likely Pathogenic', 'Moderate', 'Consider clinical action'),
+    ('VUS', 'Low', 'Monitor and re-evaluate'),
+    ('Likely Benign', 'Low', 'No clinical action needed'),
+    ('Benign', 'High', 'No clinical significance')
+)
+
+# Eksik functional_evidence için paylaşılan boş sözlük (salt okunur kullanılır)
+_EMPTY = {}
+
+# Gen -> ilişkili fenotip anahtar kelimeleri
+GENE_PHENOTYPES = {
+    'MTHFR': ['cardiovascular', 'thrombosis', 'neural tube defects'],
+    'APOE': ['alzheimer', 'dementia', 'cardiovascular'],
+    'CYP2C9': ['warfarin', 'bleeding', 'anticoagulation']
+}
+
+# Gen başına tek bir büyük/küçük harf duyarsız desen (import sırasında bir kez derlenir)
+PHENOTYPE_PATTERNS = {
+    gene: re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+    for gene, keywords in GENE_PHENOTYPES.items()
+}
+
+# Tekil varyant sınıflandırma önbelleğinin kapasitesi (örnek başına)
+ACMG_CLASSIFY_CACHE_SIZE = 65536
+
+# Loss-of-function varyant tipleri
+LOF_VARIANT_TYPES = ('nonsense', 'frameshift')
+
 class ACMGCriteria(Enum):
     """ACMG/AMP patogenisite kriterleri"""
+    
+    def __new__(cls, strength: str):
+        # Aynı güç etiketli kriterler birbirinin takma adı olmasın diye değer sıra numarasıdır
+        member = object.__new__(cls)
+        member._value_ = len(cls.__members__) + 1
+        member.strength = strength
+        return member
+    
     PVS1 = "Very Strong"  # Null variant in gene where LOF is known disease mechanism
     PS1 = "Strong"        # Same amino acid change as established pathogenic variant
     PS2 = "Strong"        # De novo variant in patient with disease and no family history
@@ -42,9 +102,62 @@ class ACMGCriteria(Enum):
     BP6 = "Benign"        # Reputable source reports variant as benign
     BP7 = "Benign"        # Silent variant with no predicted impact
 
+# Toplu skorlama için kriter sütunları ve ağırlıkları (classify_variant_acmg ile aynı sıra)
+ACMG_PATHOGENIC_CRITERIA = (
+    ACMGCriteria.PVS1, ACMGCriteria.PS1, ACMGCriteria.PS2, ACMGCriteria.PS3, ACMGCriteria.PS4,
+    ACMGCriteria.PM1, ACMGCriteria.PM2, ACMGCriteria.PP3, ACMGCriteria.PP4
+)
+ACMG_PATHOGENIC_WEIGHTS = np.array([4, 4, 4, 4, 4, 2, 2, 1, 1], dtype=np.int8)
+ACMG_BENIGN_CRITERIA = (ACMGCriteria.BA1, ACMGCriteria.BS1, ACMGCriteria.BS2, ACMGCriteria.BP4)
+ACMG_BENIGN_WEIGHTS = np.array([4, 2, 2, 1], dtype=np.int8)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _acmg_classify_batch(feat_p, feat_b, weights_p, weights_b,
+                             out_pathogenic, out_benign, out_score, out_band):
+        """Varyant başına skorlar ve ACMG_CLASSIFICATION_BANDS indeksi (tek döngü)"""
+        for i in range(feat_p.shape[0]):
+            pathogenic = 0
+            for j in range(feat_p.shape[1]):
+                pathogenic += weights_p[j] * feat_p[i, j]
+            benign = 0
+            for j in range(feat_b.shape[1]):
+                benign += weights_b[j] * feat_b[i, j]
+            
+            score = pathogenic - benign
+            if score >= 8:
+                band = 0
+            elif score >= 6:
+                band = 1
+            elif score >= 2:
+                band = 2
+            elif score <= -2:
+                band = 3
+            else:
+                band = 4
+            
+            out_pathogenic[i] = pathogenic
+            out_benign[i] = benign
+            out_score[i] = score
+            out_band[i] = band
+    
+    # Import sırasında ısıt: ilk rapor JIT derleme gecikmesini ödemez
+    _warmup_p = np.zeros((1, ACMG_PATHOGENIC_WEIGHTS.size), dtype=np.int8)
+    _warmup_b = np.zeros((1, ACMG_BENIGN_WEIGHTS.size), dtype=np.int8)
+    _warmup_out = np.zeros(1, dtype=np.int32)
+    _acmg_classify_batch(_warmup_p, _warmup_b, ACMG_PATHOGENIC_WEIGHTS, ACMG_BENIGN_WEIGHTS,
+                         _warmup_out, _warmup_out.copy(), _warmup_out.copy(), _warmup_out.copy())
+    del _warmup_p, _warmup_b, _warmup_out
+
 @dataclass
 class ACMGClassification:
     """ACMG sınıflandırma sonucu"""
+    # Python 3.9 uyumu için dataclass(slots=True) yerine elle tanımlı
+    __slots__ = (
+        'variant_id', 'gene', 'classification', 'criteria_met',
+        'criteria_scores', 'total_score', 'confidence', 'clinical_action'
+    )
+    
     variant_id: str
     gene: str
     classification: str  # Pathogenic, Likely Pathogenic, VUS, Likely Benign, Benign
@@ -53,6 +166,19 @@ class ACMGClassification:
     total_score: int
     confidence: str
     clinical_action: str
+    
+    def as_report_dict(self) -> Dict:
+        """Rapor için JSON uyumlu sözlük (kriterler adlarıyla)"""
+        return {
+            'variant_id': self.variant_id,
+            'gene': self.gene,
+            'classification': self.classification,
+            'criteria_met': [c.name for c in self.criteria_met],
+            'criteria_scores': dict(self.criteria_scores),
+            'total_score': self.total_score,
+            'confidence': self.confidence,
+            'clinical_action': self.clinical_action
+        }
 
 @dataclass
 class FDAApproval:
@@ -95,6 +221,14 @@ class ClinicalValidationSystem:
         self.fda_approvals = self._load_fda_approvals()
         self.cpic_guidelines = self._load_cpic_guidelines()
         self.clingen_evidence = self._load_clingen_evidence()
+        
+        # Örnek başına sınıflandırma önbelleği: self anahtara girmez, örnekle birlikte serbest kalır
+        self._classify_frozen = functools.lru_cache(maxsize=ACMG_CLASSIFY_CACHE_SIZE)(self._classify_fields)
+        
+        # Sorgu indeksleri: her getter tek bir sözlük erişimi
+        self._fda_index = {(a.drug.lower(), a.gene): a for a in self.fda_approvals}
+        self._cpic_index = {(g.drug.lower(), g.gene): g for g in self.cpic_guidelines}
+        self._clingen_index = {(e.gene, e.disease.lower()): e for e in self.clingen_evidence}
     
     def classify_variant_acmg(
         self, 
@@ -102,8 +236,71 @@ class ClinicalValidationSystem:
         phenotype: str = None
     ) -> ACMGClassification:
         """ACMG/AMP kriterlerine göre varyant sınıflandırması"""
-        print(f"🏥 {variant.get('rsid', 'Unknown')} için ACMG sınıflandırması...")
+        logger.debug("🏥 %s için ACMG sınıflandırması...", variant.get('rsid', 'Unknown'))
+        
+        functional_evidence = variant.get('functional_evidence') or _EMPTY
+        
+        # Aynı kriter alanlarına sahip varyantlar önbellekten sınıflandırılır
+        criteria_met, pathogenic_score, benign_score = self._classify_frozen(
+            variant.get('gene'),
+            variant.get('variant_type'),
+            bool(variant.get('de_novo', False)),
+            variant.get('allele_frequency', 0),
+            variant.get('cadd_score', 0),
+            variant.get('sift_score', 1),
+            bool(functional_evidence.get('damaging', False)),
+            bool(functional_evidence.get('benign', False)),
+            bool(variant.get('same_as_pathogenic', False)),
+            variant.get('prevalence_in_affected', 0),
+            phenotype
+        )
+        
+        # Toplam skor hesapla
+        total_score = pathogenic_score - benign_score
         
+        # Sınıflandırma
+        classification, confidence, clinical_action = self._determine_classification(total_score)
+        
+        return ACMGClassification(
+            variant_id=variant.get('rsid', 'Unknown'),
+            gene=variant.get('gene', 'Unknown'),
+            classification=classification,
+            criteria_met=list(criteria_met),
+            criteria_scores={
+                'pathogenic': pathogenic_score,
+                'benign': benign_score
+            },
+            total_score=total_score,
+            confidence=confidence,
+            clinical_action=clinical_action
+        )
+    
+    def _classify_fields(
+        self,
+        gene: Optional[str],
+        variant_type: Optional[str],
+        de_novo: bool,
+        allele_frequency: float,
+        cadd_score: float,
+        sift_score: float,
+        damaging: bool,
+        benign: bool,
+        same_as_pathogenic: bool,
+        prevalence_in_affected: float,
+        phenotype: Optional[str]
+    ) -> Tuple[Tuple[ACMGCriteria, ...], int, int]:
+        """Kriter alanlarından (karşılanan kriterler, patojenik skor, benign skor)"""
+        variant = {
+            'gene': gene,
+            'variant_type': variant_type,
+            'de_novo': de_novo,
+            'allele_frequency': allele_frequency,
+            'cadd_score': cadd_score,
+            'sift_score': sift_score,
+            'same_as_pathogenic': same_as_pathogenic,
+            'prevalence_in_affected': prevalence_in_affected
+        }
+        functional_evidence = {'damaging': damaging, 'benign': benign}
         criteria_met = []
         criteria_scores = {
             'pathogenic': 0,
@@ -126,7 +323,7 @@ class ClinicalValidationSystem:
             criteria_scores['pathogenic'] += 4
         
         # PS3: Functional studies show damaging effect
-        if self._has_damaging_functional_evidence(variant):
+        if self._has_damaging_functional_evidence(variant, functional_evidence):
             criteria_met.append(ACMGCriteria.PS3)
             criteria_scores['pathogenic'] += 4
         
@@ -166,7 +363,7 @@ class ClinicalValidationSystem:
             criteria_scores['benign'] += 2
         
         # BS2: Functional studies show no effect
-        if self._has_benign_functional_evidence(variant):
+        if self._has_benign_functional_evidence(functional_evidence):
             criteria_met.append(ACMGCriteria.BS2)
             criteria_scores['benign'] += 2
         
@@ -175,43 +372,107 @@ class ClinicalValidationSystem:
             criteria_met.append(ACMGCriteria.BP4)
             criteria_scores['benign'] += 1
         
-        # Toplam skor hesapla
-        total_score = criteria_scores['pathogenic'] - criteria_scores['benign']
+        return tuple(criteria_met), criteria_scores['pathogenic'], criteria_scores['benign']
+    
+    def classify_variants_acmg(
+        self, 
+        variants: List[Dict], 
+        phenotype: str = None
+    ) -> List[ACMGClassification]:
+        """ACMG/AMP sınıflandırmasını varyant listesi için vektörel yap"""
+        if not variants:
+            return []
         
-        # Sınıflandırma
-        classification, confidence, clinical_action = self._determine_classification(total_score)
+        # Sütunları bir kez çıkar
+        genes = np.array([v.get('gene') or '' for v in variants])
+        variant_types = np.array([v.get('variant_type') or '' for v in variants])
+        af = np.array([v.get('allele_frequency', 0) for v in variants], dtype=float)
+        cadd = np.array([v.get('cadd_score', 0) for v in variants], dtype=float)
+        sift = np.array([v.get('sift_score', 1) for v in variants], dtype=float)
+        prevalence = np.array([v.get('prevalence_in_affected', 0) for v in variants], dtype=float)
+        de_novo = np.array([bool(v.get('de_novo', False)) for v in variants])
+        same_as_pathogenic = np.array([bool(v.get('same_as_pathogenic', False)) for v in variants])
+        evidence = [v.get('functional_evidence') or _EMPTY for v in variants]
+        damaging = np.array([bool(fe.get('damaging', False)) for fe in evidence])
+        benign_evidence = np.array([bool(fe.get('benign', False)) for fe in evidence])
         
-        return ACMGClassification(
-            variant_id=variant.get('rsid', 'Unknown'),
-            gene=variant.get('gene', 'Unknown'),
-            classification=classification,
-            criteria_met=criteria_met,
-            criteria_scores=criteria_scores,
-            total_score=total_score,
-            confidence=confidence,
-            clinical_action=clinical_action
-        )
+        # Fenotip eşleşmesi gen başına bir kez değerlendirilir
+        if phenotype:
+            matched_genes = [g for g in np.unique(genes) if self._phenotype_matches_gene(g, phenotype)]
+            phenotype_mask = np.isin(genes, matched_genes)
+        else:
+            phenotype_mask = np.zeros(len(variants), dtype=bool)
+        
+        # Kriter sütunları (ACMG_PATHOGENIC_CRITERIA / ACMG_BENIGN_CRITERIA sırası)
+        feat_p = np.column_stack([
+            np.isin(variant_types, LOF_VARIANT_TYPES) & np.isin(genes, list(self.acmg_criteria['lof_genes'])),
+            same_as_pathogenic,
+            de_novo,
+            np.isin(genes, list(self.acmg_criteria['functional_evidence'])) & damaging,
+            prevalence > 0.1,
+            np.isin(genes, list(self.acmg_criteria['hotspot_genes'])),
+            af < 0.001,
+            (cadd > 15) | (sift < 0.05),
+            phenotype_mask
+        ]).astype(np.int8)
+        feat_b = np.column_stack([
+            af > 0.05,
+            af > 0.1,
+            benign_evidence,
+            (cadd < 5) & (sift > 0.5)
+        ]).astype(np.int8)
+        
+        n = len(variants)
+        if NUMBA_AVAILABLE:
+            pathogenic_scores = np.empty(n, dtype=np.int32)
+            benign_scores = np.empty(n, dtype=np.int32)
+            total_scores = np.empty(n, dtype=np.int32)
+            bands = np.empty(n, dtype=np.int32)
+            _acmg_classify_batch(feat_p, feat_b, ACMG_PATHOGENIC_WEIGHTS, ACMG_BENIGN_WEIGHTS,
+                                 pathogenic_scores, benign_scores, total_scores, bands)
+        else:
+            pathogenic_scores = feat_p.astype(np.int32) @ ACMG_PATHOGENIC_WEIGHTS
+            benign_scores = feat_b.astype(np.int32) @ ACMG_BENIGN_WEIGHTS
+            total_scores = pathogenic_scores - benign_scores
+            bands = np.select(
+                [total_scores >= 8, total_scores >= 6, total_scores >= 2, total_scores <= -2],
+                [0, 1, 2, 3],
+                default=4
+            )
+        
+        criteria = ACMG_PATHOGENIC_CRITERIA + ACMG_BENIGN_CRITERIA
+        hits = np.hstack([feat_p, feat_b])
+        
+        results = []
+        for i, variant in enumerate(variants):
+            classification, confidence, clinical_action = ACMG_CLASSIFICATION_BANDS[bands[i]]
+            results.append(ACMGClassification(
+                variant_id=variant.get('rsid', 'Unknown'),
+                gene=variant.get('gene', 'Unknown'),
+                classification=classification,
+                criteria_met=[c for c, hit in zip(criteria, hits[i]) if hit],
+                criteria_scores={
+                    'pathogenic': int(pathogenic_scores[i]),
+                    'benign': int(benign_scores[i])
+                },
+                total_score=int(total_scores[i]),
+                confidence=confidence,
+                clinical_action=clinical_action
+            ))
+        
+        return results
     
     def get_fda_approval_info(self, drug: str, gene: str) -> Optional[FDAApproval]:
         """FDA onay bilgisi al"""
-        for approval in self.fda_approvals:
-            if approval.drug.lower() == drug.lower() and approval.gene == gene:
-                return approval
-        return None
+        return self._fda_index.get((drug.lower(), gene))
     
     def get_cpic_guideline(self, drug: str, gene: str) -> Optional[CPICGuideline]:
         """CPIC kılavuzu al"""
-        for guideline in self.cpic_guidelines:
-            if guideline.drug.lower() == drug.lower() and guideline.gene == gene:
-                return guideline
-        return None
+        return self._cpic_index.get((drug.lower(), gene))
     
     def get_clingen_evidence(self, gene: str, disease: str) -> Optional[ClinGenEvidence]:
         """ClinGen kanıt seviyesi al"""
-        for evidence in self.clingen_evidence:
-            if evidence.gene == gene and evidence.disease.lower() == disease.lower():
-                return evidence
-        return None
+        return self._clingen_index.get((gene, disease.lower()))
     
     def generate_clinical_report(
         self, 
@@ -219,7 +480,7 @@ class ClinicalValidationSystem:
         phenotype: str = None
     ) -> Dict:
         """Klinik rapor oluştur"""
-        print("📋 Klinik rapor oluşturuluyor...")
+        logger.debug("📋 Klinik rapor oluşturuluyor (%d varyant)...", len(variants))
         
         report = {
             'summary': {
@@ -237,44 +498,36 @@ class ClinicalValidationSystem:
             'clinical_recommendations': []
         }
         
-        # Her varyant için ACMG sınıflandırması
-        for variant in variants:
-            acmg_result = self.classify_variant_acmg(variant, phenotype)
-            report['acmg_classifications'].append(acmg_result.__dict__)
+        summary = report['summary']
+        seen_genes = set()
+        
+        # Tek geçiş: ACMG sınıflandırması ve gen bazlı FDA/CPIC/ClinGen sorguları
+        acmg_results = self.classify_variants_acmg(variants, phenotype)
+        for variant, acmg_result in zip(variants, acmg_results):
+            report['acmg_classifications'].append(acmg_result.as_report_dict())
             
             # Özet güncelle
-            classification = acmg_result.classification
-            if classification == 'Pathogenic':
-                report['summary']['pathogenic_variants'] += 1
-            elif classification == 'Likely Pathogenic':
-                report['summary']['likely_pathogenic_variants'] += 1
-            elif classification == 'VUS':
-                report['summary']['vus_variants'] += 1
-            elif classification == 'Likely Benign':
-                report['summary']['likely_benign_variants'] += 1
-            elif classification == 'Benign':
-                report['summary']['benign_variants'] += 1
-        
-        # FDA onayları
-        for variant in variants:
-            if variant.get('gene'):
-                fda_info = self.get_fda_approval_info('Warfarin', variant['gene'])
-                if fda_info:
-                    report['fda_approvals'].append(fda_info.__dict__)
-        
-        # CPIC kılavuzları
-        for variant in variants:
-            if variant.get('gene'):
-                cpic_guideline = self.get_cpic_guideline('Warfarin', variant['gene'])
-                if cpic_guideline:
-                    report['cpic_guidelines'].append(cpic_guideline.__dict__)
-        
-        # ClinGen kanıtları
-        for variant in variants:
-            if variant.get('gene'):
-                clingen_evidence = self.get_clingen_evidence(variant['gene'], 'Cardiovascular disease')
-                if clingen_evidence:
-                    report['clingen_evidence'].append(clingen_evidence.__dict__)
+            summary_key = CLASSIFICATION_SUMMARY_KEYS.get(acmg_result.classification)
+            if summary_key:
+                summary[summary_key] += 1
+            
+            # Her gen için kaynaklar yalnızca bir kez sorgulanır
+            gene = variant.get('gene')
+            if not gene or gene in seen_genes:
+                continue
+            seen_genes.add(gene)
+            
+            fda_info = self.get_fda_approval_info('Warfarin', gene)
+            if fda_info:
+                report['fda_approvals'].append(fda_info.__dict__)
+            
+            cpic_guideline = self.get_cpic_guideline('Warfarin', gene)
+            if cpic_guideline:
+                report['cpic_guidelines'].append(cpic_guideline.__dict__)
+            
+            clingen_evidence = self.get_clingen_evidence(gene, 'Cardiovascular disease')
+            if clingen_evidence:
+                report['clingen_evidence'].append(clingen_evidence.__dict__)
         
         # Klinik öneriler
         report['clinical_recommendations'] = self._generate_clinical_recommendations(report)
@@ -284,9 +537,9 @@ class ClinicalValidationSystem:
     def _load_acmg_criteria(self) -> Dict:
         """ACMG kriterlerini yükle"""
         return {
-            'lof_genes': ['MTHFR', 'BRCA1', 'BRCA2', 'TP53'],
-            'hotspot_genes': ['TP53', 'KRAS', 'BRAF'],
-            'functional_evidence': ['MTHFR', 'CYP2C9', 'CYP2C19']
+            'lof_genes': frozenset({'MTHFR', 'BRCA1', 'BRCA2', 'TP53'}),
+            'hotspot_genes': frozenset({'TP53', 'KRAS', 'BRAF'}),
+            'functional_evidence': frozenset({'MTHFR', 'CYP2C9', 'CYP2C19'})
         }
     
     def _load_fda_approvals(self) -> List[FDAApproval]:
@@ -370,11 +623,11 @@ class ClinicalValidationSystem:
         # Basit kontrol
         return variant.get('same_as_pathogenic', False)
     
-    def _has_damaging_functional_evidence(self, variant: Dict) -> bool:
+    def _has_damaging_functional_evidence(self, variant: Dict, functional_evidence: Dict) -> bool:
         """Zararlı fonksiyonel kanıt var mı?"""
         gene = variant.get('gene')
         if gene in self.acmg_criteria['functional_evidence']:
-            return variant.get('functional_evidence', {}).get('damaging', False)
+            return functional_evidence.get('damaging', False)
         return False
     
     def _has_high_prevalence_in_affected(self, variant: Dict) -> bool:
@@ -396,24 +649,16 @@ class ClinicalValidationSystem:
     
     def _phenotype_matches_gene(self, gene: str, phenotype: str) -> bool:
         """Fenotip gen ile eşleşiyor mu?"""
-        # Basit eşleştirme
-        gene_phenotypes = {
-            'MTHFR': ['cardiovascular', 'thrombosis', 'neural tube defects'],
-            'APOE': ['alzheimer', 'dementia', 'cardiovascular'],
-            'CYP2C9': ['warfarin', 'bleeding', 'anticoagulation']
-        }
-        
-        if gene in gene_phenotypes:
-            return any(p in phenotype.lower() for p in gene_phenotypes[gene])
-        return False
+        pattern = PHENOTYPE_PATTERNS.get(gene)
+        return bool(pattern and pattern.search(phenotype))
     
     def _frequency_greater_than_expected(self, variant: Dict) -> bool:
         """Beklenenden yüksek frekans mı?"""
         return variant.get('allele_frequency', 0) > 0.1
     
-    def _has_benign_functional_evidence(self, variant: Dict) -> bool:
+    def _has_benign_functional_evidence(self, functional_evidence: Dict) -> bool:
         """Benign fonksiyonel kanıt var mı?"""
-        return variant.get('functional_evidence', {}).get('benign', False)
+        return functional_evidence.get('benign', False)
     
     def _has_benign_computational_evidence(self, variant: Dict) -> bool:
         """Benign hesaplamalı kanıt var mı?"""
@@ -422,15 +667,15 @@ class ClinicalValidationSystem:
     def _determine_classification(self, total_score: int) -> Tuple[str, str, str]:
         """Sınıflandırma belirle"""
         if total_score >= 8:
-            return 'Pathogenic', 'High', 'Immediate clinical action required'
+            return ACMG_CLASSIFICATION_BANDS[0]
         elif total_score >= 6:
-            return 'Likely Pathogenic', 'Moderate', 'Consider clinical action'
+            return ACMG_CLASSIFICATION_BANDS[1]
         elif total_score >= 2:
-            return 'VUS', 'Low', 'Monitor and re-evaluate'
+            return ACMG_CLASSIFICATION_BANDS[2]
         elif total_score <= -2:
-            return 'Likely Benign', 'Low', 'No clinical action needed'
+            return ACMG_CLASSIFICATION_BANDS[3]
         else:
-            return 'Benign', 'High', 'No clinical significance'
+            return ACMG_CLASSIFICATION_BANDS[4]
     
     def _generate_clinical_recommendations(self, report: Dict) -> List[str]:
         """Klinik öneriler oluştur"""
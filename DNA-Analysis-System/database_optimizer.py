@@ -7,7 +7,7 @@ import sqlite3
 import threading
 import time
 import json
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from contextlib import contextmanager
 from queue import Queue, Empty
 import logging
@@ -255,6 +255,38 @@ class DatabaseConnectionPool:
             self._log_performance_metric('query', execution_time, False, str(e))
             raise
     
+    def stream_query(self, query: str, params: Tuple = (),
+                     batch_size: int = 1000) -> Iterator[Dict]:
+        """Sorgu sonuçlarını satır satır üret (fetchall yerine fetchmany; tüm sonuç bellekte tutulmaz)"""
+        start_time = time.time()
+        
+        try:
+            # Bağlantı, üretici tüketildiği (ya da kapatıldığı) sürece havuzdan alınmış kalır
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                columns = [description[0] for description in cursor.description]
+                
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(zip(columns, row))
+                
+                cursor.close()
+                
+                # Performance metriklerini kaydet
+                execution_time = time.time() - start_time
+                self._log_performance_metric('stream', execution_time, True)
+                
+        except GeneratorExit:
+            raise
+        except Exception as e:
+            execution_time = time.time() - start_time
+            self._log_performance_metric('stream', execution_time, False, str(e))
+            raise
+    
     def execute_batch(self, queries: List[Tuple[str, Tuple]]) -> List[Any]:
         """Batch sorguları çalıştır"""
         start_time = time.time()
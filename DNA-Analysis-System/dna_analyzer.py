@@ -5,9 +5,10 @@ Gerçek DNA verilerini analiz eden profesyonel sistem
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, TextIO, Tuple
 from dataclasses import dataclass
 from enum import Enum
+import io
 import json
 from pathlib import Path
 import sys
@@ -25,7 +26,7 @@ try:
     from databases.real_databases import RealDatabaseConnector
     from databases.advanced_databases import AdvancedDatabaseConnector
     from databases.real_api_connector import RealAPIConnector
-    from algorithms.scientific_algorithms import ScientificAlgorithms
+    from algorithms.scientific_algorithms import ScientificAlgorithms, VariantTable
     from algorithms.ml_algorithms import AdvancedMLAlgorithms
     from clinical.clinical_validation import ClinicalValidationSystem
     from population.population_analysis import PopulationAnalysis
@@ -33,7 +34,7 @@ except ImportError:
     # Fallback import
     from andme_parser import Parser23andMe
     from real_databases import RealDatabaseConnector
-    from scientific_algorithms import ScientificAlgorithms
+    from scientific_algorithms import ScientificAlgorithms, VariantTable
     # Gelişmiş modüller için placeholder sınıflar
     class AdvancedDatabaseConnector:
         def __init__(self): pass
@@ -52,7 +53,7 @@ except ImportError:
         def calculate_rare_variant_burden(self, variants, gene): return {}
     class ClinicalValidationSystem:
         def __init__(self): pass
-        def classify_variant_acmg(self, variant, phenotype): return type('obj', (object,), {'__dict__': {}})()
+        def classify_variant_acmg(self, variant, phenotype): return type('obj', (object,), {'as_report_dict': lambda self: {}})()
     class PopulationAnalysis:
         def __init__(self): pass
         def analyze_ancestry(self, variants): return []
@@ -61,6 +62,33 @@ except ImportError:
         def analyze_haplotype_blocks(self, variants): return []
         def analyze_population_structure(self, variants, population): return type('obj', (object,), {'__dict__': {}})()
 
+# Statik referans tabloları (modül düzeyinde bir kez; gunicorn --preload ile worker'lar arasında paylaşılır)
+GENE_MAPPING = {
+    'rs1801133': 'MTHFR',
+    'rs429358': 'APOE',
+    'rs7412': 'APOE',
+    'rs1801131': 'MTHFR',
+    'rs1799853': 'CYP2C9',
+    'rs1057910': 'CYP2C9',
+    'rs4244285': 'CYP2C19',
+    'rs4986893': 'CYP2C19',
+    'rs28399504': 'CYP2C19',
+    'rs41291556': 'CYP2C19'
+}
+
+CLINICAL_SIGNIFICANCE_MAPPING = {
+    'rs1801133': 'Pathogenic',
+    'rs429358': 'Risk factor',
+    'rs7412': 'Risk factor',
+    'rs1801131': 'Pathogenic',
+    'rs1799853': 'Pathogenic',
+    'rs1057910': 'Pathogenic',
+    'rs4244285': 'Pathogenic',
+    'rs4986893': 'Pathogenic',
+    'rs28399504': 'Pathogenic',
+    'rs41291556': 'Pathogenic'
+}
+
 class AnalysisType(Enum):
     """Analiz türleri"""
     HEALTH_RISK = "health_risk"
@@ -118,16 +146,19 @@ class AnalysisResult:
 class DNAAnalyzer:
     """Ana DNA analiz sınıfı"""
     
-    def __init__(self, data_path: str):
+    def __init__(self, data_path: Optional[str] = None):
         """
         DNA analizörünü başlat - GÜÇLENDİRİLMİŞ VERSİYON
         
         Args:
-            data_path: DNA veri dosyası yolu (VCF, FASTA, FASTQ, 23andMe)
+            data_path: DNA veri dosyası yolu (VCF, FASTA, FASTQ, 23andMe).
+                Verilmezse veri from_stream / analyze_from_stream ile bellekten okunur.
         """
-        self.data_path = Path(data_path)
+        self.data_path = Path(data_path) if data_path else None
+        self.data_stream: Optional[TextIO] = None  # Bellek içi 23andMe verisi
         self.variants: List[GeneticVariant] = []
         self.raw_genetic_data: List[Dict] = []  # Ham genetik veri
+        self.variant_table: Optional[pd.DataFrame] = None  # Kolon bazlı ham veri (rsid, chromosome, position, genotype)
         self.analysis_results: Optional[AnalysisResult] = None
         
         # Performans optimizasyonu - 23andMe seviyesi
@@ -169,6 +200,59 @@ class DNAAnalyzer:
         self.total_batches = 0
         self.variants_cache = {}  # Bellek optimizasyonu için
         self.gwas_data: Optional[List] = None
+    
+    @classmethod
+    def from_stream(cls, stream: TextIO) -> 'DNAAnalyzer':
+        """Geçici dosya yazmadan 23andMe metin akışından (ör. io.StringIO) analizör oluştur"""
+        analyzer = cls()
+        analyzer.data_stream = stream
+        return analyzer
+    
+    @classmethod
+    def from_string(cls, data: str) -> 'DNAAnalyzer':
+        """Geçici dosya yazmadan bellekteki 23andMe verisinden analizör oluştur"""
+        return cls.from_stream(io.StringIO(data))
+    
+    def analyze_from_stream(self, stream: TextIO,
+                            analysis_types: List[AnalysisType] = None) -> Optional[AnalysisResult]:
+        """
+        23andMe metin akışını yükleyip analiz et
+        
+        Algoritma nesneleri ve referans veritabanları istekler arasında
+        yeniden kullanılır; yalnızca isteğe özgü durum sıfırlanır.
+        
+        Returns:
+            Analiz sonucu, veri yüklenemezse None
+        """
+        self._reset_request_state()
+        self.data_stream = stream
+        if not self.load_dna_data():
+            return None
+        return self.analyze(analysis_types)
+    
+    def analyze_from_string(self, data: str,
+                            analysis_types: List[AnalysisType] = None) -> Optional[AnalysisResult]:
+        """Bellekteki 23andMe verisini yükleyip analiz et"""
+        return self.analyze_from_stream(io.StringIO(data), analysis_types)
+    
+    def _reset_request_state(self):
+        """Önceki analizden kalan varyant ve sonuç durumunu temizle"""
+        self.variants = []
+        self.raw_genetic_data = []
+        self.variant_table = None
+        self.analysis_results = None
+        self.variants_cache = {}
+        self.current_batch = 0
+        self.total_batches = 0
+        # Örneğe özgü veritabanı sonuçları: yükleme başarısız olursa önceki kullanıcının verisi kullanılmasın
+        self.comprehensive_variants = {}
+        self.clinvar_data = None
+        self.pharmgkb_data = None
+        self.gwas_data = None
+        self.exac_data = None
+        self.dbsnp_data = None
+        for key in self.processing_stats:
+            self.processing_stats[key] = 0
         
     def _load_real_databases(self):
         """GERÇEK veritabanlarını yükle - KAPSAMLI VERSİYON"""
@@ -191,8 +275,11 @@ class DNAAnalyzer:
             from databases.comprehensive_variant_database import ComprehensiveVariantDatabase
             from databases.realtime_api_connector import RealTimeAPIConnector
             
-            self.comprehensive_db = ComprehensiveVariantDatabase()
-            self.realtime_api = RealTimeAPIConnector()
+            # Analizör yeniden kullanılıyorsa bağlantıları tekrar kurma
+            if getattr(self, 'comprehensive_db', None) is None:
+                self.comprehensive_db = ComprehensiveVariantDatabase()
+            if getattr(self, 'realtime_api', None) is None:
+                self.realtime_api = RealTimeAPIConnector()
             
             # DNA verisini kapsamlı analiz et
             if self.raw_genetic_data:
@@ -492,8 +579,14 @@ class DNAAnalyzer:
     def load_dna_data(self) -> bool:
         """DNA verisini yükle"""
         try:
+            # Bellek içi veri (23andMe formatı)
+            if self.data_stream is not None:
+                self._load_23andme_data()
+                print(f"✅ {len(self.variants)} varyant yüklendi")
+                return True
+            
             # Dosya varlığını kontrol et
-            if not self.data_path.exists():
+            if self.data_path is None or not self.data_path.exists():
                 raise FileNotFoundError(f"Dosya bulunamadı: {self.data_path}")
             
             # Dosya formatını kontrol et
@@ -559,44 +652,48 @@ class DNAAnalyzer:
         print("🧬 23andMe verisi yükleniyor...")
         
         # 23andMe parser'ını kullan
-        parser = Parser23andMe(str(self.data_path))
+        if self.data_stream is not None:
+            parser = Parser23andMe.from_stream(self.data_stream)
+        else:
+            parser = Parser23andMe(str(self.data_path))
         
         if parser.load_data():
-            # 23andMe SNP'lerini GeneticVariant'a dönüştür
-            self.variants = []
-            self.raw_genetic_data = []  # Ham veriyi de sakla
+            # 23andMe SNP'lerini kolon bazlı (SoA) tablodan GeneticVariant'a dönüştür
+            table = parser.raw_data
+            self.variant_table = table
+            rsids = table['rsid'].tolist()
+            chromosomes = table['chromosome'].astype(str).tolist()
+            positions = table['position'].tolist()
+            genotypes = table['genotype'].astype(str).tolist()
             
-            for snp in parser.snps:
-                # Ham veriyi sakla
-                self.raw_genetic_data.append({
-                    'rsid': snp.rsid,
-                    'chromosome': snp.chromosome,
-                    'position': snp.position,
-                    'genotype': snp.genotype
-                })
-                # 23andMe'de REF/ALT bilgisi yok, varsayılan değerler kullan
-                ref_allele = "A"  # Varsayılan
-                alt_allele = "T"  # Varsayılan
-                
-                # Genotipi düzenle (AA -> A/A, AT -> A/T, etc.)
-                if len(snp.genotype) == 2 and snp.genotype != "--":
-                    formatted_genotype = f"{snp.genotype[0]}/{snp.genotype[1]}"
-                else:
-                    formatted_genotype = snp.genotype
-                
-                variant = GeneticVariant(
-                    chromosome=snp.chromosome,
-                    position=snp.position,
-                    ref_allele=ref_allele,
-                    alt_allele=alt_allele,
+            # Ham veriyi de sakla
+            self.raw_genetic_data = [
+                {'rsid': rsid, 'chromosome': chromosome, 'position': position, 'genotype': genotype}
+                for rsid, chromosome, position, genotype in zip(rsids, chromosomes, positions, genotypes)
+            ]
+            
+            # Genotipi düzenle (AA -> A/A, AT -> A/T, etc.); kategori başına bir kez
+            formatted_genotypes = table['genotype'].map(
+                lambda g: f"{g[0]}/{g[1]}" if len(g) == 2 and g != "--" else g
+            ).astype(str).tolist()
+            
+            # 23andMe'de REF/ALT bilgisi yok, varsayılan değerler kullan
+            self.variants = [
+                GeneticVariant(
+                    chromosome=chromosome,
+                    position=position,
+                    ref_allele="A",  # Varsayılan
+                    alt_allele="T",  # Varsayılan
                     genotype=formatted_genotype,
                     quality_score=99.9,  # 23andMe'de güvenilirlik yüksek
-                    gene=self._get_gene_from_rsid(snp.rsid),
-                    rsid=snp.rsid,
-                    clinical_significance=self._get_clinical_significance(snp.rsid)
+                    gene=self._get_gene_from_rsid(rsid),
+                    rsid=rsid,
+                    clinical_significance=self._get_clinical_significance(rsid)
                 )
-                
-                self.variants.append(variant)
+                for rsid, chromosome, position, formatted_genotype in zip(
+                    rsids, chromosomes, positions, formatted_genotypes
+                )
+            ]
             
             print(f"✅ 23andMe'den {len(self.variants)} varyant yüklendi")
         else:
@@ -604,35 +701,11 @@ class DNAAnalyzer:
     
     def _get_gene_from_rsid(self, rsid: str) -> Optional[str]:
         """RSID'den gen adını bul"""
-        gene_mapping = {
-            'rs1801133': 'MTHFR',
-            'rs429358': 'APOE',
-            'rs7412': 'APOE',
-            'rs1801131': 'MTHFR',
-            'rs1799853': 'CYP2C9',
-            'rs1057910': 'CYP2C9',
-            'rs4244285': 'CYP2C19',
-            'rs4986893': 'CYP2C19',
-            'rs28399504': 'CYP2C19',
-            'rs41291556': 'CYP2C19'
-        }
-        return gene_mapping.get(rsid)
+        return GENE_MAPPING.get(rsid)
     
     def _get_clinical_significance(self, rsid: str) -> Optional[str]:
         """RSID'den klinik önemini bul"""
-        significance_mapping = {
-            'rs1801133': 'Pathogenic',
-            'rs429358': 'Risk factor',
-            'rs7412': 'Risk factor',
-            'rs1801131': 'Pathogenic',
-            'rs1799853': 'Pathogenic',
-            'rs1057910': 'Pathogenic',
-            'rs4244285': 'Pathogenic',
-            'rs4986893': 'Pathogenic',
-            'rs28399504': 'Pathogenic',
-            'rs41291556': 'Pathogenic'
-        }
-        return significance_mapping.get(rsid)
+        return CLINICAL_SIGNIFICANCE_MAPPING.get(rsid)
     
     def analyze(self, analysis_types: List[AnalysisType] = None) -> AnalysisResult:
         """DNA analizi yap"""
@@ -788,7 +861,7 @@ class DNAAnalyzer:
             classifications = []
             for variant in variant_data:
                 acmg_result = self.clinical_validation.classify_variant_acmg(variant, 'cardiovascular disease')
-                classifications.append(acmg_result.__dict__)
+                classifications.append(acmg_result.as_report_dict())
             
             return classifications
         except Exception as e:
@@ -1114,14 +1187,15 @@ class DNAAnalyzer:
         if not variant_data:
             return {}
         
-        # Özellikler için poligenik risk skorları hesapla
+        # Özellikler için poligenik risk skorları hesapla (kolon tablosu bir kez kurulur)
+        variant_table = VariantTable.from_records(variant_data)
         traits = ['cardiovascular_disease', 'alzheimer_disease', 'diabetes']
         prs_results = {}
         
         for trait in traits:
             try:
                 prs = self.scientific_algorithms.calculate_polygenic_risk_score(
-                    variant_data, trait, 'European'
+                    variant_table, trait, 'European'
                 )
                 prs_results[trait] = {
                     'score': prs.score,
@@ -1279,11 +1353,12 @@ class DNAAnalyzer:
             return {}
         
         try:
+            variant_table = VariantTable.from_records(variant_data)
             traits = ['cardiovascular_disease', 'alzheimer_disease', 'diabetes']
             heritability_results = {}
             
             for trait in traits:
-                heritability = self.scientific_algorithms.calculate_heritability(variant_data, trait)
+                heritability = self.scientific_algorithms.calculate_heritability(variant_table, trait)
                 heritability_results[trait] = heritability
             
             return heritability_results
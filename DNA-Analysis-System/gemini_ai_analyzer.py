@@ -6,7 +6,39 @@ Gelişmiş genetik analiz ve kişiselleştirilmiş öneriler için Gemini AI kul
 import google.generativeai as genai
 import json
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
+
+# Prompt'taki kolon adı -> varyant sözlüğündeki alan
+VARIANT_COLUMNS = {
+    'rsid': 'rsid',
+    'chr': 'chromosome',
+    'pos': 'position',
+    'gt': 'genotype'
+}
+
+# Kolon formatının prompt'a eklenen tek satırlık açıklaması
+VARIANT_SCHEMA_NOTE = (
+    "Varyantlar kolon formatında: rsid=RS kimliği, chr=kromozom, pos=pozisyon, gt=genotip; "
+    "aynı indeksteki değerler tek bir varyanttır."
+)
+
+def to_columnar(variants: List[Dict]) -> Dict[str, List]:
+    """Varyant listesini kolon bazlı (SoA) sözlüğe çevir: anahtarlar her varyantta tekrar edilmez"""
+    return {
+        column: [variant.get(field) for variant in variants]
+        for column, field in VARIANT_COLUMNS.items()
+    }
+
+def from_columnar(columns: Dict[str, List]) -> List[Dict]:
+    """Kolon bazlı varyant sözlüğünü tekrar varyant listesine çevir"""
+    return [
+        dict(zip(VARIANT_COLUMNS.values(), values))
+        for values in zip(*(columns.get(column, []) for column in VARIANT_COLUMNS))
+    ]
+
+def _compact_json(data: Any) -> str:
+    """Prompt için boşluksuz JSON (daha az token)"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str)
 
 class GeminiDNAAnalyzer:
     def __init__(self, api_key: str = None):
@@ -33,6 +65,7 @@ class GeminiDNAAnalyzer:
             'health_risks': """
             Sen bir genetik uzmanısın. Aşağıdaki genetik varyantları analiz et ve sağlık risklerini değerlendir:
             
+            {schema}
             Varyantlar: {variants}
             
             Her varyant için:
@@ -64,6 +97,7 @@ class GeminiDNAAnalyzer:
             'nutrition': """
             Sen bir beslenme uzmanısın. Genetik profile göre kişiselleştirilmiş beslenme önerileri ver:
             
+            {schema}
             Genetik Profil: {genetic_profile}
             
             Analiz et:
@@ -101,6 +135,7 @@ class GeminiDNAAnalyzer:
             'exercise': """
             Sen bir egzersiz fizyologusun. Genetik profile göre egzersiz önerileri ver:
             
+            {schema}
             Genetik Profil: {genetic_profile}
             
             Analiz et:
@@ -134,6 +169,7 @@ class GeminiDNAAnalyzer:
             'supplements': """
             Sen bir takviye uzmanısın. Genetik profile göre takviye önerileri ver:
             
+            {schema}
             Genetik Profil: {genetic_profile}
             
             Analiz et:
@@ -167,22 +203,27 @@ class GeminiDNAAnalyzer:
             """
         }
     
-    def analyze_genetic_variants(self, variants: List[Dict]) -> Dict[str, Any]:
+    def analyze_genetic_variants(self, variants: Union[List[Dict], Dict[str, List]]) -> Dict[str, Any]:
         """
         Genetik varyantları Gemini AI ile analiz eder
         
         Args:
-            variants: Genetik varyant listesi
+            variants: Genetik varyant listesi veya kolon bazlı sözlük (to_columnar)
             
         Returns:
             Analiz sonuçları
         """
+        if isinstance(variants, dict):
+            variants = from_columnar(variants)
+        
         try:
-            # Varyantları string formatına çevir
-            variants_str = json.dumps(variants, indent=2)
+            # Varyantları kolon bazlı, kompakt string formatına çevir
+            variants_str = _compact_json(to_columnar(variants))
             
             # Gemini'ye gönder
-            prompt = self.analysis_prompts['health_risks'].format(variants=variants_str)
+            prompt = self.analysis_prompts['health_risks'].format(
+                schema=VARIANT_SCHEMA_NOTE, variants=variants_str
+            )
             response = self.model.generate_content(prompt)
             
             # JSON parse et
@@ -204,8 +245,10 @@ class GeminiDNAAnalyzer:
             Beslenme önerileri
         """
         try:
-            profile_str = json.dumps(genetic_profile, indent=2)
-            prompt = self.analysis_prompts['nutrition'].format(genetic_profile=profile_str)
+            profile_str = self._format_profile(genetic_profile)
+            prompt = self.analysis_prompts['nutrition'].format(
+                schema=VARIANT_SCHEMA_NOTE, genetic_profile=profile_str
+            )
             response = self.model.generate_content(prompt)
             
             return json.loads(response.text)
@@ -225,8 +268,10 @@ class GeminiDNAAnalyzer:
             Egzersiz önerileri
         """
         try:
-            profile_str = json.dumps(genetic_profile, indent=2)
-            prompt = self.analysis_prompts['exercise'].format(genetic_profile=profile_str)
+            profile_str = self._format_profile(genetic_profile)
+            prompt = self.analysis_prompts['exercise'].format(
+                schema=VARIANT_SCHEMA_NOTE, genetic_profile=profile_str
+            )
             response = self.model.generate_content(prompt)
             
             return json.loads(response.text)
@@ -246,8 +291,10 @@ class GeminiDNAAnalyzer:
             Takviye önerileri
         """
         try:
-            profile_str = json.dumps(genetic_profile, indent=2)
-            prompt = self.analysis_prompts['supplements'].format(genetic_profile=profile_str)
+            profile_str = self._format_profile(genetic_profile)
+            prompt = self.analysis_prompts['supplements'].format(
+                schema=VARIANT_SCHEMA_NOTE, genetic_profile=profile_str
+            )
             response = self.model.generate_content(prompt)
             
             return json.loads(response.text)
@@ -256,8 +303,15 @@ class GeminiDNAAnalyzer:
             print(f"Takviye analiz hatası: {e}")
             return self._fallback_supplement_analysis(genetic_profile)
     
+    def _format_profile(self, genetic_profile: Dict) -> str:
+        """Genetik profili prompt için kompakt JSON'a çevir (varyantlar kolon bazlı)"""
+        variants = genetic_profile.get('variants')
+        if isinstance(variants, list):
+            genetic_profile = {**genetic_profile, 'variants': to_columnar(variants)}
+        return _compact_json(genetic_profile)
+    
     def _fallback_analysis(self, variants: List[Dict]) -> Dict[str, Any]:
-        """Gemini başarısız olursa fallback analiz"""
+        """Gemini başarısız olursa fallback analiz (ai_fallback işaretli; cache'lenmez)"""
         return {
             "variants": [
                 {
@@ -272,7 +326,8 @@ class GeminiDNAAnalyzer:
                 for v in variants[:5]  # İlk 5 varyant
             ],
             "overall_risk_score": 0.5,
-            "priority_actions": ["Genel sağlık önerileri"]
+            "priority_actions": ["Genel sağlık önerileri"],
+            "ai_fallback": True
         }
     
     def _fallback_nutrition_analysis(self, profile: Dict) -> Dict[str, Any]:
@@ -282,7 +337,8 @@ class GeminiDNAAnalyzer:
             "calorie_needs": {"daily": 2000, "macros": {"protein": "20%", "carbs": "50%", "fat": "30%"}},
             "vitamin_needs": {"B12": "Normal", "D3": "Normal", "Folate": "Normal"},
             "food_recommendations": ["Dengeli beslenme", "Meyve ve sebze"],
-            "avoid_foods": ["İşlenmiş gıdalar"]
+            "avoid_foods": ["İşlenmiş gıdalar"],
+            "ai_fallback": True
         }
     
     def _fallback_exercise_analysis(self, profile: Dict) -> Dict[str, Any]:
@@ -295,7 +351,8 @@ class GeminiDNAAnalyzer:
             },
             "recovery_needs": "24-48 saat",
             "injury_prevention": ["Isınma"],
-            "performance_tips": ["Düzenli antrenman"]
+            "performance_tips": ["Düzenli antrenman"],
+            "ai_fallback": True
         }
     
     def _fallback_supplement_analysis(self, profile: Dict) -> Dict[str, Any]:
@@ -306,7 +363,8 @@ class GeminiDNAAnalyzer:
             ],
             "optional_supplements": [],
             "avoid_supplements": [],
-            "timing_recommendations": "Sabah yemekle"
+            "timing_recommendations": "Sabah yemekle",
+            "ai_fallback": True
         }
 
 # Test fonksiyonu
@@ -0,0 +1,40 @@
+"""
+Gunicorn yapılandırması (DNA Analiz API)
+
+Kullanım: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5001')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# Thread'li worker: bir worker içindeki istekler Gemini/veritabanı I/O'sunu beklerken birbirini bloklamaz
+worker_class = 'gthread'
+
+# Uygulama ve modül düzeyindeki referans tablolar fork'tan önce bir kez yüklenir,
+# worker'lar belleği copy-on-write paylaşır
+preload_app = True
+
+# Analiz istekleri uzun sürebilir (Gemini çağrıları dahil)
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 300))
+
+def post_fork(server, worker):
+    """Arka plan iş parçacıkları fork'ta kopyalanmaz; her worker'da başlat"""
+    from api_server import parallel_processor, memory_manager, system_monitor, configure_logging
+    
+    configure_logging()
+    parallel_processor.start_background_workers()
+    memory_manager.start_memory_monitoring(interval=30)
+    system_monitor.start_monitoring(interval=15)
+
+def worker_exit(server, worker):
+    """Worker kapanırken arka plan iş parçacıklarını durdur"""
+    from api_server import parallel_processor, memory_manager, system_monitor, stop_log_listener
+    
+    parallel_processor.stop_background_workers()
+    memory_manager.stop_memory_monitoring()
+    system_monitor.stop_monitoring()
+    stop_log_listener()
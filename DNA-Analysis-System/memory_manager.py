@@ -14,6 +14,9 @@ import threading
 from collections import defaultdict
 import tracemalloc
 
+# check_memory_limit için RSS örneği en fazla bu kadar eski olabilir (saniye)
+MEMORY_SAMPLE_INTERVAL = 0.5
+
 class MemoryManager:
     """Memory kullanımını yöneten sınıf"""
     
@@ -46,15 +49,18 @@ class MemoryManager:
         # Memory profiling
         self.tracemalloc_enabled = False
         
+        # Son RSS örneği: istek yolundaki limit kontrolü çoğu zaman yalnızca bu değeri okur
+        self._last_rss = 0
+        self._last_sample_time = 0.0
+        
         print(f"🧠 Memory Manager başlatıldı: Max {max_memory_mb}MB, Cleanup {cleanup_threshold*100}%")
     
     def get_memory_usage(self) -> Dict[str, Any]:
         """Mevcut memory kullanımını döndür"""
         try:
-            memory_info = self.process.memory_info()
+            current_memory = self._sample_rss()
             system_memory = psutil.virtual_memory()
             
-            current_memory = memory_info.rss
             memory_percent = (current_memory / self.max_memory_bytes) * 100
             
             return {
@@ -71,16 +77,32 @@ class MemoryManager:
             print(f"⚠️ Memory bilgisi alınamadı: {e}")
             return {}
     
+    def _sample_rss(self) -> int:
+        """Süreç RSS'ini oku ve son örnek olarak sakla"""
+        rss = self.process.memory_info().rss
+        self._last_rss = rss
+        self._last_sample_time = time.monotonic()
+        return rss
+    
     def check_memory_limit(self) -> bool:
         """Memory limitini kontrol et"""
-        memory_info = self.get_memory_usage()
+        # Hızlı yol: yeni bir örnek varsa sistem çağrısı yapmadan karar ver
+        if time.monotonic() - self._last_sample_time < MEMORY_SAMPLE_INTERVAL:
+            return self._last_rss <= self.max_memory_bytes
+        
+        try:
+            current_memory = self._sample_rss()
+        except Exception as e:
+            print(f"⚠️ Memory bilgisi alınamadı: {e}")
+            return True
         
-        if memory_info.get('is_over_limit', False):
-            print(f"⚠️ Memory limiti aşıldı: {memory_info['current_memory_mb']}MB / {memory_info['memory_limit_mb']}MB")
+        if current_memory > self.max_memory_bytes:
+            print(f"⚠️ Memory limiti aşıldı: {current_memory / 1024 / 1024:.2f}MB / {self.max_memory_bytes / 1024 / 1024:.2f}MB")
             return False
         
-        if memory_info.get('needs_cleanup', False):
-            print(f"🧹 Memory temizliği gerekli: {memory_info['memory_percent']:.1f}%")
+        memory_percent = (current_memory / self.max_memory_bytes) * 100
+        if memory_percent > (self.cleanup_threshold * 100):
+            print(f"🧹 Memory temizliği gerekli: {memory_percent:.1f}%")
             self.cleanup_memory()
         
         return True
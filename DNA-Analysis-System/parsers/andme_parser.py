@@ -5,9 +5,11 @@
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, TextIO, Tuple
 from dataclasses import dataclass
 from pathlib import Path
+import contextlib
+import io
 import re
 
 @dataclass
@@ -30,8 +32,28 @@ class Parser23andMe:
             file_path: 23andMe DNA dosyası yolu
         """
         self.file_path = Path(file_path)
+        self.stream: Optional[TextIO] = None  # Bellek içi veri (from_stream / from_string)
         self.snps: List[SNP23andMe] = []
         self.raw_data: pd.DataFrame = None
+    
+    @classmethod
+    def from_stream(cls, stream: TextIO) -> 'Parser23andMe':
+        """Dosyaya yazmadan okunabilir (seek destekli) metin akışından parser oluştur"""
+        parser = cls('<memory>')
+        parser.stream = stream
+        return parser
+    
+    @classmethod
+    def from_string(cls, data: str) -> 'Parser23andMe':
+        """Dosyaya yazmadan bellekteki 23andMe metninden parser oluştur"""
+        return cls.from_stream(io.StringIO(data))
+    
+    def _open_source(self):
+        """Veri kaynağını aç (bellek içi akış baştan, veya dosya); akış kapatılmaz"""
+        if self.stream is not None:
+            self.stream.seek(0)
+            return contextlib.nullcontext(self.stream)
+        return open(self.file_path, 'r', encoding='utf-8')
         
     def load_data(self) -> bool:
         """23andMe DNA verisini yükle"""
@@ -58,7 +80,7 @@ class Parser23andMe:
     def _is_valid_23andme_file(self) -> bool:
         """23andMe dosya formatını kontrol et"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
+            with self._open_source() as f:
                 lines = f.readlines()[:5]  # İlk 5 satırı kontrol et
                 
             # Herhangi bir satırda rsid varsa geçerli
@@ -72,14 +94,19 @@ class Parser23andMe:
     
     def _load_raw_data(self) -> pd.DataFrame:
         """Ham veriyi yükle"""
-        # 23andMe formatı: rsid, chromosome, position, genotype
-        df = pd.read_csv(
-            self.file_path,
-            sep='\t',
-            comment='#',
-            names=['rsid', 'chromosome', 'position', 'genotype'],
-            dtype={'rsid': str, 'chromosome': str, 'position': str, 'genotype': str}
-        )
+        # 23andMe formatı: rsid, chromosome, position, genotype (tab ayraçlı, '#' yorum satırları)
+        # Az sayıda farklı değerli kolonlar kategori olarak okunur; position başlık satırı
+        # içerebileceğinden önce metin olarak okunup sayıya çevrilir
+        with self._open_source() as source:
+            df = pd.read_csv(
+                source,
+                sep='\t',
+                comment='#',
+                names=['rsid', 'chromosome', 'position', 'genotype'],
+                usecols=[0, 1, 2, 3],
+                dtype={'rsid': str, 'chromosome': 'category', 'position': str, 'genotype': 'category'},
+                engine='c'
+            )
         
         # Header satırını filtrele
         df = df[df['rsid'] != 'rsid']
@@ -89,86 +116,76 @@ class Parser23andMe:
         df = df[df['rsid'].str.startswith('rs')]
         df = df[df['genotype'].isin(['AA', 'AT', 'AC', 'AG', 'TT', 'TC', 'TG', 'CC', 'CG', 'GG', '--', 'DD', 'II', 'DI'])]
         
-        # Position'ı int'e çevir
+        # Position'ı int'e çevir (insan genomu koordinatları int32'ye sığar)
         df['position'] = pd.to_numeric(df['position'], errors='coerce')
         df = df.dropna()
+        df['position'] = df['position'].astype(np.int32)
         
         return df
     
     def _parse_snps(self) -> List[SNP23andMe]:
         """SNP'leri parse et - GELİŞTİRİLMİŞ VERSİYON"""
-        snps = []
-        
         print("🧬 Gelişmiş SNP parsing başlatılıyor...")
         
-        for _, row in self.raw_data.iterrows():
-            try:
-                # Gelişmiş SNP analizi
-                snp = SNP23andMe(
-                    rsid=row['rsid'],
-                    chromosome=str(row['chromosome']),
-                    position=int(row['position']),
-                    genotype=row['genotype'],
-                    confidence=self._calculate_confidence(row)
-                )
-                snps.append(snp)
-            except Exception as e:
-                print(f"⚠️ SNP parse hatası: {row['rsid']} - {e}")
-                continue
+        # Kolonlar üzerinden toplu dönüşüm (satır satır iterrows yok)
+        df = self.raw_data
+        confidences = self._calculate_confidences(df)
+        snps = [
+            SNP23andMe(rsid=rsid, chromosome=chromosome, position=position,
+                       genotype=genotype, confidence=confidence)
+            for rsid, chromosome, position, genotype, confidence in zip(
+                df['rsid'].tolist(),
+                df['chromosome'].astype(str).tolist(),
+                df['position'].tolist(),
+                df['genotype'].astype(str).tolist(),
+                confidences.tolist()
+            )
+        ]
         
         print(f"✅ {len(snps)} SNP başarıyla parse edildi")
         
         # Ek analizler
-        self._analyze_genetic_diversity(snps)
-        self._identify_rare_variants(snps)
-        self._calculate_coverage_statistics(snps)
+        self._analyze_genetic_diversity(df)
+        self._identify_rare_variants(df)
+        self._calculate_coverage_statistics(confidences)
         
         return snps
     
-    def _calculate_confidence(self, row) -> float:
-        """SNP güven skoru hesapla"""
-        confidence = 0.8  # Base confidence
-        
-        # Genotype kalitesi
-        genotype = str(row['genotype'])
-        if len(genotype) == 2 and genotype.isalpha():
-            confidence += 0.1
+    def _calculate_confidences(self, df: pd.DataFrame) -> np.ndarray:
+        """SNP güven skorlarını hesapla (kolon bazlı)"""
+        # Kategorik kolonlarda kontroller satır başına değil, farklı değer başına yapılır
+        genotype_ok = df['genotype'].map(lambda g: len(g) == 2 and g.isalpha()).to_numpy(bool)
+        position_ok = df['position'].to_numpy() > 0
+        chromosome_ok = df['chromosome'].map(
+            lambda c: str(c).isdigit() or c in ['X', 'Y', 'MT']
+        ).to_numpy(bool)
         
-        # Position kalitesi
-        if isinstance(row['position'], (int, float)) and row['position'] > 0:
-            confidence += 0.05
-        
-        # Chromosome kalitesi
-        if str(row['chromosome']).isdigit() or row['chromosome'] in ['X', 'Y', 'MT']:
-            confidence += 0.05
-        
-        return min(confidence, 1.0)
+        # Toplama sırası tekil hesapla aynı (aynı kayan nokta sonuçları)
+        confidence = np.full(len(df), 0.8)
+        confidence[genotype_ok] += 0.1
+        confidence[position_ok] += 0.05
+        confidence[chromosome_ok] += 0.05
+        return np.minimum(confidence, 1.0)
     
-    def _analyze_genetic_diversity(self, snps: List[SNP23andMe]):
+    def _analyze_genetic_diversity(self, df: pd.DataFrame):
         """Genetik çeşitlilik analizi"""
-        chromosomes = {}
-        for snp in snps:
-            if snp.chromosome not in chromosomes:
-                chromosomes[snp.chromosome] = 0
-            chromosomes[snp.chromosome] += 1
+        chromosomes = df['chromosome'].astype(str).value_counts(sort=False).to_dict()
         
         print(f"📊 Kromozom dağılımı: {chromosomes}")
     
-    def _identify_rare_variants(self, snps: List[SNP23andMe]):
+    def _identify_rare_variants(self, df: pd.DataFrame):
         """Nadir varyantları tespit et"""
-        rare_variants = []
-        for snp in snps:
-            # Nadir varyant kriterleri
-            if snp.rsid.startswith('rs') and len(snp.genotype) == 2:
-                if any(allele in snp.genotype for allele in ['T', 'G', 'C', 'A']):
-                    rare_variants.append(snp)
+        # Nadir varyant kriterleri
+        is_rare = df['genotype'].map(
+            lambda g: len(g) == 2 and any(allele in g for allele in ['T', 'G', 'C', 'A'])
+        ).to_numpy(bool) & df['rsid'].str.startswith('rs').to_numpy(bool)
         
-        print(f"🔍 {len(rare_variants)} nadir varyant tespit edildi")
+        print(f"🔍 {int(is_rare.sum())} nadir varyant tespit edildi")
     
-    def _calculate_coverage_statistics(self, snps: List[SNP23andMe]):
+    def _calculate_coverage_statistics(self, confidences: np.ndarray):
         """Kapsam istatistikleri hesapla"""
-        total_snps = len(snps)
-        high_confidence = len([s for s in snps if s.confidence and s.confidence > 0.9])
+        total_snps = len(confidences)
+        high_confidence = int((confidences > 0.9).sum())
         
         print(f"📈 Toplam SNP: {total_snps}")
         print(f"📈 Yüksek güven: {high_confidence} (%{high_confidence/total_snps*100:.1f})")
@@ -241,8 +258,22 @@ class Parser23andMe:
             "chromosomes": len(set(snp.chromosome for snp in self.snps)),
             "genotype_distribution": self.get_genotype_frequency(),
             "chromosome_distribution": self.get_chromosome_distribution(),
-            "file_size_mb": self.file_path.stat().st_size / (1024 * 1024)
+            "file_size_mb": (self._stream_size_bytes() if self.stream is not None
+                             else self.file_path.stat().st_size) / (1024 * 1024)
         }
+    
+    def _stream_size_bytes(self) -> int:
+        """Bellek içi verinin UTF-8 bayt boyutu; akışın konumu değişmez"""
+        if isinstance(self.stream, io.StringIO):
+            return len(self.stream.getvalue().encode('utf-8'))
+        
+        # Diğer metin akışları: baştan parça parça oku, sonra konumu geri yükle
+        position = self.stream.tell()
+        try:
+            self.stream.seek(0)
+            return sum(len(chunk.encode('utf-8')) for chunk in iter(lambda: self.stream.read(1 << 20), ''))
+        finally:
+            self.stream.seek(position)
 
 def main():
     """Test fonksiyonu"""
@@ -5,10 +5,83 @@ DNA analizi için veritabanı sorgularını optimize eder
 
 import time
 import json
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from database_optimizer import db_pool
 import hashlib
 
+# Varyant sorguları (liste ve akış sürümleri aynı SQL'i kullanır)
+VARIANTS_BY_RSID_SQL = '''
+    SELECT * FROM genetic_variants 
+    WHERE rsid = ?
+    ORDER BY position
+'''
+
+VARIANTS_BY_CHROMOSOME_RANGE_SQL = '''
+    SELECT * FROM genetic_variants 
+    WHERE chromosome = ? AND position BETWEEN ? AND ?
+    ORDER BY position
+'''
+
+VARIANTS_BY_CHROMOSOME_SQL = '''
+    SELECT * FROM genetic_variants 
+    WHERE chromosome = ?
+    ORDER BY position
+'''
+
+HEALTH_RISKS_BY_VARIANT_SQL = '''
+    SELECT hr.*, gv.rsid, gv.gene
+    FROM health_risks hr
+    JOIN genetic_variants gv ON hr.variant_id = gv.id
+    WHERE hr.variant_id = ?
+    ORDER BY hr.confidence DESC
+'''
+
+DRUG_INTERACTIONS_BY_VARIANT_SQL = '''
+    SELECT di.*, gv.rsid, gv.gene
+    FROM drug_interactions di
+    JOIN genetic_variants gv ON di.variant_id = gv.id
+    WHERE di.variant_id = ?
+    ORDER BY di.severity DESC
+'''
+
+# Eşik olmadan tüm yüksek etkili varyantlar (frekansa göre azalan; eşik dilimleme için)
+ALL_HIGH_IMPACT_VARIANTS_SQL = '''
+    SELECT * FROM genetic_variants 
+    WHERE impact IN ('HIGH', 'MODERATE') 
+    AND frequency IS NOT NULL
+    ORDER BY frequency DESC
+'''
+
+# Çok varyantlı (toplu) sürümler: {placeholders} yerine '?, ?, ...' konur
+HEALTH_RISKS_BY_VARIANTS_SQL = '''
+    SELECT hr.*, gv.rsid, gv.gene
+    FROM health_risks hr
+    JOIN genetic_variants gv ON hr.variant_id = gv.id
+    WHERE hr.variant_id IN ({placeholders})
+    ORDER BY hr.variant_id, hr.confidence DESC
+'''
+
+DRUG_INTERACTIONS_BY_VARIANTS_SQL = '''
+    SELECT di.*, gv.rsid, gv.gene
+    FROM drug_interactions di
+    JOIN genetic_variants gv ON di.variant_id = gv.id
+    WHERE di.variant_id IN ({placeholders})
+    ORDER BY di.variant_id, di.severity DESC
+'''
+
+VARIANTS_BY_GENE_SQL = '''
+    SELECT * FROM genetic_variants 
+    WHERE gene LIKE ?
+    ORDER BY position
+'''
+
+HIGH_IMPACT_VARIANTS_SQL = '''
+    SELECT * FROM genetic_variants 
+    WHERE impact IN ('HIGH', 'MODERATE') 
+    AND frequency >= ?
+    ORDER BY frequency DESC
+'''
+
 class QueryOptimizer:
     """Veritabanı sorgu optimizatörü"""
     
@@ -102,75 +175,93 @@ class QueryOptimizer:
         if execution_time > 1.0:  # 1 saniyeden uzun
             self.query_stats['slow_queries'] += 1
     
+    def stream_optimized_query(self, query: str, params: Tuple = ()) -> Iterator[Dict]:
+        """
+        Sorgu sonuçlarını satır satır üret (büyük sonuç kümeleri için)
+        
+        Cache'de geçerli sonuç varsa oradan okunur; yoksa sonuç sunucu tarafı
+        cursor'dan akıtılır ve bellekte biriktirilmediği için cache'e yazılmaz.
+        """
+        cached_result = self._get_cached_result(self._generate_cache_key(query, params))
+        if cached_result:
+            self.query_stats['cache_hits'] += 1
+            yield from cached_result
+            return
+        
+        start_time = time.time()
+        yield from db_pool.stream_query(query, params)
+        self._update_query_stats(time.time() - start_time)
+    
     def get_genetic_variants_by_rsid(self, rsid: str) -> List[Dict]:
         """RSID'ye göre genetik varyantları getir"""
-        query = '''
-            SELECT * FROM genetic_variants 
-            WHERE rsid = ?
-            ORDER BY position
-        '''
-        return self.execute_optimized_query(query, (rsid,))
+        return self.execute_optimized_query(VARIANTS_BY_RSID_SQL, (rsid,))
+    
+    def stream_genetic_variants_by_rsid(self, rsid: str) -> Iterator[Dict]:
+        """RSID'ye göre genetik varyantları satır satır getir"""
+        return self.stream_optimized_query(VARIANTS_BY_RSID_SQL, (rsid,))
+    
+    def _chromosome_query(self, chromosome: str, start_pos: int = None,
+                          end_pos: int = None) -> Tuple[str, Tuple]:
+        """Kromozom sorgusu ve parametreleri"""
+        if start_pos and end_pos:
+            return VARIANTS_BY_CHROMOSOME_RANGE_SQL, (chromosome, start_pos, end_pos)
+        return VARIANTS_BY_CHROMOSOME_SQL, (chromosome,)
     
     def get_variants_by_chromosome(self, chromosome: str, start_pos: int = None, 
                                   end_pos: int = None) -> List[Dict]:
         """Kromozoma göre varyantları getir"""
-        if start_pos and end_pos:
-            query = '''
-                SELECT * FROM genetic_variants 
-                WHERE chromosome = ? AND position BETWEEN ? AND ?
-                ORDER BY position
-            '''
-            params = (chromosome, start_pos, end_pos)
-        else:
-            query = '''
-                SELECT * FROM genetic_variants 
-                WHERE chromosome = ?
-                ORDER BY position
-            '''
-            params = (chromosome,)
-        
-        return self.execute_optimized_query(query, params)
+        return self.execute_optimized_query(*self._chromosome_query(chromosome, start_pos, end_pos))
+    
+    def stream_variants_by_chromosome(self, chromosome: str, start_pos: int = None,
+                                      end_pos: int = None) -> Iterator[Dict]:
+        """Kromozoma göre varyantları satır satır getir"""
+        return self.stream_optimized_query(*self._chromosome_query(chromosome, start_pos, end_pos))
     
     def get_health_risks_by_variant(self, variant_id: int) -> List[Dict]:
         """Varyanta göre sağlık risklerini getir"""
-        query = '''
-            SELECT hr.*, gv.rsid, gv.gene
-            FROM health_risks hr
-            JOIN genetic_variants gv ON hr.variant_id = gv.id
-            WHERE hr.variant_id = ?
-            ORDER BY hr.confidence DESC
-        '''
-        return self.execute_optimized_query(query, (variant_id,))
+        return self.execute_optimized_query(HEALTH_RISKS_BY_VARIANT_SQL, (variant_id,))
     
     def get_drug_interactions_by_variant(self, variant_id: int) -> List[Dict]:
         """Varyanta göre ilaç etkileşimlerini getir"""
-        query = '''
-            SELECT di.*, gv.rsid, gv.gene
-            FROM drug_interactions di
-            JOIN genetic_variants gv ON di.variant_id = gv.id
-            WHERE di.variant_id = ?
-            ORDER BY di.severity DESC
-        '''
-        return self.execute_optimized_query(query, (variant_id,))
+        return self.execute_optimized_query(DRUG_INTERACTIONS_BY_VARIANT_SQL, (variant_id,))
+    
+    def get_health_risks_by_variants(self, variant_ids: List[int]) -> Dict[int, List[Dict]]:
+        """Birden çok varyantın sağlık risklerini tek sorguda getir ({variant_id: satırlar})"""
+        return self._group_by_variant(HEALTH_RISKS_BY_VARIANTS_SQL, variant_ids)
+    
+    def get_drug_interactions_by_variants(self, variant_ids: List[int]) -> Dict[int, List[Dict]]:
+        """Birden çok varyantın ilaç etkileşimlerini tek sorguda getir ({variant_id: satırlar})"""
+        return self._group_by_variant(DRUG_INTERACTIONS_BY_VARIANTS_SQL, variant_ids)
+    
+    def _group_by_variant(self, query_template: str, variant_ids: List[int]) -> Dict[int, List[Dict]]:
+        """IN (...) sorgusunu çalıştır ve satırları variant_id'ye göre grupla"""
+        if not variant_ids:
+            return {}
+        
+        query = query_template.format(placeholders=', '.join('?' * len(variant_ids)))
+        # Her toplu sorgunun anahtar kümesi farklı: sorgu cache'ini doldurmaz
+        rows = self.execute_optimized_query(query, tuple(variant_ids), use_cache=False)
+        
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row['variant_id'], []).append(row)
+        return grouped
     
     def search_variants_by_gene(self, gene: str) -> List[Dict]:
         """Gene göre varyantları ara"""
-        query = '''
-            SELECT * FROM genetic_variants 
-            WHERE gene LIKE ?
-            ORDER BY position
-        '''
-        return self.execute_optimized_query(query, (f'%{gene}%',))
+        return self.execute_optimized_query(VARIANTS_BY_GENE_SQL, (f'%{gene}%',))
+    
+    def stream_variants_by_gene(self, gene: str) -> Iterator[Dict]:
+        """Gene göre varyantları satır satır ara"""
+        return self.stream_optimized_query(VARIANTS_BY_GENE_SQL, (f'%{gene}%',))
     
     def get_high_impact_variants(self, min_frequency: float = 0.01) -> List[Dict]:
         """Yüksek etkili varyantları getir"""
-        query = '''
-            SELECT * FROM genetic_variants 
-            WHERE impact IN ('HIGH', 'MODERATE') 
-            AND frequency >= ?
-            ORDER BY frequency DESC
-        '''
-        return self.execute_optimized_query(query, (min_frequency,))
+        return self.execute_optimized_query(HIGH_IMPACT_VARIANTS_SQL, (min_frequency,))
+    
+    def get_all_high_impact_variants(self) -> List[Dict]:
+        """Tüm yüksek etkili varyantları frekansa göre azalan sırada getir"""
+        return self.execute_optimized_query(ALL_HIGH_IMPACT_VARIANTS_SQL, use_cache=False)
     
     def get_analysis_cache(self, cache_key: str) -> Optional[Dict]:
         """Analiz cache'ini getir"""
@@ -12,6 +12,9 @@ import json
 import time
 from memory_manager import memory_manager
 
+# Geçici dosyalar için RAM tabanlı tmpfs (Linux); yoksa (ör. macOS) sistemin varsayılan geçici dizini
+RAM_TEMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
 class StreamingDNAProcessor:
     """Büyük DNA dosyalarını streaming ile işleyen sınıf"""
     
@@ -187,12 +190,12 @@ class StreamingDNAProcessor:
         """
         print(f"🌊 Callback'li streaming işleme başlatılıyor: {file_path}")
         
-        all_results = []
+        chunks_processed = 0
         start_time = time.time()
         
         try:
             for chunk_result in self.process_dna_file_streaming(file_path):
-                all_results.append(chunk_result)
+                chunks_processed += 1
                 
                 # Progress callback
                 if progress_callback:
@@ -206,7 +209,7 @@ class StreamingDNAProcessor:
             # Final results
             final_result = {
                 'total_variants': self.processed_variants,
-                'chunks_processed': len(all_results),
+                'chunks_processed': chunks_processed,
                 'processing_time': time.time() - start_time,
                 'memory_stats': memory_manager.get_memory_report(),
                 'processing_stats': self.processing_stats,
@@ -225,27 +228,43 @@ class StreamingDNAProcessor:
             }
     
     def create_memory_efficient_temp_file(self, dna_data: str) -> str:
-        """Memory-efficient geçici dosya oluştur"""
+        """Memory-efficient geçici dosya oluştur (mümkünse RAM'de, diske yazmadan)"""
         try:
-            # Geçici dosya oluştur
-            temp_file = tempfile.NamedTemporaryFile(
-                mode='w', 
-                suffix='.txt', 
-                delete=False,
-                encoding='utf-8'
-            )
-            
-            # DNA verisini yaz
-            temp_file.write(dna_data)
-            temp_file.close()
+            if RAM_TEMP_DIR is not None:
+                try:
+                    return self._write_temp_file(dna_data, RAM_TEMP_DIR)
+                except OSError as e:
+                    # tmpfs dolu (ör. konteynerdeki küçük /dev/shm): diske düş
+                    print(f"⚠️ RAM geçici dizini kullanılamadı, disk kullanılıyor: {e}")
             
-            print(f"📁 Geçici dosya oluşturuldu: {temp_file.name}")
-            return temp_file.name
+            return self._write_temp_file(dna_data, None)
             
         except Exception as e:
             print(f"❌ Geçici dosya oluşturma hatası: {e}")
             raise
     
+    def _write_temp_file(self, dna_data: str, directory: Optional[str]) -> str:
+        """DNA verisini verilen dizinde geçici dosyaya yaz (yarım kalan dosya silinir)"""
+        # Geçici dosya oluştur
+        temp_file = tempfile.NamedTemporaryFile(
+            mode='w', 
+            suffix='.txt', 
+            dir=directory,
+            delete=False,
+            encoding='utf-8'
+        )
+        
+        # DNA verisini yaz
+        try:
+            with temp_file:
+                temp_file.write(dna_data)
+        except OSError:
+            os.unlink(temp_file.name)
+            raise
+        
+        print(f"📁 Geçici dosya oluşturuldu: {temp_file.name}")
+        return temp_file.name
+    
     def cleanup_temp_file(self, file_path: str):
         """Geçici dosyayı temizle"""
         try:
@@ -73,6 +73,19 @@ def test_23andme_analysis():
         print("❌ 23andMe veri yükleme başarısız")
         return False
 
+def test_in_memory_statistics_keep_stream_position():
+    """Bellek içi verinin boyutu bayt olarak hesaplanmalı ve akış konumu değişmemeli"""
+    from parsers.andme_parser import Parser23andMe
+    
+    data = "# rsid\tchromosome\tposition\tgenotype\nrs4680\t22\t19951271\tAG\n# açıklama: çğü\n"
+    parser = Parser23andMe.from_string(data)
+    assert parser.load_data()
+    
+    parser.stream.seek(5)
+    stats = parser.get_statistics()
+    assert stats['file_size_mb'] * 1024 * 1024 == len(data.encode('utf-8'))
+    assert parser.stream.tell() == 5
+
 if __name__ == "__main__":
     success = test_23andme_analysis()
     if success:
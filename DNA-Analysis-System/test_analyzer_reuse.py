@@ -0,0 +1,66 @@
+"""
+DNA Analysis System - Analizör yeniden kullanım testi
+Aynı DNAAnalyzer örneğiyle art arda analiz edilen örnekler birbirinin verisini görmemeli
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dna_analyzer import DNAAnalyzer
+
+# Kullanıcı 1: MTHFR ve APOE varyantları
+SAMPLE_1 = (
+    "rs1801133\t1\t11856378\tAA\n"
+    "rs429358\t19\t45411941\tCC\n"
+    "rs7412\t19\t45412079\tCC\n"
+)
+
+# Kullanıcı 2: yalnızca COMT varyantı
+SAMPLE_2 = "rs4680\t22\t19951271\tAG\n"
+
+def test_reused_analyzer_does_not_leak_previous_sample():
+    """İkinci örnekte veritabanı yüklemesi başarısız olsa da ilk örneğin sonuçları dönmemeli"""
+    analyzer = DNAAnalyzer()
+    
+    first = analyzer.analyze_from_string(SAMPLE_1)
+    assert first is not None
+    assert any('MTHFR' in risk or 'APOE' in risk for risk in first.health_risks)
+    
+    # İkinci istekte kapsamlı veritabanı yüklemesi hata versin
+    def failing_load(*args, **kwargs):
+        raise RuntimeError("veritabanı erişilemiyor")
+    analyzer.comprehensive_db.load_comprehensive_data = failing_load
+    
+    second = analyzer.analyze_from_string(SAMPLE_2)
+    assert second is not None
+    assert analyzer.comprehensive_variants == {}
+    assert not any('MTHFR' in risk or 'APOE' in risk for risk in second.health_risks)
+    assert 'Alzheimer disease' not in second.health_risks
+    assert second.variant_count == 1
+
+def test_api_thread_local_analyzer_does_not_leak_between_requests():
+    """/analyze iş parçacığı başına analizörü yeniden kullanır; ardışık kullanıcılar birbirinin riskini görmemeli"""
+    import api_server
+    
+    client = api_server.app.test_client()
+    
+    first = client.post('/analyze', json={'dna_data': SAMPLE_1}).get_json()
+    assert first['success']
+    assert 'Alzheimer disease' in first['analysis']['health_risks']
+    
+    # Aynı iş parçacığının analizörü: ikinci istekte veritabanı yüklemesi hata versin
+    analyzer = api_server.get_thread_local_analyzer()
+    def failing_load(*args, **kwargs):
+        raise RuntimeError("veritabanı erişilemiyor")
+    analyzer.comprehensive_db.load_comprehensive_data = failing_load
+    
+    second = client.post('/analyze', json={'dna_data': SAMPLE_2}).get_json()
+    assert second['success']
+    assert second['analysis']['variant_count'] == 1
+    assert 'Alzheimer disease' not in second['analysis']['health_risks']
+
+if __name__ == "__main__":
+    test_reused_analyzer_does_not_leak_previous_sample()
+    test_api_thread_local_analyzer_does_not_leak_between_requests()
+    print("✅ Analizör yeniden kullanım testi tamamlandı!")
@@ -0,0 +1,169 @@
+"""
+DNA Analysis System - JWT (HS256) doğrulama testleri
+AuthManager'ın kendi HS256 kodlayıcısı/çözücüsü için güvenlik ve uyumluluk kontrolleri
+"""
+
+import sys
+import os
+import base64
+import hashlib
+import hmac
+import json
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from auth_manager import (
+    AuthManager, InvalidTokenError, ExpiredSignatureError, ImmatureSignatureError
+)
+
+SECRET = "test-secret-key-0123456789abcdef"
+
+def b64url(data: bytes) -> str:
+    """Dolgusuz base64url"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+def make_token(header: dict, payload: dict, secret: str = SECRET) -> str:
+    """Verilen başlık ve payload ile HS256 imzalı token üret"""
+    signing_input = b64url(json.dumps(header).encode()) + '.' + b64url(json.dumps(payload).encode())
+    signature = hmac.new(secret.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return signing_input + '.' + b64url(signature)
+
+def fresh_payload(**overrides) -> dict:
+    """Geçerli bir access token payload'ı"""
+    now = int(time.time())
+    payload = {'user_id': 'u1', 'username': 'alice', 'role': 'user', 'type': 'access',
+               'iat': now, 'exp': now + 3600}
+    payload.update(overrides)
+    return payload
+
+@pytest.fixture
+def auth():
+    return AuthManager(SECRET)
+
+def test_roundtrip(auth):
+    """Kodlanan token aynı payload ile çözülmeli"""
+    payload = fresh_payload()
+    assert auth._decode_hs256(auth._encode_hs256(payload)) == payload
+
+def test_tampered_signature_rejected(auth):
+    """İmzası değiştirilmiş token reddedilmeli"""
+    header_b64, payload_b64, signature_b64 = auth._encode_hs256(fresh_payload()).split('.')
+    flipped = ('A' if signature_b64[0] != 'A' else 'B') + signature_b64[1:]
+    with pytest.raises(InvalidTokenError):
+        auth._decode_hs256('.'.join((header_b64, payload_b64, flipped)))
+
+def test_tampered_payload_rejected(auth):
+    """Payload'ı değiştirilip eski imzayla gönderilen token reddedilmeli"""
+    header_b64, _, signature_b64 = auth._encode_hs256(fresh_payload()).split('.')
+    forged = b64url(json.dumps(fresh_payload(role='admin')).encode())
+    with pytest.raises(InvalidTokenError):
+        auth._decode_hs256('.'.join((header_b64, forged, signature_b64)))
+
+def test_wrong_secret_rejected(auth):
+    """Başka anahtarla imzalanmış token reddedilmeli"""
+    token = make_token({'alg': 'HS256', 'typ': 'JWT'}, fresh_payload(), secret='other-secret')
+    with pytest.raises(InvalidTokenError):
+        auth._decode_hs256(token)
+
+def test_alg_none_rejected(auth):
+    """alg: none (imzasız) token reddedilmeli"""
+    unsigned = b64url(b'{"alg":"none","typ":"JWT"}') + '.' + b64url(json.dumps(fresh_payload()).encode()) + '.'
+    with pytest.raises(InvalidTokenError):
+        auth._decode_hs256(unsigned)
+    
+    # Doğru anahtarla imzalansa da alg: none kabul edilmemeli
+    with pytest.raises(InvalidTokenError):
+        auth._decode_hs256(make_token({'alg': 'none', 'typ': 'JWT'}, fresh_payload()))
+
+@pytest.mark.parametrize('header', [
+    {'alg': 'HS512', 'typ': 'JWT'},
+    {'alg': 'RS256', 'typ': 'JWT'},
+    {'typ': 'JWT'},
+    ['HS256'],
+])
+def test_foreign_header_rejected(auth, header):
+    """HS256 dışındaki (veya bozuk yapılı) başlıklar reddedilmeli"""
+    with pytest.raises(InvalidTokenError):
+        auth._decode_hs256(make_token(header, fresh_payload()))
+
+def test_equivalent_hs256_header_accepted(auth):
+    """Farklı biçimlenmiş ama HS256 olan başlık (ör. boşluklu JSON) kabul edilmeli"""
+    payload = fresh_payload()
+    assert auth._decode_hs256(make_token({'typ': 'JWT', 'alg': 'HS256'}, payload)) == payload
+
+@pytest.mark.parametrize('token', [
+    '',
+    'abc',
+    'a.b',
+    'a.b.c.d',
+    '!!!.@@@.###',
+    'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.%%%.sig',
+    'ş.ğ.ü',
+])
+def test_malformed_token_rejected(auth, token):
+    """Biçimi ya da base64'ü bozuk token'lar InvalidTokenError vermeli"""
+    with pytest.raises(InvalidTokenError):
+        auth._decode_hs256(token)
+
+def test_non_object_payload_rejected(auth):
+    """JSON nesnesi olmayan payload reddedilmeli"""
+    with pytest.raises(InvalidTokenError):
+        auth._decode_hs256(make_token({'alg': 'HS256', 'typ': 'JWT'}, [1, 2, 3]))
+
+def test_expired_token_rejected(auth):
+    """Süresi dolmuş token ExpiredSignatureError vermeli"""
+    now = int(time.time())
+    token = auth._encode_hs256(fresh_payload(iat=now - 7200, exp=now - 1))
+    with pytest.raises(ExpiredSignatureError):
+        auth._decode_hs256(token)
+    assert auth.verify_token(token) == (False, {'error': 'Token süresi dolmuş'})
+
+def test_future_nbf_rejected(auth):
+    """nbf gelecekteyse token reddedilmeli"""
+    with pytest.raises(ImmatureSignatureError):
+        auth._decode_hs256(auth._encode_hs256(fresh_payload(nbf=int(time.time()) + 600)))
+
+def test_future_iat_rejected(auth):
+    """iat gelecekteyse token reddedilmeli"""
+    with pytest.raises(ImmatureSignatureError):
+        auth._decode_hs256(auth._encode_hs256(fresh_payload(iat=int(time.time()) + 600)))
+
+@pytest.mark.parametrize('claim', ['exp', 'nbf', 'iat'])
+def test_non_numeric_time_claims_rejected(auth, claim):
+    """Sayısal olmayan zaman alanları reddedilmeli"""
+    with pytest.raises(InvalidTokenError):
+        auth._decode_hs256(auth._encode_hs256(fresh_payload(**{claim: 'yarın'})))
+
+def test_pyjwt_tokens_accepted(auth):
+    """PyJWT ile üretilen HS256 token'lar çözülebilmeli"""
+    jwt = pytest.importorskip('jwt')
+    payload = fresh_payload()
+    assert auth._decode_hs256(jwt.encode(payload, SECRET, algorithm='HS256')) == payload
+
+def test_tokens_accepted_by_pyjwt(auth):
+    """AuthManager'ın ürettiği token'lar PyJWT ile doğrulanabilmeli"""
+    jwt = pytest.importorskip('jwt')
+    payload = fresh_payload()
+    token = auth._encode_hs256(payload)
+    assert jwt.decode(token, SECRET, algorithms=['HS256']) == payload
+    assert jwt.get_unverified_header(token) == {'alg': 'HS256', 'typ': 'JWT'}
+
+def test_user_record_timestamps_are_epoch_seconds(auth):
+    """created_at ve last_login aynı biçimde (tam sayı epoch saniye) saklanmalı"""
+    before = int(time.time())
+    ok, _, _ = auth.register_user('alice', 'alice@example.com', 'correct-horse-battery')
+    assert ok
+    
+    user = auth.users['alice']
+    assert type(user['created_at']) is int
+    assert user['last_login'] is None
+    
+    ok, _, user_info = auth.authenticate_user('alice', 'correct-horse-battery')
+    assert ok
+    
+    profile = auth.get_user_by_token(auth.generate_tokens(user_info)['access_token'])
+    for field in ('created_at', 'last_login'):
+        assert type(profile[field]) is int
+        assert before <= profile[field] <= int(time.time())
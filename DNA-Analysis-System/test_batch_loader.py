@@ -0,0 +1,108 @@
+"""
+DNA Analysis System - BatchLoader testleri
+Eşzamanlı tekil yüklemelerin toplu sorgulara çevrilmesi
+"""
+
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from batch_loader import BatchLoader
+
+class RecordingBatchFn:
+    """Çağrıları kaydeden toplu sorgu (anahtar -> anahtar * 10)"""
+    
+    def __init__(self, delay: float = 0.0, missing=(), error: Exception = None):
+        self.calls = []
+        self.delay = delay
+        self.missing = set(missing)
+        self.error = error
+        self.lock = threading.Lock()
+    
+    def __call__(self, keys):
+        with self.lock:
+            self.calls.append(sorted(keys))
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {key: key * 10 for key in keys if key not in self.missing}
+
+def load_concurrently(loader: BatchLoader, keys):
+    """Anahtarları aynı anda başlayan iş parçacıklarından yükle; (sonuçlar, istisnalar) döndür"""
+    barrier = threading.Barrier(len(keys))
+    
+    def worker(key):
+        barrier.wait()
+        try:
+            return loader.load(key), None
+        except Exception as e:
+            return None, e
+    
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        outcomes = list(executor.map(worker, keys))
+    return [value for value, _ in outcomes], [error for _, error in outcomes]
+
+def test_concurrent_loads_coalesce_into_one_batch():
+    """Aynı penceredeki farklı (ve tekrarlanan) anahtarlar tek batch_fn çağrısında sorgulanmalı"""
+    batch_fn = RecordingBatchFn()
+    loader = BatchLoader(batch_fn, window_ms=100, max_batch_size=100)
+    
+    values, errors = load_concurrently(loader, [1, 2, 3, 4, 2])
+    
+    assert errors == [None] * 5
+    assert values == [10, 20, 30, 40, 20]
+    assert batch_fn.calls == [[1, 2, 3, 4]]
+    
+    stats = loader.get_stats()
+    assert stats['loads'] == 5
+    assert stats['batches'] == 1
+    assert stats['keys_queried'] == 4
+
+def test_missing_keys_return_default():
+    """Toplu sonuçta olmayan anahtarlar default değeri almalı"""
+    batch_fn = RecordingBatchFn(missing={2})
+    loader = BatchLoader(batch_fn, window_ms=50, default='yok')
+    
+    values, errors = load_concurrently(loader, [1, 2])
+    
+    assert errors == [None, None]
+    assert values == [10, 'yok']
+
+def test_batch_fn_exception_reaches_every_waiter():
+    """batch_fn hatası aynı toplu sorguyu bekleyen tüm çağrılara iletilmeli"""
+    failure = RuntimeError("veritabanı erişilemiyor")
+    loader = BatchLoader(RecordingBatchFn(error=failure), window_ms=50)
+    
+    values, errors = load_concurrently(loader, [1, 2, 2, 3])
+    
+    assert values == [None] * 4
+    assert all(error is failure for error in errors)
+
+def test_full_batch_flushes_before_window():
+    """max_batch_size farklı anahtar birikince pencere beklenmeden sorgulanmalı"""
+    batch_fn = RecordingBatchFn()
+    loader = BatchLoader(batch_fn, window_ms=10000, max_batch_size=3)
+    
+    start = time.monotonic()
+    values, errors = load_concurrently(loader, [1, 2, 3])
+    elapsed = time.monotonic() - start
+    
+    assert errors == [None] * 3
+    assert values == [10, 20, 30]
+    assert batch_fn.calls == [[1, 2, 3]]
+    assert elapsed < 2.0
+    # Pencere zamanlayıcısı iptal edilmiş olmalı
+    assert loader.flush_timer is None
+
+def test_load_times_out_when_batch_is_slow():
+    """batch_fn timeout'tan uzun sürerse load TimeoutError vermeli"""
+    loader = BatchLoader(RecordingBatchFn(delay=0.5), window_ms=1, timeout=0.05)
+    
+    with pytest.raises(FutureTimeoutError):
+        loader.load(1)
@@ -0,0 +1,62 @@
+"""
+DNA Analysis System - ACMG sınıflandırma tutarlılık testi
+Vektörel toplu sınıflandırma ile varyant başına sınıflandırma aynı sonucu vermeli
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import clinical.clinical_validation as clinical_validation
+from clinical.clinical_validation import ClinicalValidationSystem
+
+VARIANT_COUNT = 3000
+GENES = ['MTHFR', 'BRCA1', 'TP53', 'KRAS', 'CYP2C9', 'APOE', None, 'XYZ']
+VARIANT_TYPES = ['nonsense', 'frameshift', 'missense', None]
+
+def random_variants(count: int, seed: int = 1):
+    """Tüm kriter eşiklerinin iki yanını kapsayan rastgele varyantlar"""
+    rng = random.Random(seed)
+    variants = []
+    for i in range(count):
+        variant = {
+            'rsid': f'rs{i}',
+            'gene': rng.choice(GENES),
+            'variant_type': rng.choice(VARIANT_TYPES),
+            'allele_frequency': rng.choice([0, 0.0005, 0.03, 0.07, 0.2]),
+            'cadd_score': rng.choice([1, 10, 20]),
+            'sift_score': rng.choice([0.01, 0.3, 0.9]),
+            'de_novo': rng.random() < 0.2,
+            'same_as_pathogenic': rng.random() < 0.2,
+            'prevalence_in_affected': rng.choice([0, 0.2])
+        }
+        if rng.random() < 0.5:
+            variant['functional_evidence'] = {'damaging': rng.random() < 0.5, 'benign': rng.random() < 0.5}
+        if variant['gene'] is None:
+            del variant['gene']
+        variants.append(variant)
+    return variants
+
+@pytest.mark.parametrize('use_numba', [True, False], ids=['numba', 'numpy'])
+@pytest.mark.parametrize('phenotype', [None, 'cardiovascular disease', 'Alzheimer'])
+def test_batch_classification_matches_per_variant(monkeypatch, use_numba, phenotype):
+    """classify_variants_acmg ile classify_variant_acmg her varyant için aynı raporu üretmeli"""
+    if use_numba and not clinical_validation.NUMBA_AVAILABLE:
+        pytest.skip("numba kurulu değil")
+    monkeypatch.setattr(clinical_validation, 'NUMBA_AVAILABLE', use_numba)
+    
+    system = ClinicalValidationSystem()
+    variants = random_variants(VARIANT_COUNT)
+    
+    per_variant = [system.classify_variant_acmg(v, phenotype).as_report_dict() for v in variants]
+    batch = [c.as_report_dict() for c in system.classify_variants_acmg(variants, phenotype)]
+    
+    assert len(batch) == VARIANT_COUNT
+    for variant, expected, actual in zip(variants, per_variant, batch):
+        assert actual == expected, variant['rsid']
+    
+    # Rastgele örneklem birden çok sınıfı kapsamalı
+    assert len({report['classification'] for report in batch}) > 1
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+WSGI giriş noktası
+Üretimde API sunucusunu gunicorn ile çalıştırmak için:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from api_server import app
+
+# mod_wsgi / uWSGI gibi sunucuların varsayılan olarak aradığı isim
+application = app
+
+__all__ = ['app', 'application']